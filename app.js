@@ -6,6 +6,7 @@
 class FlashcardApp {
     constructor() {
         this.wordlists = [];
+        this.apiAvailable = false;
         this.currentWordlist = null;
         this.currentMode = null;
         this.modeInstances = {
@@ -58,9 +59,18 @@ class FlashcardApp {
     /**
      * Load all available wordlists from the wordlists directory
      * Now supports subdirectories with folder structure
+     * Asks the local server (python src/main.py serve) for the list first;
+     * static hosting such as GitHub Pages uses the list below
      */
     async loadWordlists() {
         try {
+            const structure = await this.fetchWordlistStructure();
+            if (structure) {
+                this.wordlistStructure = structure;
+                this.updateCurrentWordlists();
+                return;
+            }
+            
             // Define the wordlist structure with folders and files
             this.wordlistStructure = {
                 folders: [
@@ -101,6 +111,39 @@ class FlashcardApp {
         }
     }
     
+    /**
+     * Build the wordlist structure from the server's wordlist list
+     * Returns null if there is no server API (e.g. static hosting)
+     */
+    async fetchWordlistStructure() {
+        try {
+            const response = await fetch(`${this.basePath}api/wordlists`);
+            if (!response.ok) return null;
+            const data = await response.json();
+            
+            const structure = { folders: [], files: [] };
+            data.wordlists.forEach(entry => {
+                const parts = entry.name.split('/');
+                const filename = parts.pop() + '.json';
+                let current = structure;
+                parts.forEach(part => {
+                    let folder = current.folders.find(f => f.path === part);
+                    if (!folder) {
+                        folder = { name: part, path: part, folders: [], files: [] };
+                        current.folders.push(folder);
+                    }
+                    current = folder;
+                });
+                current.files.push(filename);
+            });
+            
+            this.apiAvailable = true;
+            return structure;
+        } catch (error) {
+            return null;
+        }
+    }
+    
     /**
      * Update the wordlists array based on current navigation path
      */
@@ -237,7 +280,12 @@ class FlashcardApp {
         try {
             // Build the full path including subdirectories
             const pathPrefix = this.currentPath.length > 0 ? this.currentPath.join('/') + '/' : '';
-            const url = `${this.basePath}wordlists/${pathPrefix}${wordlist.filename}`;
+            // The server sends its cached copy (gzipped, or 304 if the browser has it)
+            const apiName = (pathPrefix + wordlist.filename.replace(/\.json$/, ''))
+                .split('/').map(encodeURIComponent).join('/');
+            const url = this.apiAvailable
+                ? `${this.basePath}api/wordlists/${apiName}`
+                : `${this.basePath}wordlists/${pathPrefix}${wordlist.filename}`;
             console.log('Loading wordlist from:', url);
             
             const response = await fetch(url);
@@ -0,0 +1,352 @@
+"""
+Benchmark Runner
+Times the core CLI paths on synthetic decks and compares them to a baseline.
+
+Usage (from the project root):
+    python benchmarks/run.py                      # 1k, 100k and 1M pair decks
+    python benchmarks/run.py --sizes 1k,100k      # skip the slow 1M deck
+    python benchmarks/run.py --save-baseline      # store this run as the baseline
+    python benchmarks/run.py --json results.json  # also write the results to a file
+
+Every benchmark reports the best and the median of --repeat runs. When a
+baseline exists (benchmarks/baseline.json by default), each result is compared
+to it and the exit code is 1 if any benchmark got slower than --threshold.
+Only the standard library is used; nothing outside a temporary directory is
+written, except the baseline and the --json file.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from colors import Colors  # noqa: E402
+from console import ScriptedConsole  # noqa: E402
+from memorize_mode import MemorizeMode  # noqa: E402
+from progress_store import ProgressStore  # noqa: E402
+from test_mode import TestMode  # noqa: E402
+from view_mode import ViewMode  # noqa: E402
+from wordlist_cache import WordlistCache  # noqa: E402
+from wordlist_manager import WordlistManager  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Small wordlists next to the synthetic decks, so listing has folders to walk
+CATALOG_FOLDERS = 20
+CATALOG_FILES_PER_FOLDER = 25
+
+SIZE_SUFFIXES = {"k": 1000, "m": 1000000}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a deck size such as "1000", "100k" or "1M".
+
+    Args:
+        text: Size with an optional k/M suffix
+
+    Returns:
+        Number of pairs
+    """
+    text = text.strip().lower()
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+
+def size_label(size: int) -> str:
+    """Format a deck size the way parse_size() reads it (e.g. "100k")."""
+    for suffix, multiplier in (("M", 1000000), ("k", 1000)):
+        if size >= multiplier and size % multiplier == 0:
+            return f"{size // multiplier}{suffix}"
+    return str(size)
+
+
+def write_deck(path: Path, size: int, rng: random.Random):
+    """
+    Write a synthetic wordlist with unique words and repeated meanings.
+
+    Args:
+        path: JSON file to create
+        size: Number of pairs
+        rng: Random generator (seeded, so decks are the same on every run)
+    """
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    meanings = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 12)))
+                for _ in range(max(1, min(size, 5000)))]
+    deck = {}
+    for index in range(size):
+        stem = "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+        deck[f"{stem}{index}"] = rng.choice(meanings)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(deck, f, ensure_ascii=False)
+
+
+class NullWriter(io.TextIOBase):
+    """Text stream that discards everything, so printing costs no I/O."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def isatty(self) -> bool:
+        return False
+
+
+def scripted(answers: Optional[List[str]] = None) -> ScriptedConsole:
+    """
+    Build a console that discards output and answers prompts forever.
+
+    Args:
+        answers: Answers to cycle through ("" if None)
+    """
+    return ScriptedConsole(itertools.cycle(answers or [""]))
+
+
+class Runner:
+    """Runs benchmarks and collects their timings."""
+
+    def __init__(self, repeat: int, min_seconds: float = 0.05):
+        """
+        Initialize the runner.
+
+        Args:
+            repeat: Timed runs per benchmark
+            min_seconds: Fast functions are called in a loop until a run takes this long
+        """
+        self.repeat = repeat
+        self.min_seconds = min_seconds
+        self.results = {}
+
+    def bench(self, name: str, func: Callable, setup: Optional[Callable] = None):
+        """
+        Time a function and record the result under a name.
+
+        Args:
+            name: Result name, e.g. "load_wordlist[100k]"
+            func: Function to time; called with setup()'s result if setup is given
+            setup: Untimed function run before every call (for benchmarks that
+                change state, which are then called once per run)
+        """
+        timings = []
+        # Modes write to a scripted console; this catches anything else
+        with redirect_stdout(NullWriter()):
+            number = 1 if setup else self._calibrate(func)
+            for _ in range(self.repeat):
+                state = setup() if setup else None
+                start = time.perf_counter()
+                if setup:
+                    func(state)
+                else:
+                    for _ in range(number):
+                        func()
+                timings.append((time.perf_counter() - start) / number)
+        self.results[name] = {
+            "best": min(timings),
+            "median": statistics.median(timings),
+            "runs": len(timings),
+            "loops": number,
+        }
+        print(f"  {name:<42} {format_seconds(min(timings)):>10}  "
+              f"(median {format_seconds(statistics.median(timings))}, {number} loop(s))")
+
+    def _calibrate(self, func: Callable) -> int:
+        """Find how many calls make one run take at least min_seconds."""
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= self.min_seconds or number >= 1 << 20:
+                return number
+            number *= 4
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def run_benchmarks(sizes: List[int], repeat: int) -> Dict:
+    """
+    Build the synthetic decks and run every benchmark.
+
+    Args:
+        sizes: Deck sizes in pairs
+        repeat: Timed runs per benchmark
+
+    Returns:
+        Results dictionary (see main() for the layout)
+    """
+    runner = Runner(repeat)
+    rng = random.Random(1234)
+    with tempfile.TemporaryDirectory(prefix="flashcards-bench-") as tmp:
+        tmp = Path(tmp)
+        # Keep the catalog index and parsed-wordlist cache away from the user's cache
+        os.environ["FLASHCARDS_CACHE_DIR"] = str(tmp / "cache")
+        os.environ["FLASHCARDS_DATA_DIR"] = str(tmp / "data")
+        wordlists = tmp / "wordlists"
+
+        print("Building synthetic decks...")
+        for folder in range(CATALOG_FOLDERS):
+            for number in range(CATALOG_FILES_PER_FOLDER):
+                write_deck(wordlists / f"folder{folder:02}" / f"list{number:02}.json", 50, rng)
+        for size in sizes:
+            write_deck(wordlists / f"deck_{size_label(size)}.json", size, rng)
+
+        print("\nWordlistManager")
+        manager = WordlistManager(str(wordlists), cache=WordlistCache(use_disk=False))
+        manager.get_available_wordlists()  # first call builds the catalog index
+        runner.bench("get_available_wordlists", manager.get_available_wordlists)
+        runner.bench("get_available_wordlists[cold index]",
+                     lambda _: WordlistManager(str(wordlists)).get_available_wordlists(),
+                     setup=lambda: _remove_catalog_index(tmp))
+
+        progress = ProgressStore(tmp / "data" / "bench.db")
+        try:
+            for size in sizes:
+                label = size_label(size)
+                name = f"deck_{label}"
+                print(f"\nDeck of {label} pairs")
+                runner.bench(f"load_wordlist[{label}]",
+                             lambda m: m.load_wordlist(name),
+                             setup=lambda: WordlistManager(str(wordlists),
+                                                           cache=WordlistCache(use_disk=False)))
+                wordlist = manager.load_wordlist(name)
+                _bench_memorize(runner, label, wordlist, progress)
+                _bench_test(runner, label, wordlist)
+                runner.bench(f"ViewMode.start[{label}]", ViewMode(wordlist, console=scripted()).start)
+                progress.clear(wordlist["name"])
+        finally:
+            progress.close()
+
+    return runner.results
+
+
+def _remove_catalog_index(tmp: Path):
+    """Delete the catalog index so the next listing rescans every folder."""
+    for index_file in (tmp / "cache" / "catalog").glob("*.json"):
+        index_file.unlink()
+
+
+def _bench_memorize(runner: Runner, label: str, wordlist: Dict, progress: ProgressStore):
+    """Time the memorize mode's run setup and progress report."""
+    def fresh_mode():
+        progress.clear(wordlist["name"])
+        return MemorizeMode(wordlist, progress=progress, console=scripted())
+
+    def mode_with_pool():
+        mode = fresh_mode()
+        for _ in range(10):
+            mode._add_new_words_to_pool()
+        return mode
+
+    runner.bench(f"MemorizeMode._add_new_words_to_pool[{label}]",
+                 lambda mode: mode._add_new_words_to_pool(), setup=fresh_mode)
+    mode = mode_with_pool()
+    runner.bench(f"MemorizeMode._prepare_run_questions[{label}]",
+                 lambda: mode._prepare_run_questions(None))
+    runner.bench(f"MemorizeMode._display_progress[{label}]", mode._display_progress)
+
+
+def _bench_test(runner: Runner, label: str, wordlist: Dict):
+    """Time a 100-question test answered correctly, with typos and wrongly."""
+    pairs = wordlist["pairs"]
+    num_questions = min(100, len(pairs))
+    # Answers don't line up with the questions, so most take the suggestion path
+    answers = [pairs[i].meaning for i in range(0, len(pairs), max(1, len(pairs) // 50))]
+    answers += [answer[:-1] + "x" for answer in answers] + ["no idea"]
+    test = TestMode(wordlist, console=scripted(answers))
+    runner.bench(f"TestMode._run_test[{label}]",
+                 lambda: test._run_test(num_questions, "word-to-meaning"))
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compare results to a baseline and print the change of every benchmark.
+
+    Args:
+        results: Benchmark name -> timings of this run
+        baseline: Benchmark name -> timings of the baseline run
+        threshold: Relative slowdown of the best time that counts as a regression
+
+    Returns:
+        Names of the benchmarks that regressed
+    """
+    regressions = []
+    print(f"\nCompared to baseline (regression threshold {threshold:.0%}):")
+    for name, timing in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"  {name:<42} {'new':>10}")
+            continue
+        change = timing["best"] / before["best"] - 1 if before["best"] else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<42} {change:>+10.1%}{marker}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the flashcards CLI")
+    parser.add_argument("--sizes", default="1k,100k,1M",
+                        help="comma-separated deck sizes (default: 1k,100k,1M)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown that counts as a regression (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    Colors.configure(False)
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": sizes,
+        "results": run_benchmarks(sizes, args.repeat),
+    }
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+    regressions = []
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline saved to {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results["results"], baseline.get("results", {}), args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Server Load Benchmark
+Drives the HTTP server with many concurrent clients, each running a test or
+memorize session and fetching a deck again and again, and reports latency
+percentiles per kind of request.
+
+Usage (from the project root):
+    python benchmarks/server_load.py                          # 200 clients, in-process server
+    python benchmarks/server_load.py --clients 500 --answers 40
+    python benchmarks/server_load.py --url http://127.0.0.1:8000 --deck test
+
+Without --url the server runs on its own thread and event loop, on a synthetic
+deck in a temporary directory, without recording answers; its own handling
+time per request is reported next to the round trips the clients see. The
+round trips include waiting behind the other clients' requests, so they grow
+with --clients while the handling time should not.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from run import format_seconds, write_deck
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from console import percentiles  # noqa: E402
+from server import FlashcardServer  # noqa: E402
+from wordlist_cache import WordlistCache  # noqa: E402
+from wordlist_manager import WordlistManager  # noqa: E402
+
+
+class TimedServer(FlashcardServer):
+    """FlashcardServer that keeps how long it took to handle every request, by route."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handle_times = {}
+
+    async def handle(self, request):
+        started = time.perf_counter()
+        response = await super().handle(request)
+        self.handle_times.setdefault(self.route(request), []).append(time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def route(request) -> str:
+        """Name a request by method and path, without session ids and deck names."""
+        parts = request.path.split("/")
+        if parts[1:3] == ["api", "sessions"] and len(parts) > 3:
+            parts[3] = ":id"
+        elif parts[1:3] == ["api", "wordlists"] and len(parts) > 3:
+            parts[3:] = [":name"]
+        return f"{request.method} {'/'.join(parts)}"
+
+
+class ServerThread:
+    """A server running on its own thread and event loop."""
+
+    def __init__(self, server: FlashcardServer):
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.listener = self._call(server.start("127.0.0.1", 0))
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self):
+        """Stop listening, let the open connections finish, and stop the loop."""
+        async def shutdown():
+            self.listener.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            if tasks:
+                await asyncio.wait(tasks, timeout=1.0)
+        self._call(shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.server.close()
+
+
+class Client:
+    """One keep-alive connection sending JSON requests and timing them."""
+
+    def __init__(self, host: str, port: int, samples: Dict[str, List[float]]):
+        self.host = host
+        self.port = port
+        self.samples = samples
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        self.writer.close()
+
+    async def request(self, kind: str, method: str, path: str, data=None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send a request and read the response, adding its round trip to samples[kind].
+
+        Returns:
+            (status, lower-cased headers, body)
+        """
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        started = time.perf_counter()
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        response_headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                response_headers[name.strip().lower()] = value.strip()
+        length = int(response_headers.get("content-length", "0"))
+        content = await self.reader.readexactly(length) if length else b""
+        self.samples.setdefault(kind, []).append(time.perf_counter() - started)
+        return int(head[0].split(" ")[1]), response_headers, content
+
+
+async def run_client(client: Client, number: int, deck: str, answers: int, fetches: int,
+                     rng: random.Random):
+    """Fetch the list and the deck, revalidate the deck, then run a session."""
+    await client.connect()
+    try:
+        await client.request("wordlists", "GET", "/api/wordlists")
+        status, headers, _ = await client.request("deck (200, gzip)", "GET", f"/api/wordlists/{deck}",
+                                                  headers={"Accept-Encoding": "gzip"})
+        if status != 200:
+            raise RuntimeError(f"deck '{deck}' returned {status}")
+        for _ in range(fetches):
+            await client.request("deck (304)", "GET", f"/api/wordlists/{deck}",
+                                 headers={"If-None-Match": headers["etag"], "Accept-Encoding": "gzip"})
+
+        mode = "test" if number % 2 == 0 else "memorize"
+        options = {"mode": mode, "wordlist": deck}
+        if mode == "test":
+            options.update(questions=answers, seed=number)
+        status, _, content = await client.request("session start", "POST", "/api/sessions", options)
+        if status != 201:
+            raise RuntimeError(f"starting a session returned {status}: {content[:200]!r}")
+        state = json.loads(content.decode("utf-8"))
+        question = state["question"]
+        for _ in range(answers):
+            if question is None:
+                break
+            if mode == "memorize" and question["stage"] == 1:
+                # Copy the shown pair, with a typo now and then
+                meaning = question["meaning"] if rng.random() < 0.9 else "?"
+                answer = {"word": question["word"], "meaning": meaning}
+            else:
+                # Typed answers aren't known to the client; wrong ones are checked the longest
+                answer = {"answer": "?"}
+            status, _, content = await client.request(f"{mode} answer", "POST",
+                                                      f"/api/sessions/{state['id']}/answer", answer)
+            if status != 200:
+                raise RuntimeError(f"answering returned {status}: {content[:200]!r}")
+            question = json.loads(content.decode("utf-8"))["next"]
+        await client.request("session end", "DELETE", f"/api/sessions/{state['id']}")
+    finally:
+        client.close()
+
+
+async def run_load(host: str, port: int, deck: str, clients: int, answers: int, fetches: int,
+                   seed: int) -> Tuple[Dict[str, List[float]], float]:
+    """
+    Run every client at once.
+
+    Returns:
+        (request kind -> round trips in seconds, wall-clock seconds)
+    """
+    samples = {}
+    rng = random.Random(seed)
+    # Load the deck before timing, as a running server has it cached
+    warm_up = Client(host, port, {})
+    await warm_up.connect()
+    await warm_up.request("warm-up", "GET", f"/api/wordlists/{deck}")
+    warm_up.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(Client(host, port, samples), number, deck, answers, fetches,
+                                      random.Random(rng.random()))
+                           for number in range(clients)))
+    return samples, time.perf_counter() - started
+
+
+def print_latencies(title: str, samples: Dict[str, List[float]]):
+    """Print the percentiles of every kind of request."""
+    print(f"\n{title}")
+    print(f"  {'request':<32} {'count':>7} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}")
+    for kind, values in samples.items():
+        points = percentiles(values)
+        print(f"  {kind:<32} {len(values):>7} " + " ".join(
+            f"{format_seconds(points[name]):>10}" for name in ("p50", "p90", "p99")) +
+            f" {format_seconds(max(values)):>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the server load benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Load-test the flashcards HTTP server")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent clients, one session each")
+    parser.add_argument("--answers", type=int, default=20, help="answers per session")
+    parser.add_argument("--fetches", type=int, default=5, help="deck revalidations (304) per client")
+    parser.add_argument("--deck-size", type=int, default=1000, help="pairs in the synthetic deck")
+    parser.add_argument("--url", help="load an already running server instead (e.g. http://127.0.0.1:8000)")
+    parser.add_argument("--deck", default="load", help="wordlist to use with --url")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the answers")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args(argv)
+    if args.answers > args.deck_size and not args.url:
+        parser.error("--answers can't be more than --deck-size")
+
+    server = None
+    with tempfile.TemporaryDirectory(prefix="flashcards-server-") as tmp:
+        if args.url:
+            address = urlsplit(args.url)
+            host, port = address.hostname, address.port or 80
+        else:
+            write_deck(Path(tmp) / "wordlists" / "load.json", args.deck_size, random.Random(args.seed))
+            manager = WordlistManager(str(Path(tmp) / "wordlists"),
+                                      cache=WordlistCache(cache_dir=Path(tmp) / "cache"))
+            server = ServerThread(TimedServer(manager, record_history=False))
+            host, port = "127.0.0.1", server.port
+            args.deck = "load"
+
+        print(f"Server load: {args.clients} clients, {args.answers} answers each, "
+              f"{args.fetches} revalidations each")
+        samples, seconds = asyncio.run(run_load(host, port, args.deck, args.clients, args.answers,
+                                                args.fetches, args.seed))
+        requests = sum(len(values) for values in samples.values())
+        print(f"  {requests} requests in {format_seconds(seconds)} ({requests / seconds:.0f} requests/s)")
+        print_latencies("Round trips seen by the clients", samples)
+
+        results = {"clients": args.clients, "answers": args.answers, "requests": requests,
+                   "seconds": seconds,
+                   "round_trips": {kind: percentiles(values) for kind, values in samples.items()}}
+        if server is not None:
+            server.stop()
+            handle_times = server.server.handle_times
+            print_latencies("Handling time inside the server", handle_times)
+            results["handling"] = {route: percentiles(values) for route, values in handle_times.items()}
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
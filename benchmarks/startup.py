@@ -0,0 +1,156 @@
+"""
+Startup Benchmark
+Measures how long the CLI takes to start, so wrapper scripts that launch it
+many times a day don't get slower unnoticed.
+
+Usage (from the project root):
+    python benchmarks/startup.py                  # compare to the stored baseline
+    python benchmarks/startup.py --save-baseline  # store this run as the baseline
+    python benchmarks/startup.py --top 15         # list the slowest imports
+
+Four numbers are measured in fresh interpreters:
+    interpreter       python -c pass, the floor nothing in this project can lower
+    import main       cumulative import time of main.py, from python -X importtime
+    first prompt      launching main.py until it has shown the wordlist menu and
+                      exited on "quit"
+    list command      running "main.py list", the subcommand scripts call most
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from run import compare, format_seconds
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "startup_baseline.json"
+
+
+def import_times(env: Dict[str, str]) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Import main in a fresh interpreter with -X importtime.
+
+    Args:
+        env: Environment for the interpreter
+
+    Returns:
+        (cumulative seconds for main, [(self seconds, module)] of every import)
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                               cwd=str(SRC), env=env, stderr=subprocess.PIPE,
+                               universal_newlines=True, check=True)
+    total = None
+    modules = []
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((int(self_us) / 1e6, name.strip()))
+        if name.strip() == "main":
+            total = int(cumulative_us) / 1e6
+    if total is None:
+        raise RuntimeError("main did not appear in the -X importtime output")
+    return total, modules
+
+
+def run_seconds(args: List[str], env: Dict[str, str], stdin: str = "") -> float:
+    """Time a fresh interpreter from launch to exit."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=str(SRC), env=env, input=stdin,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   universal_newlines=True, check=True)
+    return time.perf_counter() - start
+
+
+def measure(repeat: int, top: int) -> Dict:
+    """
+    Measure the startup numbers.
+
+    Args:
+        repeat: Runs of each measurement (the best and median are kept)
+        top: Number of slowest imports to print
+
+    Returns:
+        Benchmark name -> timings
+    """
+    with tempfile.TemporaryDirectory(prefix="flashcards-startup-") as tmp:
+        env = dict(os.environ, FLASHCARDS_CACHE_DIR=str(Path(tmp) / "cache"),
+                   FLASHCARDS_DATA_DIR=str(Path(tmp) / "data"))
+        env.pop("FLASHCARDS_TRACE", None)
+        # Warm the catalog index and the bytecode cache, as on any launch after the first
+        run_seconds(["main.py"], env, stdin="quit\n")
+
+        samples = {"interpreter": [], "import main": [], "first prompt": [], "list command": []}
+        slowest = []
+        for _ in range(repeat):
+            samples["interpreter"].append(run_seconds(["-c", "pass"], env))
+            total, modules = import_times(env)
+            if not samples["import main"] or total < min(samples["import main"]):
+                slowest = sorted(modules, reverse=True)[:top]
+            samples["import main"].append(total)
+            samples["first prompt"].append(run_seconds(["main.py"], env, stdin="quit\n"))
+            samples["list command"].append(run_seconds(["main.py", "list"], env))
+
+    results = {}
+    for name, values in samples.items():
+        results[name] = {"best": min(values), "median": statistics.median(values),
+                         "runs": len(values), "loops": 1}
+        print(f"  {name:<42} {format_seconds(min(values)):>10}  "
+              f"(median {format_seconds(statistics.median(values))})")
+    if slowest:
+        print("\nSlowest imports (self time, best run):")
+        for seconds, module in slowest:
+            print(f"  {module:<42} {format_seconds(seconds):>10}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the startup benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the flashcards CLI startup")
+    parser.add_argument("--repeat", type=int, default=10, help="runs of each measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown that counts as a regression (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    print("Startup")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": measure(args.repeat, args.top),
+    }
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+    regressions = []
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline saved to {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results["results"], baseline.get("results", {}), args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,468 @@
+"""
+Answer Matcher Module
+Checks typed answers against word pairs using answers normalized once per deck,
+with typo tolerance and suggestions for answers that belong to another card.
+"""
+import re
+import unicodedata
+import weakref
+from array import array
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Set, Union
+
+# Leading articles that may be left out of an answer unless strip_articles is off (English and Dutch)
+ARTICLES = frozenset({"the", "a", "an", "de", "het", "een"})
+
+# Notes such as "(female)" that don't have to be typed
+_PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+_ALTERNATIVE_SEPARATOR = re.compile(r"\s*[/;]\s*")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+# The same characters for ASCII text, removed by str.translate (much faster than the regex)
+_ASCII_PUNCTUATION = str.maketrans("", "", "".join(
+    chr(code) for code in range(128) if _PUNCTUATION.match(chr(code))))
+
+# A normalized answer, or the set of them when a card accepts several variants
+AcceptedForms = Union[str, FrozenSet[str]]
+
+# Results of AnswerMatcher.check()
+CORRECT = "correct"
+CLOSE = "close"
+INCORRECT = "incorrect"
+
+
+def max_typos(length: int) -> int:
+    """
+    Get the number of typos tolerated in an answer of the given length.
+
+    Args:
+        length: Length of the normalized answer
+
+    Returns:
+        0 for very short answers, 1 up to 7 characters, 2 above
+    """
+    if length <= 3:
+        return 0
+    if length <= 7:
+        return 1
+    return 2
+
+
+def edit_distance(a: str, b: str, max_distance: int, transpositions: bool = True) -> int:
+    """
+    Bounded Damerau-Levenshtein (optimal string alignment) distance.
+
+    Only a band of width 2 * max_distance + 1 around the diagonal is computed and
+    the search stops as soon as a whole row exceeds the bound, so the cost is
+    O(max_distance * len) rather than O(len^2).
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+        transpositions: Count swapping two adjacent characters as one edit
+
+    Returns:
+        The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if a == b:
+        return 0
+    too_far = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return too_far
+    if len(a) > len(b):
+        a, b = b, a
+
+    len_b = len(b)
+    before = None
+    previous = [j if j <= max_distance else too_far for j in range(len_b + 1)]
+    for i in range(1, len(a) + 1):
+        low = max(1, i - max_distance)
+        high = min(len_b, i + max_distance)
+        current = [too_far] * (len_b + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        char_a = a[i - 1]
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (transpositions and i > 1 and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == b[j - 1] and before[j - 2] + 1 < value):
+                value = before[j - 2] + 1
+            if value > too_far:
+                value = too_far
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        before, previous = previous, current
+    return previous[len_b]
+
+
+def suggestion_text(pair, field: str) -> str:
+    """
+    Describe which card an answer belongs to.
+
+    Args:
+        pair: The card whose field matched the answer
+        field: Field that matched ("word" or "meaning")
+
+    Returns:
+        Text such as "That is the meaning of 'het huis'."
+    """
+    if field == "meaning":
+        return f"That is the meaning of '{pair['word']}'."
+    return f"That is the word for '{pair['meaning']}'."
+
+
+class _NGramIndex:
+    """
+    Inverted index from character trigrams to cards, used to find cards whose
+    answer is within a few edits of a typed text without comparing every card.
+    """
+
+    N = 3
+    _PAD = "\x00" * (N - 1)
+
+    def __init__(self, forms: Iterable):
+        """
+        Build the index.
+
+        Args:
+            forms: Accepted forms for each card, in card order
+        """
+        postings = {}
+        for index, accepted in enumerate(forms):
+            grams = set()
+            for form in ((accepted,) if type(accepted) is str else accepted):
+                grams.update(self.grams(form))
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(index)
+        self._postings = postings
+
+    @classmethod
+    def grams(cls, text: str) -> Set[str]:
+        """Get the distinct padded trigrams of a text."""
+        padded = cls._PAD + text + cls._PAD
+        return {padded[i:i + cls.N] for i in range(len(padded) - cls.N + 1)}
+
+    def candidates(self, text: str, max_distance: int) -> Set[int]:
+        """
+        Get the cards that may be within max_distance edits of text.
+
+        Each edit changes at most N + 1 trigrams (N for an insertion, deletion or
+        substitution, N + 1 for swapping two characters), so a match shares all
+        but max_distance * (N + 1) of the text's trigrams and must contain at
+        least one of its max_distance * (N + 1) + 1 rarest trigrams. Only those
+        postings are read.
+
+        Args:
+            text: Normalized typed text
+            max_distance: Largest edit distance of interest
+
+        Returns:
+            Set of card indices to verify
+        """
+        empty = array('I')
+        postings = sorted((self._postings.get(gram, empty) for gram in self.grams(text)), key=len)
+        result = set()
+        for posting in postings[:max_distance * (self.N + 1) + 1]:
+            result.update(posting)
+        return result
+
+
+class AnswerMatcher:
+    """
+    Matches typed answers against the words and meanings of a deck.
+
+    Every pair is normalized once when the matcher is built (NFKC, casefold,
+    collapsed whitespace, and by default no leading article or punctuation, so
+    "house" answers "the house"), so checking an answer only normalizes the
+    typed text and does a constant-time lookup.
+    A card also accepts these variants of its answer:
+        - the answer without notes in parentheses ("the teacher (female)")
+        - each alternative of "a/b" or "a; b" ("the director/principal")
+
+    check() also reports answers within a few typos as CLOSE, and suggest()
+    finds the card a wrong answer belongs to. Suggestions use a dictionary of
+    normalized answers and, on decks of up to FUZZY_SUGGESTION_LIMIT cards, a
+    trigram index for misspelled answers; both are built the first time they
+    are needed.
+    """
+
+    # Largest deck whose trigram index is built (about a second per 100,000 cards)
+    FUZZY_SUGGESTION_LIMIT = 50000
+
+    FIELDS = ("word", "meaning")
+
+    # id(deck) -> (weak reference to the deck, {options: matcher}); entries are
+    # dropped with the deck. Keyed by identity because equal decks may differ later.
+    _shared = {}
+
+    def __init__(self, pairs: Optional[Sequence] = None, strip_articles: bool = True,
+                 strip_punctuation: bool = True):
+        """
+        Initialize the matcher.
+
+        Args:
+            pairs: Pairs to index for is_correct() and check(); None for check_text() only
+            strip_articles: Ignore a leading article ("the house" == "house")
+            strip_punctuation: Ignore punctuation in answers
+        """
+        self.strip_articles = strip_articles
+        self.strip_punctuation = strip_punctuation
+        self._accepted = {}
+        self._exact_forms = {}
+        self._ngram_indexes = {}
+        if pairs is not None:
+            if hasattr(pairs, "words"):
+                columns = {"word": pairs.words, "meaning": pairs.meanings}
+            else:
+                columns = {field: [pair[field] for pair in pairs] for field in self.FIELDS}
+            for field, texts in columns.items():
+                self._accepted[field] = self._build_index(texts)
+
+    @classmethod
+    def for_pairs(cls, pairs: Sequence, strip_articles: bool = True,
+                  strip_punctuation: bool = True) -> "AnswerMatcher":
+        """
+        Get the shared matcher for a deck, building it on first use.
+
+        Args:
+            pairs: Pairs of the deck (a PairStore is cached for its lifetime)
+            strip_articles: Ignore a leading article
+            strip_punctuation: Ignore punctuation
+
+        Returns:
+            AnswerMatcher indexing the given pairs
+        """
+        options = (strip_articles, strip_punctuation)
+        key = id(pairs)
+        entry = cls._shared.get(key)
+        if entry is None or entry[0]() is not pairs:
+            try:
+                ref = weakref.ref(pairs, lambda _, key=key: cls._shared.pop(key, None))
+            except TypeError:
+                # Plain lists can't be weakly referenced; build an unshared matcher
+                return cls(pairs, strip_articles, strip_punctuation)
+            entry = cls._shared[key] = (ref, {})
+
+        per_deck = entry[1]
+        matcher = per_deck.get(options)
+        if matcher is None:
+            matcher = per_deck[options] = cls(pairs, strip_articles, strip_punctuation)
+        return matcher
+
+    def normalize(self, text: str) -> str:
+        """
+        Normalize text for comparison.
+
+        Args:
+            text: Answer or stored word/meaning
+
+        Returns:
+            Normalized text
+        """
+        ascii_text = text.isascii()
+        if not ascii_text:
+            text = unicodedata.normalize("NFKC", text)
+        text = text.casefold()
+        # Most answers have no punctuation; checking that first is cheaper than removing it
+        if self.strip_punctuation and not text.replace(" ", "").isalnum():
+            text = text.translate(_ASCII_PUNCTUATION) if ascii_text else _PUNCTUATION.sub("", text)
+        text = " ".join(text.split())
+        if self.strip_articles:
+            first, _, rest = text.partition(" ")
+            if rest and first in ARTICLES:
+                text = rest
+        return text
+
+    def accepted_forms(self, text: str) -> AcceptedForms:
+        """
+        Get every normalized form accepted for a stored word or meaning.
+
+        Args:
+            text: Stored word or meaning
+
+        Returns:
+            The single normalized form, or a frozenset when there are variants
+        """
+        normalized = self.normalize(text)
+        if normalized == text:
+            normalized = text  # Reuse the stored string instead of a copy
+
+        if "(" not in text and "/" not in text and ";" not in text:
+            return normalized
+
+        forms = {normalized}
+        base = _PARENTHETICAL.sub("", text).strip()
+        parts = [part for part in _ALTERNATIVE_SEPARATOR.split(base) if part]
+        # Don't split abbreviations such as "km/h"
+        if len(parts) > 1 and min(len(part) for part in parts) < 2:
+            parts = [base]
+        if len(parts) > 1:
+            # "the director/principal" also accepts "the principal"
+            article = parts[0].split(" ", 1)[0]
+            if article.casefold() in ARTICLES:
+                parts += [f"{article} {part}" for part in parts[1:]
+                          if part.split(" ", 1)[0].casefold() not in ARTICLES]
+        for part in parts:
+            form = self.normalize(part)
+            if form:
+                forms.add(form)
+
+        return normalized if len(forms) == 1 else frozenset(forms)
+
+    def is_correct(self, answer: str, index: int, field: str) -> bool:
+        """
+        Check an answer against an indexed card.
+
+        Args:
+            answer: Typed answer
+            index: Index of the pair in the deck
+            field: "word" or "meaning", whichever the user had to type
+
+        Returns:
+            True if the answer is accepted
+        """
+        accepted = self._accepted[field][index]
+        answer = self.normalize(answer)
+        if type(accepted) is str:
+            return answer == accepted
+        return answer in accepted
+
+    def check(self, answer: str, index: int, field: str) -> str:
+        """
+        Grade an answer against an indexed card, tolerating typos.
+
+        Args:
+            answer: Typed answer
+            index: Index of the pair in the deck
+            field: "word" or "meaning", whichever the user had to type
+
+        Returns:
+            CORRECT, CLOSE (within max_typos() edits) or INCORRECT; an answer
+            that is exactly another card's is INCORRECT, however close it is
+        """
+        return self._grade(self.normalize(answer), self._accepted[field][index], self._exact_index(field))
+
+    def check_text(self, answer: str, expected: str) -> str:
+        """
+        Grade an answer against text that isn't indexed (e.g. a streamed pair).
+
+        Args:
+            answer: Typed answer
+            expected: Stored word or meaning
+
+        Returns:
+            CORRECT, CLOSE or INCORRECT
+        """
+        return self._grade(self.normalize(answer), self.accepted_forms(expected))
+
+    def suggest(self, answer: str, field: str, exclude: int) -> Optional[int]:
+        """
+        Find another card whose answer the typed text matches (allowing typos).
+
+        Args:
+            answer: Typed answer
+            field: Field the user had to type ("word" or "meaning")
+            exclude: Index of the card that was asked
+
+        Returns:
+            Index of the closest other card, or None
+        """
+        answer = self.normalize(answer)
+        if not answer:
+            return None
+
+        index = self._exact_index(field).get(answer)
+        if index is not None and index != exclude:
+            return index
+
+        accepted = self._accepted[field]
+        limit = max_typos(len(answer))
+        if not limit or len(accepted) > self.FUZZY_SUGGESTION_LIMIT:
+            return None
+        ngram_index = self._ngram_index(field)
+
+        best_index = None
+        best_distance = limit + 1
+        # Sorted so that ties go to the first card in the deck
+        for index in sorted(ngram_index.candidates(answer, limit)):
+            if index == exclude:
+                continue
+            distance = self._distance(answer, accepted[index], best_distance - 1)
+            if distance < best_distance:
+                best_index = index
+                best_distance = distance
+        return best_index
+
+    def prepare_suggestions(self):
+        """
+        Build the indexes suggest() uses now rather than on its first call,
+        e.g. on a worker thread so that first call doesn't hold up a server.
+        """
+        for field in self._accepted:
+            self._exact_index(field)
+            if len(self._accepted[field]) <= self.FUZZY_SUGGESTION_LIMIT:
+                self._ngram_index(field)
+
+    def _exact_index(self, field: str) -> dict:
+        """Get the dictionary from accepted form to first card, building it on first use."""
+        exact_forms = self._exact_forms.get(field)
+        if exact_forms is None:
+            exact_forms = {}
+            for index, accepted in enumerate(self._accepted[field]):
+                for form in ((accepted,) if type(accepted) is str else accepted):
+                    exact_forms.setdefault(form, index)
+            self._exact_forms[field] = exact_forms
+        return exact_forms
+
+    def _ngram_index(self, field: str) -> _NGramIndex:
+        """Get the trigram index of a field, building it on first use."""
+        ngram_index = self._ngram_indexes.get(field)
+        if ngram_index is None:
+            ngram_index = self._ngram_indexes[field] = _NGramIndex(self._accepted[field])
+        return ngram_index
+
+    def _grade(self, answer: str, accepted: AcceptedForms, exact_forms: Optional[dict] = None) -> str:
+        """
+        Grade a normalized answer against a card's accepted forms.
+
+        Args:
+            answer: Normalized answer
+            accepted: Accepted forms of the card that was asked
+            exact_forms: Accepted forms of every card in the deck (see _exact_index), if indexed
+        """
+        if type(accepted) is str:
+            if answer == accepted:
+                return CORRECT
+        elif answer in accepted:
+            return CORRECT
+        # Another card's answer isn't a typo of this one (suggest() points at that card)
+        if exact_forms is not None and answer in exact_forms:
+            return INCORRECT
+
+        limit = max_typos(len(answer))
+        if limit and self._distance(answer, accepted, limit) <= limit:
+            return CLOSE
+        return INCORRECT
+
+    @staticmethod
+    def _distance(answer: str, accepted: AcceptedForms, max_distance: int) -> int:
+        """Bounded edit distance to the closest accepted form."""
+        if max_distance < 0:
+            return 0 if answer == accepted else 1
+        if type(accepted) is str:
+            return edit_distance(answer, accepted, max_distance)
+        return min(edit_distance(answer, form, max_distance) for form in accepted)
+
+    def _build_index(self, texts: Sequence[str]) -> List[AcceptedForms]:
+        """Normalize a whole column once."""
+        return [self.accepted_forms(text) for text in texts]
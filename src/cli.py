@@ -0,0 +1,271 @@
+"""
+Command Line Interface
+Subcommands that skip the menus, for scripts and automation.
+
+Usage:
+    python src/main.py list [--json]
+    python src/main.py view DECK [--json | --browse]
+    python src/main.py test DECK [--n 50] [--direction random] [--seed 1]
+    python src/main.py export DECK DIRECTORY [--tests 30] [--n 20] [--direction random] [--seed 1]
+    python src/main.py grade DECK ANSWERS [--report FILE] [--shard 0 --shards 4] [--json]
+    python src/main.py stats [--wordlist NAME] [--days 30] [--sort accuracy] [--limit 20] [--json]
+    python src/main.py serve [--host 127.0.0.1] [--port 8000] [--no-history] [--log]
+
+DECK is a wordlist or folder name as shown by list (case doesn't matter).
+Running main.py without a subcommand starts the interactive menus.
+
+Exit codes:
+    0    success
+    1    the command failed (unknown deck, unreadable file, input ended early, ...)
+    2    invalid arguments
+    130  interrupted (Ctrl+C)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from pathlib import Path
+from typing import List, Optional
+from colors import Colors
+from test_generator import TEST_DIRECTIONS
+import stats
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INTERRUPTED = 130
+
+
+def error(message: str) -> int:
+    """Report a failed command on stderr."""
+    print(Colors.red(f"❌ {message}"), file=sys.stderr)
+    return EXIT_FAILED
+
+
+def open_deck(name: str, in_memory: bool = False):
+    """
+    Load a wordlist or folder by name, without the wordlist menu.
+
+    Args:
+        name: Wordlist or folder name as shown by the list command
+        in_memory: Read a streamed (very large) wordlist fully into memory
+
+    Returns:
+        Loaded wordlist dictionary or None (the reason has been printed)
+    """
+    from main import match_choice, materialize, open_choice
+    from console import TerminalConsole
+    from wordlist_manager import WordlistManager
+
+    # Load errors go to stderr, keeping stdout for the command's output
+    manager = WordlistManager("wordlists", console=TerminalConsole(sys.stderr))
+    choices = manager.get_available_wordlists() + [folder["name"] for folder in manager.get_folders()]
+    matched = match_choice(name, choices)
+    if matched is None:
+        error(f"Wordlist '{name}' not found. Run the list command to see the available ones.")
+        return None
+    wordlist = open_choice(manager, matched)
+    if wordlist is not None and in_memory:
+        wordlist = materialize(wordlist, TerminalConsole())
+    return wordlist
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    """List the wordlists and folders."""
+    from console import TerminalConsole
+    from wordlist_manager import WordlistManager
+
+    manager = WordlistManager("wordlists", console=TerminalConsole(sys.stderr))
+    catalog = manager.get_catalog()
+    folders = manager.get_folders()
+    if args.json:
+        print(json.dumps({
+            "wordlists": [{"name": entry["name"], "pairs": entry["pair_count"], "invalid": entry["invalid"]}
+                          for entry in catalog],
+            "folders": [{"name": folder["name"], "lists": folder["lists"], "pairs": folder["pair_count"]}
+                        for folder in folders],
+        }, ensure_ascii=False, indent=2))
+        return EXIT_OK
+    # Pair counts are known once a list has been opened ("-" until then)
+    for entry in catalog:
+        count = "invalid" if entry["invalid"] else entry["pair_count"]
+        print(f"{count if count is not None else '-':>8}  {entry['name']}")
+    for folder in folders:
+        count = folder["pair_count"]
+        print(f"{count if count is not None else '-':>8}  {folder['name']}")
+    return EXIT_OK
+
+
+def cmd_view(args: argparse.Namespace) -> int:
+    """Print every pair of a deck."""
+    wordlist = open_deck(args.deck, in_memory=True)
+    if wordlist is None:
+        return EXIT_FAILED
+    if args.json:
+        pairs = wordlist["pairs"]
+        print(json.dumps({"name": wordlist["name"], "pairs": [
+            {"word": word, "meaning": meaning} for word, meaning in zip(pairs.words, pairs.meanings)
+        ]}, ensure_ascii=False, indent=2))
+        return EXIT_OK
+    from view_mode import ViewMode
+    ViewMode(wordlist).start(browse=args.browse)
+    return EXIT_OK
+
+
+def cmd_test(args: argparse.Namespace) -> int:
+    """Take a test, reading the answers from stdin."""
+    if args.n < 1:
+        return error("--n must be at least 1.")
+    wordlist = open_deck(args.deck)
+    if wordlist is None:
+        return EXIT_FAILED
+    from test_mode import TestMode
+    test_mode = TestMode(wordlist, seed=args.seed)
+    num_questions = args.n if test_mode.max_questions is None else min(args.n, test_mode.max_questions)
+    try:
+        test_mode.run(num_questions, args.direction, wait=False)
+    except EOFError:
+        return error("Input ended before the test was finished.")
+    return EXIT_OK
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Write a batch of exam sheets."""
+    wordlist = open_deck(args.deck, in_memory=True)
+    if wordlist is None:
+        return EXIT_FAILED
+    from test_mode import TestMode
+    test_mode = TestMode(wordlist)
+    if args.tests < 1 or not 1 <= args.n <= test_mode.max_questions:
+        return error(f"--tests must be at least 1 and --n from 1 to {test_mode.max_questions}.")
+    seed = args.seed if args.seed is not None else random.randrange(1000000)
+    try:
+        written = test_mode.export_exams(args.directory, args.tests, args.n, args.direction, seed)
+    except OSError as e:
+        return error(f"Could not write the exam sheets: {e}")
+    print(f"Wrote {args.tests} tests of {args.n} questions to {args.directory} (seed {seed})")
+    print(f"Answer key: {written[0]}")
+    return EXIT_OK
+
+
+def cmd_grade(args: argparse.Namespace) -> int:
+    """Grade a file of submitted answers."""
+    wordlist = open_deck(args.deck, in_memory=True)
+    if wordlist is None:
+        return EXIT_FAILED
+    if not 0 <= args.shard < args.shards:
+        return error(f"--shard must be from 0 to {args.shards - 1}.")
+    from test_mode import TestMode
+    test_mode = TestMode(wordlist)
+    answers = sys.stdin if args.answers == "-" else args.answers
+    try:
+        report = open(args.report, "w", encoding="utf-8") if args.report else None
+        try:
+            summary = test_mode.grade_batch(answers, report, args.shard, args.shards)
+        finally:
+            if report is not None:
+                report.close()
+    except OSError as e:
+        return error(f"Could not grade the answers: {e}")
+    if args.json:
+        print(json.dumps(summary.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        test_mode.display_results(summary, "batch", wait=False)
+    return EXIT_OK
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Serve the web app and the JSON API until interrupted."""
+    import server
+    return server.main(args.server_options, prog="main.py serve")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser for every subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Flashcards without the menus (run without arguments for the menus)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="append per-question timing events (JSONL) to FILE ('-' for stderr)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    command = commands.add_parser("list", help="list the wordlists and folders")
+    command.add_argument("--json", action="store_true", help="print the list as JSON")
+    command.set_defaults(func=cmd_list)
+
+    command = commands.add_parser("view", help="print every pair of a deck")
+    command.add_argument("deck", help="wordlist or folder name")
+    output = command.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="print the pairs as JSON")
+    output.add_argument("--browse", action="store_true", help="open the scrollable view instead")
+    command.set_defaults(func=cmd_view)
+
+    command = commands.add_parser("test", help="take a test, answers read from stdin")
+    command.add_argument("deck", help="wordlist or folder name")
+    command.add_argument("--n", type=int, default=20, help="number of questions (default: 20, at most the deck size)")
+    command.add_argument("--direction", choices=TEST_DIRECTIONS, default="random",
+                         help="which side is asked (default: random)")
+    command.add_argument("--seed", type=int, help="seed for a reproducible test")
+    command.set_defaults(func=cmd_test)
+
+    command = commands.add_parser("export", help="write printable exam sheets and an answer key")
+    command.add_argument("deck", help="wordlist or folder name")
+    command.add_argument("directory", type=Path, help="output directory")
+    command.add_argument("--tests", type=int, default=1, help="number of tests, one per student (default: 1)")
+    command.add_argument("--n", type=int, default=20, help="questions per test (default: 20)")
+    command.add_argument("--direction", choices=TEST_DIRECTIONS, default="random",
+                         help="which side is asked (default: random)")
+    command.add_argument("--seed", type=int, help="seed for the tests (default: a new one, printed)")
+    command.set_defaults(func=cmd_export)
+
+    command = commands.add_parser("grade", help="grade a CSV of question_id,answer rows")
+    command.add_argument("deck", help="wordlist or folder name the tests were exported from")
+    command.add_argument("answers", help="CSV file of answers ('-' for stdin)")
+    command.add_argument("--report", metavar="FILE", help="write one JSON line per answer to FILE")
+    command.add_argument("--shard", type=int, default=0, help="grade only this shard of the rows (from 0)")
+    command.add_argument("--shards", type=int, default=1, help="number of shards the rows are split into")
+    command.add_argument("--json", action="store_true", help="print the summary as JSON")
+    command.set_defaults(func=cmd_grade)
+
+    command = commands.add_parser("stats", help="show per-card accuracy from the answer history")
+    stats.add_arguments(command)
+    command.set_defaults(func=stats.run)
+
+    # The server parses its own options (see server.main), so asyncio is only imported to serve
+    command = commands.add_parser("serve", help="serve the web app and a JSON API over HTTP", add_help=False)
+    command.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a subcommand.
+
+    Args:
+        argv: Arguments after the program name (sys.argv[1:] if None)
+
+    Returns:
+        Exit code
+    """
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "serve":
+        args.server_options = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.trace:
+        import instrumentation
+        instrumentation.configure(args.trace)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print(Colors.yellow("\nInterrupted."), file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # The reader went away (e.g. "| head"); silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,43 @@
 """
 Color utilities for terminal output using ANSI codes.
 """
+import os
+import sys
+from functools import lru_cache
+
+
+def styling_supported(stream=None) -> bool:
+    """
+    Check whether ANSI styling should be written to a stream.
+
+    Styling is off when the stream isn't a terminal (pipes, log files), when
+    NO_COLOR is set to a non-empty value (https://no-color.org) or when
+    TERM is "dumb".
+
+    Args:
+        stream: Output stream (defaults to sys.stdout)
+
+    Returns:
+        True if escape codes should be emitted
+    """
+    stream = stream if stream is not None else sys.stdout
+    if os.environ.get("NO_COLOR") or os.environ.get("TERM") == "dumb":
+        return False
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
 
 class Colors:
-    """ANSI color codes for terminal output."""
+    """
+    ANSI color codes for terminal output.
+
+    Whether styling is used is decided once, at import (see
+    styling_supported()); when it is off every helper returns the plain
+    text, so scripted and piped runs get no escape codes. Call configure()
+    to override the decision.
+    """
     
     # Basic colors
     RED = '\033[91m'
@@ -21,52 +55,107 @@ class Colors:
     # Reset
     RESET = '\033[0m'
     
+    enabled = True
+    
+    @classmethod
+    def configure(cls, enabled: bool = None):
+        """
+        Turn styling on or off for every helper.
+
+        Args:
+            enabled: True or False, or None to detect it from stdout and the
+                environment again
+        """
+        if enabled is None:
+            enabled = styling_supported()
+        cls.enabled = enabled
+        cls.rule.cache_clear()
+        cls.banner.cache_clear()
+    
     @staticmethod
     def red(text):
         """Return text in red."""
-        return f"{Colors.RED}{text}{Colors.RESET}"
+        return f"{Colors.RED}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def green(text):
         """Return text in green."""
-        return f"{Colors.GREEN}{text}{Colors.RESET}"
+        return f"{Colors.GREEN}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def yellow(text):
         """Return text in yellow."""
-        return f"{Colors.YELLOW}{text}{Colors.RESET}"
+        return f"{Colors.YELLOW}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def blue(text):
         """Return text in blue."""
-        return f"{Colors.BLUE}{text}{Colors.RESET}"
+        return f"{Colors.BLUE}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def magenta(text):
         """Return text in magenta."""
-        return f"{Colors.MAGENTA}{text}{Colors.RESET}"
+        return f"{Colors.MAGENTA}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def cyan(text):
         """Return text in cyan."""
-        return f"{Colors.CYAN}{text}{Colors.RESET}"
+        return f"{Colors.CYAN}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def bold(text):
         """Return text in bold."""
-        return f"{Colors.BOLD}{text}{Colors.RESET}"
+        return f"{Colors.BOLD}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def bold_cyan(text):
         """Return text in bold cyan."""
-        return f"{Colors.BOLD}{Colors.CYAN}{text}{Colors.RESET}"
+        return f"{Colors.BOLD}{Colors.CYAN}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def bold_green(text):
         """Return text in bold green."""
-        return f"{Colors.BOLD}{Colors.GREEN}{text}{Colors.RESET}"
+        return f"{Colors.BOLD}{Colors.GREEN}{text}{Colors.RESET}" if Colors.enabled else str(text)
+    
+    @staticmethod
+    def bold_yellow(text):
+        """Return text in bold yellow."""
+        return f"{Colors.BOLD}{Colors.YELLOW}{text}{Colors.RESET}" if Colors.enabled else str(text)
     
     @staticmethod
     def bold_red(text):
         """Return text in bold red."""
-        return f"{Colors.BOLD}{Colors.RED}{text}{Colors.RESET}"
+        return f"{Colors.BOLD}{Colors.RED}{text}{Colors.RESET}" if Colors.enabled else str(text)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def rule(width: int = 50) -> str:
+        """
+        Get a cyan separator line of "=" (built once per width).
+
+        Args:
+            width: Number of columns
+
+        Returns:
+            Styled separator
+        """
+        return Colors.cyan("=" * width)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def banner(title: str, width: int = 50) -> str:
+        """
+        Get a bold cyan title between two separators (built once per title).
+
+        Args:
+            title: Title text, including its leading indentation
+            width: Width of the separators
+
+        Returns:
+            Styled banner, starting with a blank line
+        """
+        rule = Colors.rule(width)
+        return f"\n{rule}\n{Colors.bold_cyan(title)}\n{rule}"
+
+
+Colors.configure()
@@ -0,0 +1,188 @@
+"""
+Console Module
+The prompt/answer protocol the menus and modes use for their I/O, with a
+terminal implementation and a scripted one for replays and load tests.
+"""
+import builtins
+import math
+import sys
+import time
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Sequence, TextIO
+from terminal import write_paged
+
+
+class ScriptExhausted(EOFError):
+    """Raised when a scripted console is asked for more answers than it has."""
+
+
+def percentiles(values: Sequence[float], points: Iterable[float] = (50, 90, 99)) -> Dict[str, float]:
+    """
+    Compute percentiles by the nearest-rank method.
+
+    Args:
+        values: Measurements (need not be sorted)
+        points: Percentiles to compute, from 0 to 100
+
+    Returns:
+        {"p50": ..., "p90": ..., ...}, or an empty dictionary if there are no values
+    """
+    if not values:
+        return {}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{point:g}": ordered[min(last, max(0, math.ceil(point / 100 * len(ordered)) - 1))]
+            for point in points}
+
+
+class Console(ABC):
+    """
+    Where a mode writes its output and reads its answers.
+
+    Every prompt goes through input() and every message through print(), with
+    the same signatures as the builtins, so a mode never touches stdin or
+    stdout itself. Subclasses must implement both.
+    """
+
+    # Whether a person is at a terminal (full-screen views need one)
+    interactive = False
+
+    @abstractmethod
+    def print(self, *values, sep: str = " ", end: str = "\n"):
+        """Write a message, like builtins.print()."""
+
+    @abstractmethod
+    def input(self, prompt: str = "") -> str:
+        """
+        Show a prompt and read one answer, like builtins.input().
+
+        Raises:
+            EOFError: If there are no more answers
+        """
+
+    def page(self, text: str):
+        """Write a long block of text at once."""
+        self.print(text, end="")
+
+
+class TerminalConsole(Console):
+    """Console reading from stdin and writing to stdout."""
+
+    def __init__(self, output: Optional[TextIO] = None):
+        """
+        Initialize the console.
+
+        Args:
+            output: Stream for messages instead of stdout (e.g. sys.stderr when
+                stdout carries a command's result); prompts still go to stdout
+        """
+        self.output = output
+
+    @property
+    def interactive(self) -> bool:
+        return sys.stdin.isatty() and sys.stdout.isatty()
+
+    def print(self, *values, sep: str = " ", end: str = "\n"):
+        builtins.print(*values, sep=sep, end=end, file=self.output)
+
+    def input(self, prompt: str = "") -> str:
+        return builtins.input(prompt)
+
+    def page(self, text: str):
+        write_paged(text)
+
+
+class ScriptedConsole(Console):
+    """
+    Console that answers prompts from a list, a file or a generator.
+
+    Output is discarded unless an output stream is given, so the speed of a
+    replay is the speed of the app itself. The time between handing out an
+    answer and the next prompt is recorded for every prompt; that is the time
+    the app spent checking the answer and preparing the next question.
+    """
+
+    def __init__(self, answers: Iterable[str], output: Optional[TextIO] = None,
+                 echo: bool = False):
+        """
+        Initialize the console.
+
+        Args:
+            answers: Answers in the order the prompts will ask for them
+            output: Stream for the app's output (discarded if None)
+            echo: Write each answer after its prompt, as if it had been typed
+        """
+        self._answers = iter(answers)
+        self.output = output
+        self.echo = echo
+        self.answers_given = 0
+        self.latencies = array('d')
+        self.started = None
+        self._answered_at = None
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ScriptedConsole":
+        """
+        Build a console answering with the lines of a file.
+
+        Args:
+            path: Text file with one answer per line
+            **kwargs: Passed to ScriptedConsole()
+
+        Returns:
+            ScriptedConsole reading the file lazily
+        """
+        return cls(_read_lines(path), **kwargs)
+
+    def print(self, *values, sep: str = " ", end: str = "\n"):
+        if self.output is not None:
+            builtins.print(*values, sep=sep, end=end, file=self.output)
+
+    def input(self, prompt: str = "") -> str:
+        now = time.perf_counter()
+        if self._answered_at is None:
+            self.started = now
+        else:
+            self.latencies.append(now - self._answered_at)
+
+        if self.output is not None:
+            self.output.write(prompt)
+        try:
+            answer = next(self._answers)
+        except StopIteration:
+            raise ScriptExhausted(f"script ran out after {self.answers_given} answers") from None
+        if self.echo and self.output is not None:
+            self.output.write(answer + "\n")
+
+        self.answers_given += 1
+        self._answered_at = time.perf_counter()
+        return answer
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the replay so far.
+
+        Returns:
+            Number of answers, elapsed seconds, answers per second, and the
+            mean, percentiles and maximum of the per-prompt latency in seconds
+        """
+        elapsed = (self._answered_at - self.started) if self.started is not None else 0.0
+        summary = {
+            "answers": self.answers_given,
+            "seconds": elapsed,
+            "answers_per_second": self.answers_given / elapsed if elapsed else 0.0,
+        }
+        if self.latencies:
+            summary["latency_mean"] = sum(self.latencies) / len(self.latencies)
+            summary.update({f"latency_{name}": value
+                            for name, value in percentiles(self.latencies).items()})
+            summary["latency_max"] = max(self.latencies)
+        return summary
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    """Yield the lines of a text file without their line endings."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
@@ -0,0 +1,257 @@
+"""
+Grading Module
+Aggregated test results that can be built one answer at a time and merged,
+and reading of submitted answer files for batch grading.
+"""
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from answer_matcher import CLOSE, INCORRECT
+
+
+class TestSummary:
+    """
+    Score of a test or of a batch of submitted answers.
+
+    Only counts are kept for every answer; the close and wrong answers
+    themselves are kept up to detail_limit each, so a summary of a million
+    answers stays small. Summaries of shards of a batch can be merged, also
+    across processes through to_dict() and from_dict().
+    """
+
+    def __init__(self, detail_limit: Optional[int] = None):
+        """
+        Initialize an empty summary.
+
+        Args:
+            detail_limit: Close and wrong answers kept for display, each
+                (all of them if None)
+        """
+        self.detail_limit = detail_limit
+        self.total = 0
+        self.correct = 0
+        self.close = 0
+        self.invalid = 0
+        self.wrong_deck = 0
+        self.close_answers = []
+        self.wrong_answers = []
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict]) -> "TestSummary":
+        """
+        Summarize the result dictionaries of a test taken interactively.
+
+        Args:
+            results: Result dictionaries from TestMode._run_test
+
+        Returns:
+            TestSummary keeping every close and wrong answer
+        """
+        summary = cls()
+        for result in results:
+            summary.add(result)
+        return summary
+
+    @property
+    def incorrect(self) -> int:
+        """Number of gradable answers that were wrong."""
+        return self.total - self.correct
+
+    @property
+    def percentage(self) -> float:
+        """Share of correct answers, from 0 to 100."""
+        return self.correct / self.total * 100 if self.total else 0.0
+
+    def wants_detail(self, is_correct: bool, is_close: bool) -> bool:
+        """Check whether the details of an answer with this outcome would be kept."""
+        if is_close:
+            return self.detail_limit is None or len(self.close_answers) < self.detail_limit
+        if not is_correct:
+            return self.detail_limit is None or len(self.wrong_answers) < self.detail_limit
+        return False
+
+    def add(self, result: Dict):
+        """
+        Count one graded answer and keep its details if there is room.
+
+        Args:
+            result: Result dictionary with at least "is_correct" and "is_close"
+        """
+        self.count(result["is_correct"], result["is_close"])
+        if self.wants_detail(result["is_correct"], result["is_close"]):
+            (self.close_answers if result["is_close"] else self.wrong_answers).append(result)
+
+    def count(self, is_correct: bool, is_close: bool):
+        """
+        Count one graded answer without keeping its details.
+
+        Args:
+            is_correct: Whether the answer scored as correct (close answers do)
+            is_close: Whether it was only accepted with typos
+        """
+        self.total += 1
+        if is_correct:
+            self.correct += 1
+        if is_close:
+            self.close += 1
+
+    def add_invalid(self, wrong_deck: bool = False):
+        """
+        Count a submitted row that couldn't be graded (e.g. an unknown question id).
+
+        Args:
+            wrong_deck: The question was exported from another version of the deck
+        """
+        self.invalid += 1
+        if wrong_deck:
+            self.wrong_deck += 1
+
+    def merge(self, other: "TestSummary") -> "TestSummary":
+        """
+        Add the counts and details of another summary to this one.
+
+        Args:
+            other: Summary of another part of the batch
+
+        Returns:
+            self
+        """
+        self.total += other.total
+        self.correct += other.correct
+        self.close += other.close
+        self.invalid += other.invalid
+        self.wrong_deck += other.wrong_deck
+        for mine, theirs in ((self.close_answers, other.close_answers),
+                             (self.wrong_answers, other.wrong_answers)):
+            room = len(theirs) if self.detail_limit is None else max(0, self.detail_limit - len(mine))
+            mine.extend(theirs[:room])
+        return self
+
+    def to_dict(self) -> Dict:
+        """Get the summary as JSON-serializable data."""
+        return {
+            "total": self.total,
+            "correct": self.correct,
+            "close": self.close,
+            "incorrect": self.incorrect,
+            "invalid": self.invalid,
+            "wrong_deck": self.wrong_deck,
+            "percentage": round(self.percentage, 2),
+            "detail_limit": self.detail_limit,
+            "close_answers": self.close_answers,
+            "wrong_answers": self.wrong_answers,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TestSummary":
+        """
+        Rebuild a summary written by to_dict(), e.g. by another shard.
+
+        Args:
+            data: Dictionary from to_dict()
+
+        Returns:
+            TestSummary
+        """
+        summary = cls(data.get("detail_limit"))
+        summary.total = data["total"]
+        summary.correct = data["correct"]
+        summary.close = data["close"]
+        summary.invalid = data.get("invalid", 0)
+        summary.wrong_deck = data.get("wrong_deck", 0)
+        summary.close_answers = list(data.get("close_answers", ()))
+        summary.wrong_answers = list(data.get("wrong_answers", ()))
+        return summary
+
+
+def build_result(number: int, pair, is_word_to_meaning: bool, user_answer: str,
+                 outcome: str, suggestion: Optional[str]) -> Dict:
+    """
+    Build the result dictionary of one answered test question.
+
+    Args:
+        number: Question number (row number for a graded batch)
+        pair: Pair the question was asked about
+        is_word_to_meaning: Whether the word was shown
+        user_answer: The answer given
+        outcome: CORRECT, CLOSE or INCORRECT
+        suggestion: Hint at the card the answer belongs to, if any
+
+    Returns:
+        Result dictionary, as kept by TestSummary
+    """
+    if is_word_to_meaning:
+        question, correct_answer, question_type = pair["word"], pair["meaning"], "Word → Meaning"
+    else:
+        question, correct_answer, question_type = pair["meaning"], pair["word"], "Meaning → Word"
+    return {
+        "question_number": number,
+        "question": question,
+        "question_type": question_type,
+        "user_answer": user_answer,
+        "correct_answer": correct_answer,
+        # Close answers score as correct but are listed separately
+        "is_correct": outcome != INCORRECT,
+        "is_close": outcome == CLOSE,
+        "suggestion": suggestion,
+        "word": pair["word"],
+        "meaning": pair["meaning"]
+    }
+
+
+AnswerSource = Union[str, Path, TextIO, Iterable[Tuple[str, str]]]
+
+
+def read_answer_rows(source: AnswerSource) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+    """
+    Read submitted answers one row at a time.
+
+    A file or stream is read as CSV. With a header row that names a
+    "question_id" and an "answer" column, those are used and the other
+    columns (a student name, say) are passed along; without one, the first
+    two columns are the question id and the answer. Any other iterable must
+    yield (question_id, answer) pairs.
+
+    Args:
+        source: CSV file path, open text stream, or iterable of pairs
+
+    Returns:
+        Iterator over (question_id, answer, extra columns) tuples
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8", newline="") as f:
+            yield from read_answer_rows(f)
+        return
+    if not hasattr(source, "read"):
+        for question_id, answer in source:
+            yield question_id, answer, {}
+        return
+
+    reader = csv.reader(source)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = [cell.strip().lower() for cell in first]
+    if "question_id" in header and "answer" in header:
+        id_column = header.index("question_id")
+        answer_column = header.index("answer")
+        extra_columns = [(i, name) for i, name in enumerate(first)
+                         if i not in (id_column, answer_column)]
+        rows = reader
+    else:
+        id_column, answer_column, extra_columns = 0, 1, []
+        rows = _chain_row(first, reader)
+
+    width = max(id_column, answer_column) + 1
+    for row in rows:
+        if len(row) < width:
+            # Short rows are passed on so they are counted as invalid, not dropped
+            row = row + [""] * (width - len(row))
+        extra = {name: row[i] for i, name in extra_columns if i < len(row)}
+        yield row[id_column].strip(), row[answer_column], extra
+
+
+def _chain_row(first: List[str], rows: Iterator[List[str]]) -> Iterator[List[str]]:
+    """Yield a row that was already read, then the rest."""
+    yield first
+    yield from rows
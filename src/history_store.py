@@ -0,0 +1,355 @@
+"""
+History Store Module
+Keeps every answered question of Learn and Test mode in a SQLite database
+and answers per-card accuracy questions about it.
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from progress_store import get_data_dir
+
+# (word, meaning, direction, result, latency seconds, answered at)
+Answer = Tuple[str, str, str, str, float, float]
+
+SECONDS_PER_DAY = 86400
+
+# Orders the stats command can sort cards by, worst first
+STATS_ORDERS = {
+    "accuracy": "CAST(correct AS REAL) / asked, asked DESC",
+    "asked": "asked DESC",
+    "latency": "latency_total / asked DESC",
+    "recent": "last_answered DESC",
+}
+
+
+class HistoryStore:
+    """
+    Append-only history of answered questions.
+
+    Every answer is a row of the answers table and is never changed. A trigger
+    adds each new answer to two sets of running totals: card_stats, one row
+    per card, and card_days, one row per card and (UTC) day. All-time
+    statistics are read from one row per card and windowed ones from at most
+    one row per card and day, never from the whole history. Cards are
+    identified by wordlist name, word and meaning.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (and create if needed) the history database.
+
+        Args:
+            db_path: Database file (defaults to history.db in get_data_dir())
+
+        Raises:
+            sqlite3.Error: If the database can't be opened
+        """
+        self.db_path = Path(db_path) if db_path else get_data_dir() / "history.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.db_path))
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY,
+                    mode TEXT NOT NULL,
+                    wordlist TEXT NOT NULL,
+                    direction TEXT,
+                    started REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS answers (
+                    id INTEGER PRIMARY KEY,
+                    session INTEGER NOT NULL REFERENCES sessions (id),
+                    answered REAL NOT NULL,
+                    wordlist TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    meaning TEXT NOT NULL,
+                    direction TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    latency REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS card_stats (
+                    wordlist TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    meaning TEXT NOT NULL,
+                    asked INTEGER NOT NULL,
+                    correct INTEGER NOT NULL,
+                    close INTEGER NOT NULL,
+                    latency_total REAL NOT NULL,
+                    last_answered REAL NOT NULL,
+                    PRIMARY KEY (wordlist, word, meaning)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS card_days (
+                    day INTEGER NOT NULL,
+                    wordlist TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    meaning TEXT NOT NULL,
+                    asked INTEGER NOT NULL,
+                    correct INTEGER NOT NULL,
+                    close INTEGER NOT NULL,
+                    latency_total REAL NOT NULL,
+                    last_answered REAL NOT NULL,
+                    PRIMARY KEY (day, wordlist, word, meaning)
+                ) WITHOUT ROWID;
+                CREATE TRIGGER IF NOT EXISTS answers_card_stats AFTER INSERT ON answers
+                BEGIN
+                    INSERT OR IGNORE INTO card_stats
+                        VALUES (new.wordlist, new.word, new.meaning, 0, 0, 0, 0.0, new.answered);
+                    UPDATE card_stats SET
+                        asked = asked + 1,
+                        correct = correct + (new.result != 'incorrect'),
+                        close = close + (new.result = 'close'),
+                        latency_total = latency_total + new.latency,
+                        last_answered = MAX(last_answered, new.answered)
+                    WHERE wordlist = new.wordlist AND word = new.word AND meaning = new.meaning;
+                    INSERT OR IGNORE INTO card_days
+                        VALUES (CAST(new.answered / 86400 AS INTEGER), new.wordlist, new.word,
+                                new.meaning, 0, 0, 0, 0.0, new.answered);
+                    UPDATE card_days SET
+                        asked = asked + 1,
+                        correct = correct + (new.result != 'incorrect'),
+                        close = close + (new.result = 'close'),
+                        latency_total = latency_total + new.latency,
+                        last_answered = MAX(last_answered, new.answered)
+                    WHERE day = CAST(new.answered / 86400 AS INTEGER) AND wordlist = new.wordlist
+                        AND word = new.word AND meaning = new.meaning;
+                END;
+            """)
+
+    def start_session(self, mode: str, wordlist: str, direction: Optional[str] = None) -> int:
+        """
+        Record the start of a practice session.
+
+        Args:
+            mode: Mode name, e.g. "test"
+            wordlist: Wordlist name
+            direction: Direction chosen for the session, if any
+
+        Returns:
+            Session id to record its answers under
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO sessions (mode, wordlist, direction, started) VALUES (?, ?, ?, ?)",
+                (mode, wordlist, direction, time.time()))
+        return cursor.lastrowid
+
+    def record(self, session: int, wordlist: str, answers: Iterable[Answer]):
+        """
+        Append answers of a session in one transaction.
+
+        Args:
+            session: Id from start_session()
+            wordlist: Wordlist name
+            answers: (word, meaning, direction, result, latency, answered) tuples,
+                direction being the field that was asked ("word" or "meaning")
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO answers (session, answered, wordlist, word, meaning, direction, result, latency)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((session, answered, wordlist, word, meaning, direction, result, latency)
+                 for word, meaning, direction, result, latency, answered in answers))
+
+    def card_stats(self, wordlist: Optional[str] = None, since: Optional[float] = None,
+                   order: str = "accuracy", limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get the accuracy of every card answered.
+
+        Args:
+            wordlist: Only cards of this wordlist (all if None)
+            since: Only answers given on or after the (UTC) day of this Unix
+                time (all-time if None)
+            order: One of STATS_ORDERS
+            limit: Number of cards to return (all if None)
+
+        Returns:
+            Dictionaries with wordlist, word, meaning, asked, correct, close,
+            accuracy (0-1), mean_latency (seconds) and last_answered
+        """
+        where, parameters = self._filter(wordlist, since)
+        if since is None:
+            source = "card_stats" + where
+        else:
+            source = ("(SELECT wordlist, word, meaning, SUM(asked) AS asked, SUM(correct) AS correct,"
+                      " SUM(close) AS close, SUM(latency_total) AS latency_total,"
+                      f" MAX(last_answered) AS last_answered FROM card_days{where}"
+                      " GROUP BY wordlist, word, meaning)")
+        query = ("SELECT wordlist, word, meaning, asked, correct, close, latency_total, last_answered"
+                 f" FROM {source} ORDER BY {STATS_ORDERS[order]}")
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [{"wordlist": name, "word": word, "meaning": meaning, "asked": asked,
+                 "correct": correct, "close": close, "accuracy": correct / asked,
+                 "mean_latency": latency_total / asked, "last_answered": last_answered}
+                for name, word, meaning, asked, correct, close, latency_total, last_answered
+                in self._connection.execute(query, parameters)]
+
+    def totals(self, wordlist: Optional[str] = None, since: Optional[float] = None) -> Dict:
+        """
+        Count sessions and answers.
+
+        Args:
+            wordlist: Only this wordlist (all if None)
+            since: Only sessions and answers on or after the (UTC) day of this Unix time
+
+        Returns:
+            Dictionary with sessions, answers, correct, close and cards
+        """
+        where, parameters = self._filter(wordlist, since)
+        if since is None:
+            query = "SELECT SUM(asked), SUM(correct), SUM(close), COUNT(*) FROM card_stats" + where
+        else:
+            query = ("SELECT SUM(asked), SUM(correct), SUM(close), COUNT(*) FROM"
+                     f" (SELECT SUM(asked) AS asked, SUM(correct) AS correct, SUM(close) AS close"
+                     f" FROM card_days{where} GROUP BY wordlist, word, meaning)")
+        answers, correct, close, cards = self._connection.execute(query, parameters).fetchone()
+        where, parameters = self._filter(wordlist, since, "started")
+        sessions = self._connection.execute("SELECT COUNT(*) FROM sessions" + where, parameters).fetchone()[0]
+        return {"sessions": sessions, "answers": answers or 0, "correct": correct or 0,
+                "close": close or 0, "cards": cards}
+
+    @staticmethod
+    def _filter(wordlist: Optional[str], since: Optional[float],
+                time_column: Optional[str] = None) -> Tuple[str, list]:
+        """
+        Build the WHERE clause and parameters for a wordlist and time window.
+
+        The window starts at the beginning of the day of since; it is compared
+        with time_column, or with the day column if time_column is None.
+        """
+        conditions = []
+        parameters = []
+        if since is not None:
+            day = int(since // SECONDS_PER_DAY)
+            if time_column is None:
+                conditions.append("day >= ?")
+                parameters.append(day)
+            else:
+                conditions.append(f"{time_column} >= ?")
+                parameters.append(day * SECONDS_PER_DAY)
+        if wordlist is not None:
+            conditions.append("wordlist = ?")
+            parameters.append(wordlist)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+
+class SessionRecorder:
+    """
+    Collects the answers of one session and appends them to a HistoryStore.
+
+    Answers are written in batches, so a long session costs one transaction
+    per FLUSH_EVERY answers instead of one per answer. Used as a context
+    manager, the recorder writes what is left when the session ends, also
+    when it ends with an error. Saving is best effort: a database error stops
+    the recording and is kept in self.error for the mode to report, and never
+    interrupts practice.
+    """
+
+    # Answers buffered before they are written
+    FLUSH_EVERY = 25
+
+    def __init__(self, store: Optional[HistoryStore], mode: str, wordlist: str,
+                 direction: Optional[str] = None, error: Optional[str] = None):
+        """
+        Start recording a session.
+
+        Args:
+            store: Store to write to (nothing is recorded if None)
+            mode: Mode name, e.g. "learn"
+            wordlist: Wordlist name
+            direction: Direction chosen for the session, if any
+            error: Why the store couldn't be opened, if it is None
+        """
+        self.store = store
+        self.wordlist = wordlist
+        self.error = error
+        self.session = None
+        self._pending = []
+        if store is not None:
+            try:
+                self.session = store.start_session(mode, wordlist, direction)
+            except sqlite3.Error as e:
+                self._fail(e)
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def record(self, word: str, meaning: str, direction: str, result: str, latency: float):
+        """
+        Record one answered question.
+
+        Args:
+            word: Word of the card
+            meaning: Meaning of the card
+            direction: Field that was asked ("word" or "meaning")
+            result: CORRECT, CLOSE or INCORRECT
+            latency: Seconds the user took to answer
+        """
+        if self.store is None:
+            return
+        self._pending.append((word, meaning, direction, result, latency, time.time()))
+        if len(self._pending) >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered answers."""
+        if self.store is None or not self._pending:
+            return
+        try:
+            self.store.record(self.session, self.wordlist, self._pending)
+        except sqlite3.Error as e:
+            self._fail(e)
+        self._pending = []
+
+    def _fail(self, error: sqlite3.Error):
+        """Stop recording after a database error."""
+        self.store = None
+        self.error = str(error)
+
+
+_default_store = None
+_default_error = None
+
+
+def open_session(mode: str, wordlist: str, direction: Optional[str] = None,
+                 store: Optional[HistoryStore] = None) -> SessionRecorder:
+    """
+    Start recording a session, in the default history database unless a store is given.
+
+    The default database is opened on the first session and shared by all
+    modes; if it can't be opened, sessions are not recorded and the recorder
+    carries the error.
+
+    Args:
+        mode: Mode name, e.g. "test"
+        wordlist: Wordlist name
+        direction: Direction chosen for the session, if any
+        store: Store to record to (the default one if None)
+
+    Returns:
+        SessionRecorder for the session's answers
+    """
+    global _default_store, _default_error
+    if store is None:
+        path = get_data_dir() / "history.db"
+        if _default_store is None or _default_store.db_path != path:
+            try:
+                _default_store = HistoryStore(path)
+                _default_error = None
+            except (sqlite3.Error, OSError) as e:
+                _default_store = None
+                _default_error = str(e)
+        store = _default_store
+        return SessionRecorder(store, mode, wordlist, direction, _default_error)
+    return SessionRecorder(store, mode, wordlist, direction)
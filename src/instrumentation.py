@@ -0,0 +1,259 @@
+"""
+Instrumentation Module
+Optional per-question timing for the practice modes: how long the user took
+to answer and how long the app spent choosing, checking and showing questions.
+
+Tracing is off unless FLASHCARDS_TRACE names a file (or "-" for stderr) or
+configure() is called. The file receives one JSON object per line:
+
+    {"event": "session_start", "session": 1, "mode": "test", "wordlist": ..., "cards": 84, ...}
+    {"event": "question", "session": 1, "number": 1, "card": 17, "direction": "meaning",
+     "result": "correct", "prompted_at": ..., "answered_at": ..., "prompts": 1,
+     "response_seconds": 2.31, "phases": {"select": ..., "render": ..., "check": ...},
+     "overhead_seconds": 0.00012, ...}
+    {"event": "session_end", "session": 1, "questions": 20, "summary": {...}, ...}
+
+Timestamps (ts, prompted_at, answered_at) are Unix times; durations come from
+time.perf_counter().
+"""
+import atexit
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional, TextIO
+from colors import Colors
+from console import Console, percentiles
+
+
+class Instrumentation:
+    """
+    Collects the timing of the questions of one mode session at a time.
+
+    A mode marks the end of each piece of work with lap(phase), which charges
+    the time since the previous mark to that phase; reading an answer through
+    ask() is timed as the user's response time instead. Time not marked
+    before a prompt or before question() is counted as rendering. question()
+    closes a question and writes its event. When tracing is off every method
+    returns at once.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize instrumentation.
+
+        Args:
+            stream: Where to write the JSONL events (tracing is off if None)
+        """
+        self.stream = stream
+        self.enabled = stream is not None
+        self._session = 0
+        self._session_fields = {}
+        self._mark = time.perf_counter()
+        self._reset_question()
+        self._reset_session()
+
+    def start_session(self, mode: str, wordlist: Dict, **fields):
+        """
+        Start timing a session of a mode.
+
+        Args:
+            mode: Mode name, e.g. "test"
+            wordlist: Wordlist being practiced
+            **fields: Extra fields for the session_start event
+        """
+        if not self.enabled:
+            return
+        self._session += 1
+        self._session_fields = {"session": self._session, "mode": mode}
+        self._reset_session()
+        self._reset_question()
+        self._emit("session_start", wordlist=wordlist.get("name"), pid=os.getpid(), **fields)
+        self._mark = time.perf_counter()
+
+    def lap(self, phase: str):
+        """
+        Charge the time since the previous mark to a phase of the current question.
+
+        Args:
+            phase: Phase name, e.g. "select", "render" or "check"
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._phases[phase] = self._phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def idle(self):
+        """Discard the time since the previous mark, e.g. time spent at a menu prompt."""
+        if self.enabled:
+            self._mark = time.perf_counter()
+
+    def ask(self, console: Console, prompt: str = "") -> str:
+        """
+        Read an answer through a console, timing it as the user's response.
+
+        Args:
+            console: Console to read from
+            prompt: Prompt to show
+
+        Returns:
+            The answer
+        """
+        if not self.enabled:
+            return console.input(prompt)
+        self.lap("render")
+        if self._prompted_at is None:
+            self._prompted_at = time.time()
+        answer = console.input(prompt)
+        now = time.perf_counter()
+        self._response += now - self._mark
+        self._prompts += 1
+        self._answered_at = time.time()
+        self._mark = now
+        return answer
+
+    def question(self, **fields):
+        """
+        Close the current question and write its event.
+
+        Args:
+            **fields: Fields describing the question, e.g. card, direction, result
+        """
+        if not self.enabled:
+            return
+        self.lap("render")
+        overhead = sum(self._phases.values())
+        self._questions += 1
+        self._response_times.append(self._response)
+        self._overheads.append(overhead)
+        for phase, seconds in self._phases.items():
+            self._phase_times.setdefault(phase, []).append(seconds)
+        self._emit("question", number=self._questions, prompted_at=self._prompted_at,
+                   answered_at=self._answered_at, prompts=self._prompts,
+                   response_seconds=self._response, phases=self._phases,
+                   overhead_seconds=overhead, **fields)
+        self._reset_question()
+
+    def end_session(self, console: Optional[Console] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Finish the session, write its summary and show it on a console.
+
+        Args:
+            console: Console to show the summary on (not shown if None)
+
+        Returns:
+            Summary (see summary()), empty if tracing is off
+        """
+        if not self.enabled:
+            return {}
+        summary = self.summary()
+        self._emit("session_end", questions=self._questions, summary=summary)
+        self.stream.flush()
+        if console is not None and self._questions:
+            self._show_summary(console, summary)
+        self._session_fields = {}
+        return summary
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the questions of the current session.
+
+        Returns:
+            For "response", "overhead" and every phase: mean, p50, p90, p99
+            and max in seconds
+        """
+        series = {"response": self._response_times, "overhead": self._overheads}
+        series.update(self._phase_times)
+        return {name: dict(mean=sum(values) / len(values), max=max(values), **percentiles(values))
+                for name, values in series.items() if values}
+
+    def close(self):
+        """Flush and close the event stream (stderr is only flushed)."""
+        if self.stream is None:
+            return
+        self.stream.flush()
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
+        self.stream = None
+        self.enabled = False
+
+    def _show_summary(self, console: Console, summary: Dict[str, Dict[str, float]]):
+        """Print the session summary as a table of milliseconds."""
+        console.print(f"\n{Colors.rule()}")
+        console.print(Colors.bold_cyan(f"  SESSION TIMING ({self._questions} questions)"))
+        console.print(Colors.rule())
+        console.print(Colors.bold(f"  {'':<10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"))
+        for name, stats in summary.items():
+            cells = "".join(f"{stats[key] * 1000:>10.2f}" for key in ("p50", "p90", "p99", "max"))
+            console.print(f"  {Colors.cyan(f'{name:<10}')}{cells}")
+        console.print(Colors.yellow("  (milliseconds; response is the time you took to answer)"))
+        console.print(Colors.rule())
+
+    def _emit(self, event: str, **fields):
+        """Write one event line."""
+        record = {"ts": time.time(), "event": event}
+        record.update(self._session_fields)
+        record.update(fields)
+        self.stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def _reset_question(self):
+        """Forget the timing of the question in progress."""
+        self._phases = {}
+        self._response = 0.0
+        self._prompts = 0
+        self._prompted_at = None
+        self._answered_at = None
+
+    def _reset_session(self):
+        """Forget the timing of the questions of the session."""
+        self._questions = 0
+        self._response_times = []
+        self._overheads = []
+        self._phase_times = {}
+
+
+_instrumentation = None
+
+
+def get_instrumentation() -> Instrumentation:
+    """
+    Get the shared instrumentation, set up from FLASHCARDS_TRACE on first use.
+
+    Returns:
+        The Instrumentation every mode reports to
+    """
+    global _instrumentation
+    if _instrumentation is None:
+        configure(os.environ.get("FLASHCARDS_TRACE") or None)
+    return _instrumentation
+
+
+def configure(path: Optional[str]) -> Instrumentation:
+    """
+    Turn tracing on or off for the modes created from now on.
+
+    Args:
+        path: JSONL file to append events to, "-" for stderr, or None to turn tracing off
+
+    Returns:
+        The new shared Instrumentation
+    """
+    global _instrumentation
+    if _instrumentation is not None:
+        _instrumentation.close()
+    if path is None:
+        stream = None
+    elif path == "-":
+        stream = sys.stderr
+    else:
+        stream = open(path, "a", encoding="utf-8")
+    _instrumentation = Instrumentation(stream)
+    return _instrumentation
+
+
+@atexit.register
+def _close():
+    """Flush the events of a session that was interrupted."""
+    if _instrumentation is not None:
+        _instrumentation.close()
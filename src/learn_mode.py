@@ -3,36 +3,68 @@ Learn Mode Module
 Handles the learning mode functionality.
 """
 import random
-from typing import Dict
+import sqlite3
+import time
+from typing import Dict, Optional
 from colors import Colors
+from console import Console, TerminalConsole
+from history_store import HistoryStore, open_session
+from instrumentation import get_instrumentation
+from answer_matcher import AnswerMatcher, CLOSE, CORRECT, INCORRECT, suggestion_text
+from progress_store import ProgressStore, match_saved_cards
+from scheduler import ReviewScheduler
+from wordlist_stream import PairStream
 
 
 class LearnMode:
     """Manages the learn mode for flashcard practice."""
     
-    def __init__(self, wordlist: Dict):
+    # SM-2 quality (0-5) given to each answer result when reviewing
+    ANSWER_QUALITY = {CORRECT: 4, CLOSE: 3, INCORRECT: 1}
+    # Quality of a wrong answer the user marked as correct anyway
+    MARKED_CORRECT_QUALITY = 3
+    # Cards never seen before that one review session may introduce
+    NEW_CARDS_PER_REVIEW = 20
+    
+    def __init__(self, wordlist: Dict, console: Optional[Console] = None,
+                 history: Optional[HistoryStore] = None, progress: Optional[ProgressStore] = None,
+                 save_progress: bool = True):
         """
         Initialize learn mode with a wordlist.
         
         Args:
             wordlist: Dictionary containing word pairs
+            console: Console for prompts and output (the terminal if None)
+            history: Store answers are recorded to (the default one if None)
+            progress: Store the review schedule is saved to (opens the default
+                one on the first review if None)
+            save_progress: Save the review schedule at all (False for throwaway sessions)
         """
+        self.console = console or TerminalConsole()
+        self.trace = get_instrumentation()
+        self.history = history
         self.wordlist = wordlist
         self.pairs = wordlist["pairs"]
+        self.streaming = isinstance(self.pairs, PairStream)
+        # Streamed pairs aren't indexed, so their answers are normalized as they come
+        self.matcher = AnswerMatcher() if self.streaming else AnswerMatcher.for_pairs(self.pairs)
+        # Created on the first review so plain practice doesn't pay for it
+        self.scheduler = None
+        self.progress = progress
+        self.progress_error = None if save_progress else "saving is turned off"
     
     def start(self):
         """Start the learn mode with direction selection."""
         while True:
-            print("\n" + Colors.cyan("="*50))
-            print(Colors.bold_cyan("           LEARN MODE OPTIONS"))
-            print(Colors.cyan("="*50))
-            print(f"  {Colors.yellow('1.')} Word → Meaning")
-            print(f"  {Colors.yellow('2.')} Meaning → Word")
-            print(f"  {Colors.yellow('3.')} Random")
-            print(f"  {Colors.yellow('4.')} Back to main menu")
-            print(Colors.cyan("="*50))
+            self.console.print(Colors.banner("           LEARN MODE OPTIONS"))
+            self.console.print(f"  {Colors.yellow('1.')} Word → Meaning")
+            self.console.print(f"  {Colors.yellow('2.')} Meaning → Word")
+            self.console.print(f"  {Colors.yellow('3.')} Random")
+            self.console.print(f"  {Colors.yellow('4.')} Review due cards")
+            self.console.print(f"  {Colors.yellow('5.')} Back to main menu")
+            self.console.print(Colors.rule())
             
-            choice = input(Colors.magenta("\nYour choice: ")).strip().lower()
+            choice = self.console.input(Colors.magenta("\nYour choice: ")).strip().lower()
             
             if choice == "1":
                 self._practice_loop("word_to_meaning")
@@ -40,79 +72,225 @@ class LearnMode:
                 self._practice_loop("meaning_to_word")
             elif choice == "3":
                 self._practice_loop("random")
-            elif choice == "4" or choice == "back":
+            elif choice == "4":
+                self._review_due_cards()
+            elif choice == "5" or choice == "back":
                 break
             else:
-                print(Colors.red("Invalid choice. Please enter 1, 2, 3, or 4."))
+                self.console.print(Colors.red("Invalid choice. Please enter 1, 2, 3, 4, or 5."))
+    
+    def _review_due_cards(self):
+        """Practice the cards the spaced-repetition scheduler says are due."""
+        if self.streaming:
+            self.console.print(Colors.red("Reviews need the whole wordlist in memory; use practice instead."))
+            return
+        if self.scheduler is None:
+            self.scheduler = ReviewScheduler(len(self.pairs))
+            self._load_reviews()
+        if self.progress is None:
+            self.console.print(Colors.red(f"\nReviews can't be saved this session: {self.progress_error}"))
+        self.console.print(Colors.yellow(f"\n{self.scheduler.due_count()} cards due, "
+                                         f"{self.scheduler.new_count()} never reviewed"))
+        self._practice_loop("random", review=True)
+    
+    def _load_reviews(self):
+        """Open the progress store if needed and restore the saved review schedule."""
+        if self.progress is None and self.progress_error is None:
+            try:
+                self.progress = ProgressStore()
+            except (sqlite3.Error, OSError) as e:
+                self.progress_error = str(e)
+                return
+        if self.progress is None:
+            return
+        name = self.wordlist["name"]
+        try:
+            saved = self.progress.load_reviews(name)
+        except sqlite3.Error as e:
+            self.console.print(Colors.red(f"\nCould not read saved reviews: {e}"))
+            return
+        matched, moved = match_saved_cards(saved, self.pairs.words, self.pairs.meanings)
+        for index, row in matched:
+            self.scheduler.restore(index, *row[3:])
+        if moved:
+            # Save the rows under the cards' new positions
+            self._save_reviews([index for index, _ in matched], replace_all=True)
+    
+    def _save_reviews(self, indices, replace_all: bool = False):
+        """
+        Save the review state of some cards.
+        
+        Args:
+            indices: Indices of the cards that were reviewed
+            replace_all: Drop every other saved review of the wordlist
+        """
+        if self.progress is None:
+            return
+        words = self.pairs.words
+        meanings = self.pairs.meanings
+        try:
+            self.progress.save_reviews(self.wordlist["name"],
+                                       [(i, words[i], meanings[i]) + self.scheduler.card_state(i)
+                                        for i in indices], replace_all)
+        except sqlite3.Error as e:
+            self.console.print(Colors.red(f"Could not save the review: {e}"))
+            self.progress = None
+            self.progress_error = str(e)
     
-    def _practice_loop(self, direction: str):
+    def _practice_loop(self, direction: str, review: bool = False):
         """
         Main practice loop for learning.
         
         Args:
             direction: Learning direction (word_to_meaning, meaning_to_word, or random)
+            review: Ask the cards due in self.scheduler instead of random ones
         """
-        print(f"\n{Colors.cyan('='*50)}")
-        print(Colors.bold_cyan("  Starting practice session!"))
-        print(Colors.yellow("  Type 'end session' at any time to return to learn menu"))
-        print(f"{Colors.cyan('='*50)}\n")
+        self.console.print(f"\n{Colors.rule()}")
+        self.console.print(Colors.bold_cyan("  Starting practice session!"))
+        self.console.print(Colors.yellow("  Type 'end session' at any time to return to learn menu"))
+        self.console.print(f"{Colors.rule()}\n")
         
-        while True:
-            # Select random pair
-            pair = random.choice(self.pairs)
-            
-            # Determine direction for this question
-            if direction == "random":
-                current_direction = random.choice(["word_to_meaning", "meaning_to_word"])
-            else:
-                current_direction = direction
-            
-            # Ask question based on direction
-            if current_direction == "word_to_meaning":
-                question = pair["word"]
-                correct_answer = pair["meaning"]
-                prompt_type = "Word"
-            else:
-                question = pair["meaning"]
-                correct_answer = pair["word"]
-                prompt_type = "Meaning"
-            
-            print(f"{Colors.bold(prompt_type)}: {Colors.blue(question)}")
-            user_answer = input(Colors.magenta("Your answer: ")).strip()
-            
-            if user_answer.lower() == "end session":
-                print(Colors.yellow("\nReturning to learn mode menu..."))
-                break
-            
-            # Check answer (case-insensitive)
-            if user_answer.lower() == correct_answer.lower():
-                print(Colors.bold_green("✓ Correct!") + "\n")
-            else:
-                print(Colors.bold_red("✗ Incorrect.") + f" The correct answer is: {Colors.green(correct_answer)}")
+        # Streamed wordlists are drawn from a bounded shuffle buffer instead
+        if self.streaming:
+            stream_pairs = self.pairs.random_pairs()
+        new_cards = 0
+        self.trace.start_session("learn", self.wordlist, direction=direction, review=review)
+        with open_session("learn", self.wordlist["name"], "review" if review else direction,
+                          self.history) as recorder:
+            while True:
+                # Select the next due card, or a random pair
+                if review:
+                    pair_index = self.scheduler.next_card(allow_new=new_cards < self.NEW_CARDS_PER_REVIEW)
+                    if pair_index is None:
+                        self._print_next_review()
+                        break
+                    if self.scheduler.is_new(pair_index):
+                        new_cards += 1
+                    pair = self.pairs[pair_index]
+                elif self.streaming:
+                    pair_index = None
+                    pair = next(stream_pairs)
+                else:
+                    pair_index = random.randrange(len(self.pairs))
+                    pair = self.pairs[pair_index]
+                
+                # Determine direction for this question
+                if direction == "random":
+                    current_direction = random.choice(["word_to_meaning", "meaning_to_word"])
+                else:
+                    current_direction = direction
+                
+                # Ask question based on direction
+                if current_direction == "word_to_meaning":
+                    question = pair["word"]
+                    correct_answer = pair["meaning"]
+                    answer_field = "meaning"
+                    prompt_type = "Word"
+                else:
+                    question = pair["meaning"]
+                    correct_answer = pair["word"]
+                    answer_field = "word"
+                    prompt_type = "Meaning"
+                self.trace.lap("select")
                 
-                # Ask if they want to mark it as correct anyway
-                mark_correct = input(Colors.magenta("Mark as correct anyway? [y/n]: ")).strip().lower()
+                self.console.print(f"{Colors.bold(prompt_type)}: {Colors.blue(question)}")
+                asked_at = time.perf_counter()
+                user_answer = self.trace.ask(self.console, Colors.magenta("Your answer: ")).strip()
+                latency = time.perf_counter() - asked_at
                 
-                if mark_correct != 'y':
-                    # Make them practice typing both word and meaning
-                    print(Colors.yellow("\nPlease practice typing both:"))
+                if user_answer.lower() == "end session":
+                    self.console.print(Colors.yellow("\nReturning to learn mode menu..."))
+                    break
+                
+                # Check answer (normalized, case-insensitive, small typos forgiven)
+                result = self._check(user_answer, pair_index, pair, answer_field)
+                recorder.record(pair["word"], pair["meaning"], answer_field, result, latency)
+                if review and result != INCORRECT:
+                    self.scheduler.record(pair_index, self.ANSWER_QUALITY[result])
+                    self._save_reviews((pair_index,))
+                self.trace.lap("check")
+                if result == CORRECT:
+                    self.console.print(Colors.bold_green("✓ Correct!") + "\n")
+                elif result == CLOSE:
+                    self.console.print(Colors.bold_green("≈ Almost!") + f" Watch the spelling: {Colors.green(correct_answer)}\n")
+                else:
+                    self.console.print(Colors.bold_red("✗ Incorrect.") + f" The correct answer is: {Colors.green(correct_answer)}")
+                    if pair_index is not None:
+                        self.trace.lap("render")
+                        other_index = self.matcher.suggest(user_answer, answer_field, pair_index)
+                        self.trace.lap("check")
+                        if other_index is not None:
+                            self.console.print(Colors.yellow(suggestion_text(self.pairs[other_index], answer_field)))
                     
-                    # Type the word
-                    while True:
-                        typed_word = input(Colors.magenta(f"Type the word: ")).strip()
-                        if typed_word.lower() == pair["word"].lower():
-                            print(Colors.green("✓ Correct!"))
-                            break
-                        else:
-                            print(Colors.red(f"✗ Try again. The word is: {Colors.green(pair['word'])}"))
+                    # Ask if they want to mark it as correct anyway
+                    mark_correct = self.trace.ask(self.console, Colors.magenta("Mark as correct anyway? [y/n]: ")).strip().lower()
+                    if review:
+                        quality = self.MARKED_CORRECT_QUALITY if mark_correct == 'y' else self.ANSWER_QUALITY[result]
+                        self.scheduler.record(pair_index, quality)
+                        self._save_reviews((pair_index,))
+                        self.trace.lap("check")
                     
-                    # Type the meaning
-                    while True:
-                        typed_meaning = input(Colors.magenta(f"Type the meaning: ")).strip()
-                        if typed_meaning.lower() == pair["meaning"].lower():
-                            print(Colors.green("✓ Correct!"))
-                            break
-                        else:
-                            print(Colors.red(f"✗ Try again. The meaning is: {Colors.green(pair['meaning'])}"))
-                
-                print()  # Empty line for readability
+                    if mark_correct != 'y':
+                        # Make them practice typing both word and meaning
+                        self.console.print(Colors.yellow("\nPlease practice typing both:"))
+                        
+                        # Type the word
+                        while True:
+                            typed_word = self.trace.ask(self.console, Colors.magenta(f"Type the word: ")).strip()
+                            typed_correct = self._check(typed_word, pair_index, pair, "word") == CORRECT
+                            self.trace.lap("check")
+                            if typed_correct:
+                                self.console.print(Colors.green("✓ Correct!"))
+                                break
+                            else:
+                                self.console.print(Colors.red(f"✗ Try again. The word is: {Colors.green(pair['word'])}"))
+                        
+                        # Type the meaning
+                        while True:
+                            typed_meaning = self.trace.ask(self.console, Colors.magenta(f"Type the meaning: ")).strip()
+                            typed_correct = self._check(typed_meaning, pair_index, pair, "meaning") == CORRECT
+                            self.trace.lap("check")
+                            if typed_correct:
+                                self.console.print(Colors.green("✓ Correct!"))
+                                break
+                            else:
+                                self.console.print(Colors.red(f"✗ Try again. The meaning is: {Colors.green(pair['meaning'])}"))
+                    
+                    self.console.print()  # Empty line for readability
+                self.trace.question(card=pair_index, direction=answer_field, result=result)
+            
+        self.trace.end_session(self.console)
+        if recorder.error:
+            self.console.print(Colors.red(f"Answers couldn't be added to your history: {recorder.error}"))
+    
+    def _print_next_review(self):
+        """Tell the user when the next card becomes due."""
+        self.console.print(Colors.bold_green("\n🎉 No cards are due right now!"))
+        due = self.scheduler.next_due_time()
+        if due is not None:
+            wait = max(0, due - time.time())
+            if wait < 3600:
+                when = f"{int(wait // 60) + 1} minutes"
+            elif wait < 86400:
+                when = f"{wait / 3600:.1f} hours"
+            else:
+                when = f"{wait / 86400:.1f} days"
+            self.console.print(Colors.yellow(f"Next review in about {when}."))
+        self.console.print(Colors.yellow("Returning to learn mode menu..."))
+    
+    def _check(self, answer: str, pair_index, pair, field: str) -> str:
+        """
+        Check an answer for one field of a pair.
+        
+        Args:
+            answer: Typed answer
+            pair_index: Index of the pair in self.pairs, or None for a streamed pair
+            pair: The pair being asked
+            field: "word" or "meaning"
+            
+        Returns:
+            CORRECT, CLOSE or INCORRECT (see answer_matcher)
+        """
+        if pair_index is None:
+            return self.matcher.check_text(answer, pair[field])
+        return self.matcher.check(answer, pair_index, field)
@@ -3,54 +3,114 @@ Flashcard Learning Application
 Main entry point for the command-line flashcard memorization tool.
 """
 import sys
+from typing import List, Optional
 from wordlist_manager import WordlistManager
-from view_mode import ViewMode
-from learn_mode import LearnMode
-from test_mode import TestMode
-from memorize_mode import MemorizeMode
+from wordlist_format import WordlistFormatError
+from pair_store import PairStore
 from colors import Colors
+from console import Console, TerminalConsole
 
 
 def clear_screen():
     """Clear the console screen (cross-platform)."""
     import os
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt':
+        os.system('cls')
+    elif sys.stdout.isatty():
+        # Home, clear the screen and the scrollback, without starting a process
+        sys.stdout.write("\033[H\033[2J\033[3J")
+        sys.stdout.flush()
 
 
-def display_header():
+def display_header(console: Console):
     """Display application header."""
-    print("\n" + Colors.cyan("="*50))
-    print(Colors.bold_cyan("     FLASHCARD LEARNING APPLICATION"))
-    print(Colors.cyan("="*50))
+    console.print(Colors.banner("     FLASHCARD LEARNING APPLICATION"))
 
 
-def select_wordlist(manager: WordlistManager):
+def print_loaded(name: str, wordlist, console: Console):
+    """
+    Confirm that a wordlist was loaded.
+    
+    Args:
+        name: Name of the wordlist
+        wordlist: Loaded wordlist dictionary
+        console: Console to write to
+    """
+    if wordlist.get("streaming"):
+        console.print(Colors.bold_green(f"\n✓ Opened '{name}' for streaming (large wordlist)."))
+    elif "sources" in wordlist:
+        console.print(Colors.bold_green(f"\n✓ Loaded folder '{name}' with {len(wordlist['pairs'])} word pairs"
+                                f" from {len(wordlist['sources'])} lists."))
+    else:
+        console.print(Colors.bold_green(f"\n✓ Loaded '{name}' with {len(wordlist['pairs'])} word pairs."))
+
+
+def materialize(wordlist, console: Console):
+    """
+    Read a streamed wordlist fully into memory.
+    View and Memorize modes need random access to every pair.
+    
+    Args:
+        wordlist: Loaded wordlist dictionary
+        console: Console to write to
+        
+    Returns:
+        Wordlist dictionary whose pairs are a PairStore
+    """
+    if not wordlist.get("streaming"):
+        return wordlist
+    console.print(Colors.yellow("Reading the whole wordlist into memory..."))
+    return {
+        "name": wordlist["name"],
+        "pairs": PairStore((pair.word, pair.meaning) for pair in wordlist["pairs"])
+    }
+
+
+def select_wordlist(manager: WordlistManager, console: Console):
     """
     Display available wordlists and let user select one.
     
     Args:
         manager: WordlistManager instance
+        console: Console for the menu and the user's choice
         
     Returns:
         Loaded wordlist dictionary or None
     """
-    wordlists = manager.get_available_wordlists()
+    catalog = manager.get_catalog()
+    wordlists = [entry["name"] for entry in catalog]
     
     if not wordlists:
-        print(Colors.red("\n❌ No wordlists found!"))
-        print(f"Please add JSON files to the 'wordlists' directory.")
-        print("\nExample format (spanish.json):")
-        print('{\n  "hello": "hola",\n  "goodbye": "adiós"\n}')
+        console.print(Colors.red("\n❌ No wordlists found!"))
+        console.print(f"Please add JSON files to the 'wordlists' directory.")
+        console.print("\nExample format (spanish.json):")
+        console.print('{\n  "pairs": [\n    {"word": "hello", "meaning": "hola"},\n    {"word": "goodbye", "meaning": "adiós"}\n  ]\n}')
         return None
     
-    print(Colors.bold("\nAvailable Word Lists:"))
-    print("-" * 50)
-    for i, name in enumerate(wordlists, 1):
-        print(f"  {Colors.yellow(str(i) + '.')} {Colors.cyan(name)}")
-    print("-" * 50)
+    # Folders are numbered after the wordlists and end with "/"
+    folders = manager.get_folders()
+    choices = wordlists + [folder["name"] for folder in folders]
+    
+    console.print(Colors.bold("\nAvailable Word Lists:"))
+    console.print("-" * 50)
+    for i, entry in enumerate(catalog, 1):
+        count = entry["pair_count"]
+        if entry["invalid"]:
+            size_text = " (invalid)"
+        else:
+            # Counts are known once a list has been opened
+            size_text = f" ({count} pairs)" if count is not None else ""
+        console.print(f"  {Colors.yellow(str(i) + '.')} {Colors.cyan(entry['name'])}{size_text}")
+    if folders:
+        console.print(Colors.bold("\nFolders (study every list inside as one deck):"))
+        for i, folder in enumerate(folders, len(wordlists) + 1):
+            pairs_text = f", {folder['pair_count']} pairs" if folder["pair_count"] is not None else ""
+            console.print(f"  {Colors.yellow(str(i) + '.')} {Colors.cyan(folder['name'])}"
+                  f" ({folder['lists']} lists{pairs_text})")
+    console.print("-" * 50)
     
     while True:
-        choice = input(Colors.magenta("\nEnter wordlist name or number (or 'quit' to exit): ")).strip()
+        choice = console.input(Colors.magenta("\nEnter wordlist or folder name or number (or 'quit' to exit): ")).strip()
         
         if choice.lower() == 'quit':
             return None
@@ -58,104 +118,174 @@ def select_wordlist(manager: WordlistManager):
         # Check if user entered a number
         if choice.isdigit():
             index = int(choice) - 1
-            if 0 <= index < len(wordlists):
-                selected_name = wordlists[index]
-                wordlist = manager.load_wordlist(selected_name)
+            if 0 <= index < len(choices):
+                selected_name = choices[index]
+                wordlist = open_choice(manager, selected_name)
                 if wordlist:
-                    print(Colors.bold_green(f"\n✓ Loaded '{selected_name}' with {len(wordlist['pairs'])} word pairs."))
+                    print_loaded(selected_name, wordlist, console)
                     return wordlist
             else:
-                print(Colors.red(f"❌ Invalid number. Please enter a number between 1 and {len(wordlists)}."))
+                console.print(Colors.red(f"❌ Invalid number. Please enter a number between 1 and {len(choices)}."))
         # Check if user entered a name (case-insensitive)
         else:
-            # Try to find a case-insensitive match
-            matched_wordlist = None
-            for wl in wordlists:
-                if wl.lower() == choice.lower():
-                    matched_wordlist = wl
-                    break
+            matched_wordlist = match_choice(choice, choices)
             
             if matched_wordlist:
-                wordlist = manager.load_wordlist(matched_wordlist)
+                wordlist = open_choice(manager, matched_wordlist)
                 if wordlist:
-                    print(Colors.bold_green(f"\n✓ Loaded '{matched_wordlist}' with {len(wordlist['pairs'])} word pairs."))
+                    print_loaded(matched_wordlist, wordlist, console)
                     return wordlist
             else:
-                print(Colors.red(f"❌ Wordlist '{choice}' not found. Please enter a valid name or number."))
+                console.print(Colors.red(f"❌ Wordlist '{choice}' not found. Please enter a valid name or number."))
 
 
-def select_mode(wordlist):
+def match_choice(text: str, choices: List[str]) -> Optional[str]:
+    """
+    Find the wordlist or folder a typed name refers to.
+    
+    Args:
+        text: Name as typed; case doesn't matter and folders match without the "/"
+        choices: Wordlist names followed by folder names (ending with "/")
+        
+    Returns:
+        The matching choice or None
+    """
+    wanted = text.lower()
+    for name in choices:
+        if name.lower() == wanted:
+            return name
+    wanted = wanted.rstrip("/") + "/"
+    for name in choices:
+        if name.endswith("/") and name.lower() == wanted:
+            return name
+    return None
+
+
+def open_choice(manager: WordlistManager, name: str):
+    """
+    Load the wordlist or folder picked in the wordlist menu.
+    
+    Args:
+        manager: WordlistManager instance
+        name: Wordlist name, or folder name ending with "/"
+        
+    Returns:
+        Loaded wordlist dictionary or None
+    """
+    if name.endswith("/"):
+        return manager.load_folder(name)
+    return manager.open_wordlist(name)
+
+
+def run_mode(choice: str, wordlist, console: Console):
+    """
+    Run the mode picked from the mode menu.
+    
+    Args:
+        choice: Menu choice ("1" to "4")
+        wordlist: Loaded wordlist dictionary
+        console: Console the mode uses for prompts and output
+        
+    Returns:
+        The wordlist to keep using (streamed wordlists are read fully for View and Memorize)
+    """
+    # Modes are imported on first use so startup only loads the menus
+    if choice == "1":
+        from view_mode import ViewMode
+        wordlist = materialize(wordlist, console)
+        view_mode = ViewMode(wordlist, console=console)
+        view_mode.start()
+    elif choice == "2":
+        from memorize_mode import MemorizeMode
+        wordlist = materialize(wordlist, console)
+        memorize_mode = MemorizeMode(wordlist, console=console)
+        memorize_mode.start()
+    elif choice == "3":
+        from learn_mode import LearnMode
+        learn_mode = LearnMode(wordlist, console=console)
+        learn_mode.start()
+    elif choice == "4":
+        from test_mode import TestMode
+        test_mode = TestMode(wordlist, console=console)
+        test_mode.start()
+    return wordlist
+
+
+def select_mode(wordlist, console: Optional[Console] = None):
     """
     Display mode selection menu and handle user choice.
     
     Args:
         wordlist: Loaded wordlist dictionary
+        console: Console for the menu and the modes (the terminal if None)
         
     Returns:
         True to continue, False to go back to wordlist selection
     """
+    console = console or TerminalConsole()
     while True:
-        print("\n" + Colors.cyan("="*50))
-        print(Colors.bold_cyan("            SELECT MODE"))
-        print(Colors.cyan("="*50))
-        print(f"  {Colors.yellow('1.')} View Mode - Display all words")
-        print(f"  {Colors.yellow('2.')} Memorize Mode - Master all words")
-        print(f"  {Colors.yellow('3.')} Learn Mode - Practice with feedback")
-        print(f"  {Colors.yellow('4.')} Test Mode - Scored assessment")
-        print(f"  {Colors.yellow('5.')} Back to wordlist selection")
-        print(f"  {Colors.yellow('6.')} Quit application")
-        print(Colors.cyan("="*50))
+        console.print(Colors.banner("            SELECT MODE"))
+        console.print(f"  {Colors.yellow('1.')} View Mode - Display all words")
+        console.print(f"  {Colors.yellow('2.')} Memorize Mode - Master all words")
+        console.print(f"  {Colors.yellow('3.')} Learn Mode - Practice with feedback")
+        console.print(f"  {Colors.yellow('4.')} Test Mode - Scored assessment")
+        console.print(f"  {Colors.yellow('5.')} Back to wordlist selection")
+        console.print(f"  {Colors.yellow('6.')} Quit application")
+        console.print(Colors.rule())
         
-        choice = input(Colors.magenta("\nYour choice: ")).strip().lower()
+        choice = console.input(Colors.magenta("\nYour choice: ")).strip().lower()
         
-        if choice == "1":
-            view_mode = ViewMode(wordlist)
-            view_mode.start()
-        elif choice == "2":
-            memorize_mode = MemorizeMode(wordlist)
-            memorize_mode.start()
-        elif choice == "3":
-            learn_mode = LearnMode(wordlist)
-            learn_mode.start()
-        elif choice == "4":
-            test_mode = TestMode(wordlist)
-            test_mode.start()
+        if choice in ("1", "2", "3", "4"):
+            try:
+                wordlist = run_mode(choice, wordlist, console)
+            except WordlistFormatError as e:
+                # Streamed wordlists are only validated as far as they have been read
+                console.print(Colors.red(f"❌ Error reading wordlist: {e}"))
+                return True
         elif choice == "5" or choice == "back":
             return True  # Continue to select new wordlist
         elif choice == "6" or choice == "quit":
             return False  # Exit application
         else:
-            print(Colors.red("Invalid choice. Please enter 1, 2, 3, 4, 5, or 6."))
+            console.print(Colors.red("Invalid choice. Please enter 1, 2, 3, 4, 5, or 6."))
 
 
-def main():
-    """Main application loop."""
+def main(console: Optional[Console] = None):
+    """
+    Main application loop.
+    
+    Args:
+        console: Console for every menu and mode (the terminal if None)
+    """
+    console = console or TerminalConsole()
     # WordlistManager will automatically find wordlists directory
-    manager = WordlistManager("wordlists")
+    manager = WordlistManager("wordlists", console=console)
     
-    print("\n" + Colors.cyan("="*50))
-    print(Colors.bold_cyan("  Welcome to Flashcard Learning Application!"))
-    print(Colors.cyan("="*50))
+    console.print(Colors.banner("  Welcome to Flashcard Learning Application!"))
     
     while True:
-        display_header()
+        display_header(console)
         
         # Select wordlist
-        wordlist = select_wordlist(manager)
+        wordlist = select_wordlist(manager, console)
         if wordlist is None:
-            print(Colors.yellow("\nThank you for using Flashcard Learning Application!"))
-            print(Colors.bold_green("Goodbye! 👋"))
+            console.print(Colors.yellow("\nThank you for using Flashcard Learning Application!"))
+            console.print(Colors.bold_green("Goodbye! 👋"))
             sys.exit(0)
         
         # Select and run mode
-        continue_app = select_mode(wordlist)
+        continue_app = select_mode(wordlist, console)
         if not continue_app:
-            print(Colors.yellow("\nThank you for using Flashcard Learning Application!"))
-            print(Colors.bold_green("Goodbye! 👋"))
+            console.print(Colors.yellow("\nThank you for using Flashcard Learning Application!"))
+            console.print(Colors.bold_green("Goodbye! 👋"))
             sys.exit(0)
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Subcommands (list, view, test, ...) skip the menus
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     try:
         main()
     except KeyboardInterrupt:
@@ -2,9 +2,17 @@
 Memorize Mode Module
 Handles the memorize mode functionality with three-stage learning.
 """
-import random
-from typing import Dict, List, Set, Tuple, Optional
+import sqlite3
+import time
+from array import array
+from typing import Dict, Iterable, List, Set, Tuple, Optional
 from colors import Colors
+from console import Console, TerminalConsole
+from history_store import HistoryStore, SessionRecorder, open_session
+from instrumentation import get_instrumentation
+from answer_matcher import AnswerMatcher, CLOSE, CORRECT, INCORRECT, suggestion_text
+from progress_store import ProgressStore, match_saved_cards
+from sampling import IndexedSet, WeightedSampler
 
 
 class MemorizeMode:
@@ -15,132 +23,256 @@ class MemorizeMode:
     STAGE_WORD_TO_MEANING = 2 # See word, type meaning
     STAGE_MEANING_TO_WORD = 3 # See meaning, type word
     
-    def __init__(self, wordlist: Dict):
+    # Stage of a word that completed all three stages
+    STAGE_MEMORIZED = 4
+    
+    # Defaults for the size of a run
+    NEW_WORDS_PER_RUN = 10
+    QUESTIONS_PER_RUN = 10
+    
+    # Question selection weights: every word in the pool has BASE_WEIGHT, plus
+    # ERROR_WEIGHT per recent mistake and up to LATENCY_WEIGHT for slow answers
+    BASE_WEIGHT = 10
+    ERROR_WEIGHT = 10
+    LATENCY_WEIGHT = 10
+    # Answers taking this long (seconds) or longer count as fully slow
+    SLOW_ANSWER_SECONDS = 20.0
+    
+    def __init__(self, wordlist: Dict, progress: Optional[ProgressStore] = None,
+                 new_words_per_run: Optional[int] = None, questions_per_run: Optional[int] = None,
+                 max_pool_size: Optional[int] = None, requeue_failed: bool = False,
+                 console: Optional[Console] = None, save_progress: bool = True,
+                 history: Optional[HistoryStore] = None):
         """
         Initialize memorize mode with a wordlist.
         
         Args:
-            wordlist: Dictionary containing word pairs
+            wordlist: Dictionary containing word pairs (a PairStore)
+            progress: Store for saved progress (opens the default one if None)
+            new_words_per_run: Words introduced at the start of each run
+            questions_per_run: Questions asked in each run
+            max_pool_size: No new words are introduced while this many words are
+                in the active pool (None for no limit)
+            requeue_failed: Ask wrongly answered questions again at the end of the run
+            console: Console for prompts and output (the terminal if None)
+            save_progress: Save progress at all (False for throwaway sessions)
+            history: Store stage 2 and 3 answers are recorded to (the default one if None)
         """
+        self.console = console or TerminalConsole()
+        self.trace = get_instrumentation()
+        self.new_words_per_run = new_words_per_run or self.NEW_WORDS_PER_RUN
+        self.questions_per_run = questions_per_run or self.QUESTIONS_PER_RUN
+        self.max_pool_size = max_pool_size
+        self.requeue_failed = requeue_failed
         self.wordlist = wordlist
         self.pairs = wordlist["pairs"]
+        self.matcher = AnswerMatcher.for_pairs(self.pairs)
+        self.history = history
+        
+        self.progress = progress
+        self.progress_error = None
+        if not save_progress:
+            self.progress = None
+            self.progress_error = "saving is turned off"
+        elif self.progress is None:
+            try:
+                self.progress = ProgressStore()
+            except (sqlite3.Error, OSError) as e:
+                self.progress_error = str(e)
         
         # Track progress for each word (word_index -> current_stage)
         # Stage 0 means not started, 1-3 are the stages, 4 means completed all stages
-        self.word_stages = {i: 0 for i in range(len(self.pairs))}
+        self.word_stages = array('B', bytes(len(self.pairs)))
+        
+        # Number of words at each stage (index 0-4), kept up to date by _set_stage
+        self.stage_counts = [len(self.pairs), 0, 0, 0, 0]
         
         # Track which words are in the active pool (introduced but not fully memorized)
-        self.words_in_pool = set()  # Set of word indices
+        # Questions are drawn through pool_weights below
+        self.words_in_pool = IndexedSet(len(self.pairs))
         
         # Track which words haven't been introduced yet
-        self.words_not_yet_introduced = set(range(len(self.pairs)))
+        # An IndexedSet lets a run draw new words in O(k) instead of copying the set
+        self.words_not_yet_introduced = IndexedSet.full(len(self.pairs))
+        
+        # Per-word answer history: recent mistakes (halved by every correct answer)
+        # and a moving average of answer time, which set the word's weight in the pool
+        self.error_scores = array('d', bytes(8 * len(self.pairs)))
+        self.answer_seconds = array('d', bytes(8 * len(self.pairs)))
+        self.pool_weights = WeightedSampler(len(self.pairs))
     
     def start(self):
         """Start the memorize mode."""
-        print("\n" + Colors.cyan("="*50))
-        print(Colors.bold_cyan("           MEMORIZE MODE"))
-        print(Colors.cyan("="*50))
-        print(Colors.yellow("\nThis mode helps you fully memorize all words."))
-        print(Colors.yellow("Each word has 3 stages:"))
-        print(Colors.yellow("  1. Type both word and meaning"))
-        print(Colors.yellow("  2. See word → type meaning"))
-        print(Colors.yellow("  3. See meaning → type word"))
-        print(Colors.yellow("\nAnswer all questions correctly to complete!"))
-        print(Colors.yellow("Type 'end session' at any time to quit."))
-        print(Colors.cyan("="*50))
-        
-        input(Colors.magenta("\nPress Enter to start..."))
-        
-        self._memorization_loop()
+        self.console.print(Colors.banner("           MEMORIZE MODE"))
+        self.console.print(Colors.yellow("\nThis mode helps you fully memorize all words."))
+        self.console.print(Colors.yellow("Each word has 3 stages:"))
+        self.console.print(Colors.yellow("  1. Type both word and meaning"))
+        self.console.print(Colors.yellow("  2. See word → type meaning"))
+        self.console.print(Colors.yellow("  3. See meaning → type word"))
+        self.console.print(Colors.yellow("\nAnswer all questions correctly to complete!"))
+        self.console.print(Colors.yellow("Type 'end session' at any time to quit."))
+        self.console.print(Colors.rule())
+        
+        if self.progress is None:
+            self.console.print(Colors.red(f"\nProgress can't be saved this session: {self.progress_error}"))
+        else:
+            self._offer_resume()
+        
+        self.console.input(Colors.magenta("\nPress Enter to start..."))
+        
+        self.trace.start_session("memorize", self.wordlist)
+        # Written when the loop ends, also if it ends with an error
+        with open_session("memorize", self.wordlist["name"], store=self.history) as recorder:
+            self._memorization_loop(recorder)
+        self.trace.end_session(self.console)
+        if recorder.error:
+            self.console.print(Colors.red(f"Answers couldn't be added to your history: {recorder.error}"))
     
-    def _memorization_loop(self):
-        """Main memorization loop with runs of 10 questions."""
+    def _memorization_loop(self, recorder: SessionRecorder):
+        """
+        Main memorization loop with runs of questions_per_run questions.
+        
+        Args:
+            recorder: Recorder the stage 2 and 3 answers are added to (stage 1
+                answers are copied from the screen, so they aren't recalled)
+        """
         run_number = 1
         last_question = None  # Track to avoid immediate repetition
         
         while self.words_in_pool or self.words_not_yet_introduced:
-            # Add up to 10 new words to the pool for this run
-            self._add_new_words_to_pool()
+            self.console.print(f"\n{Colors.rule()}")
+            self.console.print(Colors.bold_cyan(f"           RUN {run_number}"))
+            self.console.print(f"{Colors.rule()}\n")
             
-            print(f"\n{Colors.cyan('='*50)}")
-            print(Colors.bold_cyan(f"           RUN {run_number}"))
-            print(f"{Colors.cyan('='*50)}\n")
-            
-            # Prepare questions for this run
-            questions_this_run = self._prepare_run_questions(last_question)
+            questions_this_run = self.start_run(last_question)
             
             if not questions_this_run:
                 break  # All done!
             
-            # Track failed questions for next run
-            failed_questions = []
+            # With requeue_failed, wrongly answered questions are collected in a
+            # list of their own and asked once more after the others
+            requeued = set()
+            pending = questions_this_run
+            asked = 0
             
-            # Ask up to 10 questions in this run
-            for i, (word_idx, stage) in enumerate(questions_this_run, 1):
-                print(Colors.yellow(f"Question {i}/{len(questions_this_run)}"))
-                
-                result = self._ask_question(word_idx, stage)
-                
-                if result == "quit":
-                    print(Colors.yellow("\nSession ended. Progress has been saved."))
-                    self._display_progress()
-                    return
-                elif result == "correct":
-                    # Move to next stage or mark as complete
-                    if stage == self.STAGE_MEANING_TO_WORD:
-                        # Completed all stages - remove from pool
-                        self.word_stages[word_idx] = 4
-                        self.words_in_pool.discard(word_idx)
-                    else:
-                        # Move to next stage
-                        self.word_stages[word_idx] = stage + 1
-                else:  # incorrect
-                    # Stay at same stage
-                    last_question = (word_idx, stage)
-                
-                print()  # Empty line for readability
+            # Ask up to questions_per_run questions in this run
+            while pending:
+                failed_questions = []
+                for word_idx, stage in pending:
+                    asked += 1
+                    self.trace.lap("select")
+                    self.console.print(Colors.yellow(f"Question {asked}/{len(questions_this_run) + len(requeued)}"))
+                    
+                    asked_at = time.monotonic()
+                    result = self._ask_question(word_idx, stage)
+                    
+                    if result == "quit":
+                        self.console.print(Colors.yellow(f"\nSession ended.{self._saved_note()}"))
+                        self._display_progress()
+                        return
+                    
+                    seconds = time.monotonic() - asked_at
+                    correct = result != INCORRECT
+                    self.apply_answer(word_idx, stage, correct, seconds)
+                    if stage != self.STAGE_TYPE_BOTH:
+                        pair = self.pairs[word_idx]
+                        field = "meaning" if stage == self.STAGE_WORD_TO_MEANING else "word"
+                        recorder.record(pair["word"], pair["meaning"], field, result, seconds)
+                    if not correct:
+                        # Stay at same stage
+                        last_question = (word_idx, stage)
+                        if self.requeue_failed and (word_idx, stage) not in requeued:
+                            requeued.add((word_idx, stage))
+                            failed_questions.append((word_idx, stage))
+                    self.trace.lap("save")
+                    
+                    self.console.print()  # Empty line for readability
+                    self.trace.question(card=word_idx, stage=stage, result=result)
+                pending = failed_questions
             
             # Show progress after this run
             self._display_progress()
             
             # Check if all words are memorized
             if not self.words_in_pool and not self.words_not_yet_introduced:
-                print(Colors.bold_green("\n🎉 CONGRATULATIONS! 🎉"))
-                print(Colors.bold_green("You have successfully memorized all words!"))
-                print(Colors.cyan("="*50))
+                self.console.print(Colors.bold_green("\n🎉 CONGRATULATIONS! 🎉"))
+                self.console.print(Colors.bold_green("You have successfully memorized all words!"))
+                self.console.print(Colors.rule())
+                # Start from scratch next time
+                if self.progress is not None:
+                    self.progress.clear(self.wordlist["name"])
                 return
             
             run_number += 1
             
             # Ask if user wants to continue
             if self.words_in_pool or self.words_not_yet_introduced:
-                continue_choice = input(Colors.magenta("\nContinue to next run? [Y/n]: ")).strip().lower()
+                continue_choice = self.console.input(Colors.magenta("\nContinue to next run? [Y/n]: ")).strip().lower()
+                self.trace.idle()
                 if continue_choice and continue_choice not in ['y', 'yes', '']:
-                    print(Colors.yellow("\nSession paused. Progress has been saved."))
+                    self.console.print(Colors.yellow(f"\nSession paused.{self._saved_note()}"))
                     self._display_progress()
                     return
     
+    def start_run(self, last_question: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+        """
+        Introduce the new words of a run and draw its questions.
+        
+        Args:
+            last_question: The last question asked (to avoid immediate repetition)
+            
+        Returns:
+            List of (word_index, stage) tuples, empty if every word is memorized
+        """
+        # Add up to new_words_per_run new words to the pool for this run
+        self._add_new_words_to_pool()
+        return self._prepare_run_questions(last_question)
+    
+    def apply_answer(self, word_idx: int, stage: int, correct: bool, seconds: float):
+        """
+        Move a word through the stages after it was answered.
+        
+        Args:
+            word_idx: Index of the word in self.pairs
+            stage: Stage the question was asked at
+            correct: Whether the answer was accepted (a wrong answer keeps the stage)
+            seconds: Time taken to answer
+        """
+        self._record_answer(word_idx, correct, seconds)
+        if correct:
+            # Move to next stage or mark as complete
+            if stage == self.STAGE_MEANING_TO_WORD:
+                # Completed all stages - remove from pool
+                self._set_stage(word_idx, self.STAGE_MEMORIZED)
+                self._remove_from_pool(word_idx)
+            else:
+                # Move to next stage
+                self._set_stage(word_idx, stage + 1)
+    
     def _add_new_words_to_pool(self):
         """
-        Add up to 10 new words to the active pool.
+        Add up to new_words_per_run new words to the active pool.
         New words start at stage 1 (type both).
         """
-        # Add up to 10 new words
-        words_to_add = min(10, len(self.words_not_yet_introduced))
+        # Add up to new_words_per_run new words, keeping the pool under max_pool_size
+        words_to_add = min(self.new_words_per_run, len(self.words_not_yet_introduced))
+        if self.max_pool_size is not None:
+            words_to_add = min(words_to_add, self.max_pool_size - len(self.words_in_pool))
         
         if words_to_add > 0:
             # Get random words from the not-yet-introduced set
-            new_word_indices = random.sample(list(self.words_not_yet_introduced), words_to_add)
+            new_word_indices = self.words_not_yet_introduced.sample(words_to_add)
             
             for word_idx in new_word_indices:
-                self.words_in_pool.add(word_idx)
-                self.word_stages[word_idx] = 1  # Start at stage 1
+                self._add_to_pool(word_idx)
+                self._set_stage(word_idx, 1, save=False)  # Start at stage 1
                 self.words_not_yet_introduced.remove(word_idx)
+            self._save_progress(new_word_indices)
     
     def _prepare_run_questions(self, last_question: Optional[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """
-        Prepare up to 10 questions for this run from the active pool.
-        Questions are randomized without duplicates.
+        Prepare up to questions_per_run questions for this run from the active pool.
+        Questions are drawn at random without duplicates, weighted by _word_weight().
         
         Args:
             last_question: The last question asked (to avoid immediate repetition)
@@ -151,16 +283,10 @@ class MemorizeMode:
         if not self.words_in_pool:
             return []
         
-        # Generate all possible questions from words in pool
-        all_questions = [(word_idx, self.word_stages[word_idx]) 
-                        for word_idx in self.words_in_pool]
-        
-        # Shuffle the questions
-        random.shuffle(all_questions)
-        
-        # Take up to 10 questions
-        num_questions = min(10, len(all_questions))
-        questions_this_run = all_questions[:num_questions]
+        # Draw words from the pool, favouring words with mistakes or slow answers
+        num_questions = min(self.questions_per_run, len(self.words_in_pool))
+        questions_this_run = [(word_idx, self.word_stages[word_idx])
+                              for word_idx in self.pool_weights.sample(num_questions)]
         
         # If the first question is the same as the last one, try to swap it
         if last_question and len(questions_this_run) > 1 and questions_this_run[0] == last_question:
@@ -178,138 +304,292 @@ class MemorizeMode:
             stage: Current stage (1, 2, or 3)
             
         Returns:
-            "correct", "incorrect", or "quit"
+            "correct", "close" (stages 2 and 3), "incorrect", or "quit"
         """
         pair = self.pairs[word_idx]
         word = pair["word"]
         meaning = pair["meaning"]
         
         if stage == self.STAGE_TYPE_BOTH:
-            return self._stage_type_both(word, meaning)
+            return self._stage_type_both(word_idx, word, meaning)
         elif stage == self.STAGE_WORD_TO_MEANING:
-            return self._stage_word_to_meaning(word, meaning)
+            return self._stage_word_to_meaning(word_idx, word, meaning)
         elif stage == self.STAGE_MEANING_TO_WORD:
-            return self._stage_meaning_to_word(word, meaning)
+            return self._stage_meaning_to_word(word_idx, word, meaning)
         
         return "incorrect"
     
-    def _stage_type_both(self, word: str, meaning: str) -> str:
+    def _stage_type_both(self, word_idx: int, word: str, meaning: str) -> str:
         """
         Stage 1: User must type both word and meaning correctly.
         
         Args:
+            word_idx: Index of the word in self.pairs
             word: The word
             meaning: The meaning
             
         Returns:
             "correct", "incorrect", or "quit"
         """
-        print(Colors.bold("Stage 1: Type both word and meaning"))
-        print(Colors.blue(f"Word: {word}"))
-        print(Colors.blue(f"Meaning: {meaning}"))
-        print(Colors.yellow("Please type both to memorize them:"))
+        self.console.print(Colors.bold("Stage 1: Type both word and meaning"))
+        self.console.print(Colors.blue(f"Word: {word}"))
+        self.console.print(Colors.blue(f"Meaning: {meaning}"))
+        self.console.print(Colors.yellow("Please type both to memorize them:"))
         
         # Type the word
-        typed_word = input(Colors.magenta("Type the word: ")).strip()
+        typed_word = self.trace.ask(self.console, Colors.magenta("Type the word: ")).strip()
         if typed_word.lower() == "end session":
             return "quit"
         
         # Type the meaning
-        typed_meaning = input(Colors.magenta("Type the meaning: ")).strip()
+        typed_meaning = self.trace.ask(self.console, Colors.magenta("Type the meaning: ")).strip()
         if typed_meaning.lower() == "end session":
             return "quit"
         
-        # Check both (case-insensitive)
-        word_correct = typed_word.lower() == word.lower()
-        meaning_correct = typed_meaning.lower() == meaning.lower()
+        # Check both (normalized, case-insensitive); both are on screen, so no typos
+        word_correct = self.matcher.is_correct(typed_word, word_idx, "word")
+        meaning_correct = self.matcher.is_correct(typed_meaning, word_idx, "meaning")
+        self.trace.lap("check")
         
         if word_correct and meaning_correct:
-            print(Colors.bold_green("✓ Perfect! Both correct!"))
+            self.console.print(Colors.bold_green("✓ Perfect! Both correct!"))
             return "correct"
         else:
-            print(Colors.bold_red("✗ Not quite right."))
+            self.console.print(Colors.bold_red("✗ Not quite right."))
             if not word_correct:
-                print(f"  Word should be: {Colors.green(word)}")
+                self.console.print(f"  Word should be: {Colors.green(word)}")
             if not meaning_correct:
-                print(f"  Meaning should be: {Colors.green(meaning)}")
+                self.console.print(f"  Meaning should be: {Colors.green(meaning)}")
             return "incorrect"
     
-    def _stage_word_to_meaning(self, word: str, meaning: str) -> str:
+    def _stage_word_to_meaning(self, word_idx: int, word: str, meaning: str) -> str:
         """
         Stage 2: Show word, user types meaning.
         
         Args:
+            word_idx: Index of the word in self.pairs
             word: The word
             meaning: The meaning
             
         Returns:
-            "correct", "incorrect", or "quit"
+            "correct", "close", "incorrect", or "quit"
         """
-        print(Colors.bold("Stage 2: Word → Meaning"))
-        print(f"{Colors.bold('Word')}: {Colors.blue(word)}")
+        self.console.print(Colors.bold("Stage 2: Word → Meaning"))
+        self.console.print(f"{Colors.bold('Word')}: {Colors.blue(word)}")
         
-        user_answer = input(Colors.magenta("Type the meaning: ")).strip()
+        user_answer = self.trace.ask(self.console, Colors.magenta("Type the meaning: ")).strip()
         
         if user_answer.lower() == "end session":
             return "quit"
         
-        # Check answer (case-insensitive)
-        if user_answer.lower() == meaning.lower():
-            print(Colors.bold_green("✓ Correct!"))
-            return "correct"
-        else:
-            print(Colors.bold_red("✗ Incorrect.") + f" The correct answer is: {Colors.green(meaning)}")
-            return "incorrect"
+        # Check answer (normalized, case-insensitive, small typos forgiven)
+        return self._report_answer(user_answer, word_idx, "meaning", meaning)
     
-    def _stage_meaning_to_word(self, word: str, meaning: str) -> str:
+    def _stage_meaning_to_word(self, word_idx: int, word: str, meaning: str) -> str:
         """
         Stage 3: Show meaning, user types word.
         
         Args:
+            word_idx: Index of the word in self.pairs
             word: The word
             meaning: The meaning
             
         Returns:
-            "correct", "incorrect", or "quit"
+            "correct", "close", "incorrect", or "quit"
         """
-        print(Colors.bold("Stage 3: Meaning → Word"))
-        print(f"{Colors.bold('Meaning')}: {Colors.blue(meaning)}")
+        self.console.print(Colors.bold("Stage 3: Meaning → Word"))
+        self.console.print(f"{Colors.bold('Meaning')}: {Colors.blue(meaning)}")
         
-        user_answer = input(Colors.magenta("Type the word: ")).strip()
+        user_answer = self.trace.ask(self.console, Colors.magenta("Type the word: ")).strip()
         
         if user_answer.lower() == "end session":
             return "quit"
         
-        # Check answer (case-insensitive)
-        if user_answer.lower() == word.lower():
-            print(Colors.bold_green("✓ Correct!"))
+        # Check answer (normalized, case-insensitive, small typos forgiven)
+        return self._report_answer(user_answer, word_idx, "word", word)
+    
+    def _report_answer(self, answer: str, word_idx: int, field: str, correct_answer: str) -> str:
+        """
+        Grade a stage 2 or 3 answer and show the feedback.
+        
+        Args:
+            answer: Typed answer
+            word_idx: Index of the word in self.pairs
+            field: Field that was typed ("word" or "meaning")
+            correct_answer: The expected answer as stored
+            
+        Returns:
+            "correct", "close" or "incorrect"
+        """
+        result = self.matcher.check(answer, word_idx, field)
+        self.trace.lap("check")
+        if result == CORRECT:
+            self.console.print(Colors.bold_green("✓ Correct!"))
             return "correct"
+        if result == CLOSE:
+            self.console.print(Colors.bold_green("≈ Almost!") + f" Watch the spelling: {Colors.green(correct_answer)}")
+            return CLOSE
+        
+        self.console.print(Colors.bold_red("✗ Incorrect.") + f" The correct answer is: {Colors.green(correct_answer)}")
+        self.trace.lap("render")
+        other_index = self.matcher.suggest(answer, field, word_idx)
+        self.trace.lap("check")
+        if other_index is not None:
+            self.console.print(Colors.yellow(suggestion_text(self.pairs[other_index], field)))
+        return "incorrect"
+    
+    def _add_to_pool(self, word_idx: int):
+        """Put a word in the active pool."""
+        self.words_in_pool.add(word_idx)
+        self.pool_weights.set_weight(word_idx, self._word_weight(word_idx))
+    
+    def _remove_from_pool(self, word_idx: int):
+        """Take a word out of the active pool."""
+        self.words_in_pool.discard(word_idx)
+        self.pool_weights.set_weight(word_idx, 0)
+    
+    def _word_weight(self, word_idx: int) -> int:
+        """
+        Get how likely a word is to be asked, relative to the rest of the pool.
+        
+        Args:
+            word_idx: Index of the word in self.pairs
+            
+        Returns:
+            Integer weight of at least BASE_WEIGHT
+        """
+        slowness = min(self.answer_seconds[word_idx] / self.SLOW_ANSWER_SECONDS, 1.0)
+        return round(self.BASE_WEIGHT + self.ERROR_WEIGHT * self.error_scores[word_idx]
+                     + self.LATENCY_WEIGHT * slowness)
+    
+    def _record_answer(self, word_idx: int, correct: bool, seconds: float):
+        """
+        Update a word's answer history and its weight in the pool.
+        
+        Args:
+            word_idx: Index of the word in self.pairs
+            correct: Whether the answer was accepted
+            seconds: Time taken to answer
+        """
+        if correct:
+            self.error_scores[word_idx] *= 0.5
         else:
-            print(Colors.bold_red("✗ Incorrect.") + f" The correct answer is: {Colors.green(word)}")
-            return "incorrect"
+            self.error_scores[word_idx] += 1
+        previous = self.answer_seconds[word_idx]
+        self.answer_seconds[word_idx] = seconds if not previous else 0.7 * previous + 0.3 * seconds
+        if word_idx in self.words_in_pool:
+            self.pool_weights.set_weight(word_idx, self._word_weight(word_idx))
+    
+    def _set_stage(self, word_idx: int, stage: int, save: bool = True):
+        """
+        Move a word to a stage, updating the stage counts.
+        
+        Args:
+            word_idx: Index of the word in self.pairs
+            stage: New stage (1-3, or STAGE_MEMORIZED)
+            save: Whether to save the change right away
+        """
+        self.stage_counts[self.word_stages[word_idx]] -= 1
+        self.stage_counts[stage] += 1
+        self.word_stages[word_idx] = stage
+        if save:
+            self._save_progress((word_idx,))
+    
+    def stage_count(self, stage: int) -> int:
+        """
+        Get the number of words at a stage.
+        
+        Args:
+            stage: 0 (not introduced), 1-3, or STAGE_MEMORIZED
+            
+        Returns:
+            Number of words
+        """
+        return self.stage_counts[stage]
+    
+    def _save_progress(self, word_indices: Iterable[int], replace_all: bool = False):
+        """
+        Save the current stage of some words.
+        
+        Args:
+            word_indices: Indices of the words that changed
+            replace_all: Drop every other saved stage of the wordlist
+        """
+        if self.progress is None:
+            return
+        words = self.pairs.words
+        meanings = self.pairs.meanings
+        try:
+            self.progress.save_stages(self.wordlist["name"],
+                                      [(i, words[i], meanings[i], self.word_stages[i]) for i in word_indices],
+                                      replace_all)
+        except sqlite3.Error as e:
+            self.console.print(Colors.red(f"Could not save progress: {e}"))
+            self.progress = None
+            self.progress_error = str(e)
+    
+    def _saved_note(self) -> str:
+        """Get the sentence telling whether progress is saved."""
+        return " Progress has been saved." if self.progress is not None else ""
+    
+    def _offer_resume(self):
+        """Offer to continue from saved progress, restoring every card's stage."""
+        name = self.wordlist["name"]
+        try:
+            saved = self.progress.load_stages(name)
+        except sqlite3.Error as e:
+            self.console.print(Colors.red(f"\nCould not read saved progress: {e}"))
+            return
+        if not saved:
+            return
+        
+        memorized_count = sum(1 for row in saved if row[3] == self.STAGE_MEMORIZED)
+        self.console.print(f"\n{Colors.bold('Saved progress found:')} "
+              f"{Colors.bold_green(str(memorized_count))} memorized, "
+              f"{Colors.yellow(str(len(saved) - memorized_count))} in progress")
+        choice = self.console.input(Colors.magenta("Resume where you left off? [Y/n]: ")).strip().lower()
+        if choice in ('n', 'no'):
+            self.progress.clear(name)
+            return
+        
+        # Cards are normally still at their saved position; only cards that moved
+        # because the file was edited need a search through the whole deck
+        matched, moved = match_saved_cards(saved, self.pairs.words, self.pairs.meanings)
+        for word_idx, row in matched:
+            self._restore_stage(word_idx, row[3])
+        if moved:
+            # Save the stages under the cards' new positions
+            self._save_progress([word_idx for word_idx, _ in matched], replace_all=True)
+    
+    def _restore_stage(self, word_idx: int, stage: int):
+        """Put a word back at a saved stage."""
+        self._set_stage(word_idx, stage, save=False)
+        self.words_not_yet_introduced.discard(word_idx)
+        if stage != self.STAGE_MEMORIZED:
+            self._add_to_pool(word_idx)
     
     def _display_progress(self):
         """Display current memorization progress."""
         total_words = len(self.pairs)
-        memorized_count = sum(1 for stage in self.word_stages.values() if stage == 4)
+        memorized_count = self.stage_count(self.STAGE_MEMORIZED)
         
         # Count words at each stage
-        stage_1_count = sum(1 for stage in self.word_stages.values() if stage == 1)
-        stage_2_count = sum(1 for stage in self.word_stages.values() if stage == 2)
-        stage_3_count = sum(1 for stage in self.word_stages.values() if stage == 3)
+        stage_1_count = self.stage_count(self.STAGE_TYPE_BOTH)
+        stage_2_count = self.stage_count(self.STAGE_WORD_TO_MEANING)
+        stage_3_count = self.stage_count(self.STAGE_MEANING_TO_WORD)
         
-        print(f"\n{Colors.cyan('='*50)}")
-        print(Colors.bold_cyan("           PROGRESS REPORT"))
-        print(f"{Colors.cyan('='*50)}")
-        print(f"Total words: {Colors.cyan(str(total_words))}")
-        print(f"Fully memorized: {Colors.bold_green(str(memorized_count))} / {Colors.cyan(str(total_words))}")
+        self.console.print(f"\n{Colors.rule()}")
+        self.console.print(Colors.bold_cyan("           PROGRESS REPORT"))
+        self.console.print(f"{Colors.rule()}")
+        self.console.print(f"Total words: {Colors.cyan(str(total_words))}")
+        self.console.print(f"Fully memorized: {Colors.bold_green(str(memorized_count))} / {Colors.cyan(str(total_words))}")
         
         if memorized_count < total_words:
-            print(f"\nWords by stage:")
-            print(f"  Stage 1 (Type both): {Colors.yellow(str(stage_1_count))}")
-            print(f"  Stage 2 (Word→Meaning): {Colors.yellow(str(stage_2_count))}")
-            print(f"  Stage 3 (Meaning→Word): {Colors.yellow(str(stage_3_count))}")
+            self.console.print(f"\nWords by stage:")
+            self.console.print(f"  Stage 1 (Type both): {Colors.yellow(str(stage_1_count))}")
+            self.console.print(f"  Stage 2 (Word→Meaning): {Colors.yellow(str(stage_2_count))}")
+            self.console.print(f"  Stage 3 (Meaning→Word): {Colors.yellow(str(stage_3_count))}")
         
         percentage = (memorized_count / total_words) * 100
-        print(f"\nCompletion: {Colors.bold_green(f'{percentage:.1f}%')}")
-        print(f"{Colors.cyan('='*50)}")
+        self.console.print(f"\nCompletion: {Colors.bold_green(f'{percentage:.1f}%')}")
+        self.console.print(f"{Colors.rule()}")
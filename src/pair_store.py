@@ -0,0 +1,142 @@
+"""
+Pair Store Module
+Compact, read-only storage for the word pairs of a wordlist.
+"""
+import sys
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Tuple
+
+
+def _intern(value):
+    """Intern strings so repeated meanings share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Pair:
+    """A single word/meaning pair."""
+
+    __slots__ = ("word", "meaning")
+
+    def __init__(self, word: str, meaning: str):
+        """
+        Initialize a pair.
+
+        Args:
+            word: The word
+            meaning: The meaning
+        """
+        self.word = word
+        self.meaning = meaning
+
+    def __getitem__(self, key: str) -> str:
+        """Support pair["word"] / pair["meaning"] like the old dict pairs."""
+        if key == "word":
+            return self.word
+        if key == "meaning":
+            return self.meaning
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        """Dict-style get for "word" and "meaning"."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        """Return the pair as a {"word", "meaning"} dictionary."""
+        return {"word": self.word, "meaning": self.meaning}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Pair):
+            return self.word == other.word and self.meaning == other.meaning
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.word, self.meaning))
+
+    def __repr__(self) -> str:
+        return f"Pair({self.word!r}, {self.meaning!r})"
+
+
+class PairStore(Sequence):
+    """
+    Read-only sequence of Pair objects backed by two parallel columns.
+
+    Words and meanings are kept in two flat lists, which costs two pointers per
+    card instead of a dictionary per card. Meanings are interned so repeated
+    meanings share one string; words are nearly always unique, so interning
+    them would only slow down loading. Pair objects are created on access.
+    """
+
+    __slots__ = ("_words", "_meanings", "__weakref__")
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()):
+        """
+        Build a store from (word, meaning) tuples.
+
+        Args:
+            pairs: Iterable of (word, meaning) tuples
+        """
+        words = []
+        meanings = []
+        for word, meaning in pairs:
+            words.append(word)
+            meanings.append(_intern(meaning))
+        self._words = words
+        self._meanings = meanings
+
+    @classmethod
+    def from_columns(cls, words: List[str], meanings: List[str]) -> "PairStore":
+        """
+        Build a store from parallel lists of words and meanings.
+
+        Args:
+            words: Words in order (strings)
+            meanings: Meanings in the same order (strings)
+
+        Returns:
+            New PairStore
+        """
+        return cls._from_columns(list(words), list(map(sys.intern, meanings)))
+
+    @classmethod
+    def _from_columns(cls, words: List[str], meanings: List[str]) -> "PairStore":
+        """Build a store from already prepared columns without copying."""
+        store = cls.__new__(cls)
+        store._words = words
+        store._meanings = meanings
+        return store
+
+    @property
+    def words(self) -> List[str]:
+        """All words in order (do not modify)."""
+        return self._words
+
+    @property
+    def meanings(self) -> List[str]:
+        """All meanings in order (do not modify)."""
+        return self._meanings
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PairStore._from_columns(self._words[index], self._meanings[index])
+        return Pair(self._words[index], self._meanings[index])
+
+    def __iter__(self) -> Iterator[Pair]:
+        return map(Pair, self._words, self._meanings)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PairStore):
+            return self._words == other._words and self._meanings == other._meanings
+        return NotImplemented
+
+    def __reduce__(self):
+        # Pickle the two columns; pickle's memo keeps repeated strings shared
+        return (PairStore._from_columns, (self._words, self._meanings))
+
+    def __repr__(self) -> str:
+        return f"<PairStore of {len(self)} pairs>"
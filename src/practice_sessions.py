@@ -0,0 +1,292 @@
+"""
+Practice Sessions Module
+Test and Memorize sessions driven one answer at a time (as over the HTTP API),
+with the same question selection and answer checking as the CLI modes.
+"""
+import time
+from typing import Dict, Optional
+from answer_matcher import AnswerMatcher, CORRECT, INCORRECT, suggestion_text
+from grading import TestSummary, build_result
+from history_store import HistoryStore, open_session
+from memorize_mode import MemorizeMode
+from test_generator import TEST_DIRECTIONS, TestGenerator, question_id
+
+
+# Rough memory held by a session, for limiting how many run at once: a fixed
+# part, a test question, and a card's memorize state
+SESSION_BYTES = 1024
+QUESTION_BYTES = 64
+CARD_BYTES = 64
+
+
+class SessionError(ValueError):
+    """Raised for options or answers a session can't accept."""
+
+
+def _text(data: Dict, key: str) -> str:
+    """Get a required string from a request, or raise SessionError."""
+    value = data.get(key)
+    if not isinstance(value, str):
+        raise SessionError(f"'{key}' must be a string")
+    return value.strip()
+
+
+def _count(data: Dict, key: str, default: Optional[int]) -> Optional[int]:
+    """Get an optional whole number from a request, or raise SessionError."""
+    value = data.get(key, default)
+    if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+        raise SessionError(f"'{key}' must be a whole number")
+    return value
+
+
+class TestSession:
+    """
+    A test taken one answer at a time.
+
+    Questions come from TestGenerator, so a seeded session asks the same
+    questions as `main.py test --seed` and the exam sheets. Answers are
+    checked by the deck's AnswerMatcher, scored into a TestSummary and, like
+    Test mode answers, added to the answer history.
+    """
+
+    mode = "test"
+
+    def __init__(self, wordlist: Dict, options: Dict, history: Optional[HistoryStore] = None,
+                 record: bool = True):
+        """
+        Start a test.
+
+        Args:
+            wordlist: Wordlist dictionary whose pairs are a PairStore
+            options: "questions" (default 20, at most the deck size), "direction"
+                (one of TEST_DIRECTIONS, default "random") and "seed"
+            history: Store answers are recorded to (the default one if None)
+            record: Record the answers in the history at all
+
+        Raises:
+            SessionError: If an option is invalid
+        """
+        self.wordlist = wordlist
+        self.pairs = wordlist["pairs"]
+        questions = _count(options, "questions", min(20, len(self.pairs)))
+        direction = options.get("direction", "random")
+        seed = _count(options, "seed", None)
+        if direction not in TEST_DIRECTIONS:
+            raise SessionError(f"'direction' must be one of {', '.join(TEST_DIRECTIONS)}")
+        if not 1 <= questions <= len(self.pairs):
+            raise SessionError(f"'questions' must be from 1 to {len(self.pairs)}")
+
+        self.direction = direction
+        self.matcher = AnswerMatcher.for_pairs(self.pairs)
+        self.questions = list(TestGenerator(len(self.pairs), seed).generate(questions, direction))
+        self.position = 0
+        self.summary = TestSummary()
+        self.recorder = open_session("test", wordlist["name"], direction, history) if record else None
+        self._asked_at = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        """Whether every question has been answered."""
+        return self.position >= len(self.questions)
+
+    def question(self) -> Optional[Dict]:
+        """Get the current question (None once the test is finished)."""
+        if self.done:
+            return None
+        card, is_word_to_meaning = self.questions[self.position]
+        pair = self.pairs[card]
+        return {
+            "number": self.position + 1,
+            "total": len(self.questions),
+            "question_id": question_id(card, is_word_to_meaning),
+            "type": "Word → Meaning" if is_word_to_meaning else "Meaning → Word",
+            "prompt": pair["word"] if is_word_to_meaning else pair["meaning"],
+            "answer_field": "meaning" if is_word_to_meaning else "word",
+        }
+
+    def answer(self, data: Dict) -> Dict:
+        """
+        Check the answer to the current question and move on.
+
+        Args:
+            data: Request with the typed "answer"
+
+        Returns:
+            The verdict, the next question, and the summary once finished
+
+        Raises:
+            SessionError: If the test is finished or the answer is missing
+        """
+        if self.done:
+            raise SessionError("the test is finished")
+        user_answer = _text(data, "answer")
+        latency = time.monotonic() - self._asked_at
+
+        card, is_word_to_meaning = self.questions[self.position]
+        pair = self.pairs[card]
+        answer_field = "meaning" if is_word_to_meaning else "word"
+        outcome = self.matcher.check(user_answer, card, answer_field)
+        suggestion = None
+        if outcome == INCORRECT:
+            other_index = self.matcher.suggest(user_answer, answer_field, card)
+            if other_index is not None:
+                suggestion = suggestion_text(self.pairs[other_index], answer_field)
+        result = build_result(self.position + 1, pair, is_word_to_meaning, user_answer, outcome, suggestion)
+        self.summary.add(result)
+        if self.recorder is not None:
+            self.recorder.record(pair["word"], pair["meaning"], answer_field, outcome, latency)
+
+        self.position += 1
+        self._asked_at = time.monotonic()
+        response = {"result": outcome, "correct_answer": result["correct_answer"],
+                    "suggestion": suggestion, "next": self.question(), "done": self.done}
+        if self.done:
+            self.close()
+            response["summary"] = self.summary.to_dict()
+        return response
+
+    def state(self) -> Dict:
+        """Get the current question and the score so far."""
+        return {"mode": self.mode, "wordlist": self.wordlist["name"], "direction": self.direction,
+                "question": self.question(), "answered": self.summary.total,
+                "correct": self.summary.correct, "done": self.done}
+
+    def footprint(self) -> int:
+        """Estimate the bytes this session holds on to (the deck and its matcher are shared)."""
+        return SESSION_BYTES + QUESTION_BYTES * len(self.questions)
+
+    def close(self):
+        """Write the answers not yet added to the history."""
+        if self.recorder is not None:
+            self.recorder.flush()
+
+
+class MemorizeSession:
+    """
+    A Memorize mode session answered one question at a time.
+
+    The stages, the pool and the weighting of slow or missed words are
+    MemorizeMode's own; only the prompting is replaced. Progress isn't saved,
+    since a server session isn't tied to the user's saved progress, but stage
+    2 and 3 answers are added to the answer history as in Memorize mode.
+    """
+
+    mode = "memorize"
+
+    def __init__(self, wordlist: Dict, options: Dict, history: Optional[HistoryStore] = None,
+                 record: bool = True):
+        """
+        Start memorizing a wordlist.
+
+        Args:
+            wordlist: Wordlist dictionary whose pairs are a PairStore
+            options: Optional "new_words_per_run" and "questions_per_run"
+            history: Store answers are recorded to (the default one if None)
+            record: Record the answers in the history at all
+
+        Raises:
+            SessionError: If an option is invalid
+        """
+        new_words = _count(options, "new_words_per_run", None)
+        per_run = _count(options, "questions_per_run", None)
+        for key, value in (("new_words_per_run", new_words), ("questions_per_run", per_run)):
+            if value is not None and value < 1:
+                raise SessionError(f"'{key}' must be at least 1")
+        self.wordlist = wordlist
+        self.engine = MemorizeMode(wordlist, new_words_per_run=new_words, questions_per_run=per_run,
+                                   save_progress=False)
+        self.pairs = self.engine.pairs
+        self.run_number = 1
+        self.run = self.engine.start_run()
+        self.position = 0
+        self.last_question = None
+        self.recorder = open_session("memorize", wordlist["name"], store=history) if record else None
+        self._asked_at = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        """Whether every word has been memorized."""
+        return self.position >= len(self.run)
+
+    def question(self) -> Optional[Dict]:
+        """Get the current question (None once every word is memorized)."""
+        if self.done:
+            return None
+        word_idx, stage = self.run[self.position]
+        pair = self.pairs[word_idx]
+        question = {"run": self.run_number, "number": self.position + 1, "run_length": len(self.run),
+                    "card": word_idx, "stage": stage}
+        if stage == MemorizeMode.STAGE_TYPE_BOTH:
+            question.update(word=pair["word"], meaning=pair["meaning"], expects=["word", "meaning"])
+        elif stage == MemorizeMode.STAGE_WORD_TO_MEANING:
+            question.update(word=pair["word"], expects=["meaning"])
+        else:
+            question.update(meaning=pair["meaning"], expects=["word"])
+        return question
+
+    def answer(self, data: Dict) -> Dict:
+        """
+        Check the answer to the current question and move on.
+
+        Args:
+            data: Request with "word" and "meaning" at stage 1, else "answer"
+
+        Returns:
+            The verdict, the next question and the stage counts
+
+        Raises:
+            SessionError: If every word is memorized or the answer is missing
+        """
+        if self.done:
+            raise SessionError("every word is memorized")
+        word_idx, stage = self.run[self.position]
+        pair = self.pairs[word_idx]
+        matcher = self.engine.matcher
+        if stage == MemorizeMode.STAGE_TYPE_BOTH:
+            # Both are on screen, so no typos
+            typed_word, typed_meaning = _text(data, "word"), _text(data, "meaning")
+            correct = (matcher.is_correct(typed_word, word_idx, "word")
+                       and matcher.is_correct(typed_meaning, word_idx, "meaning"))
+            outcome = CORRECT if correct else INCORRECT
+            expected = {"word": pair["word"], "meaning": pair["meaning"]}
+        else:
+            field = "meaning" if stage == MemorizeMode.STAGE_WORD_TO_MEANING else "word"
+            outcome = matcher.check(_text(data, "answer"), word_idx, field)
+            correct = outcome != INCORRECT
+            expected = {field: pair[field]}
+
+        latency = time.monotonic() - self._asked_at
+        self.engine.apply_answer(word_idx, stage, correct, latency)
+        if self.recorder is not None and stage != MemorizeMode.STAGE_TYPE_BOTH:
+            self.recorder.record(pair["word"], pair["meaning"], field, outcome, latency)
+        if not correct:
+            self.last_question = (word_idx, stage)
+        self.position += 1
+        if self.position >= len(self.run):
+            self.run = self.engine.start_run(self.last_question)
+            self.position = 0
+            self.run_number += 1
+        self._asked_at = time.monotonic()
+        return {"result": outcome, "expected": expected, "next": self.question(),
+                "progress": self.progress(), "done": self.done}
+
+    def progress(self) -> Dict:
+        """Count the words at every stage."""
+        count = self.engine.stage_count
+        return {"not_started": count(0), "stage_1": count(1), "stage_2": count(2),
+                "stage_3": count(3), "memorized": count(MemorizeMode.STAGE_MEMORIZED)}
+
+    def state(self) -> Dict:
+        """Get the current question and the stage counts."""
+        return {"mode": self.mode, "wordlist": self.wordlist["name"], "question": self.question(),
+                "progress": self.progress(), "done": self.done}
+
+    def footprint(self) -> int:
+        """Estimate the bytes this session holds on to, which grows with the deck."""
+        return SESSION_BYTES + CARD_BYTES * len(self.pairs)
+
+    def close(self):
+        """Write the answers not yet added to the history."""
+        if self.recorder is not None:
+            self.recorder.flush()
+
@@ -0,0 +1,207 @@
+"""
+Progress Store Module
+Saves memorize mode progress and learn mode review schedules in a SQLite
+database, one row per card.
+"""
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# A saved review: (position, word, meaning, easiness, interval, repetitions, lapses, due)
+ReviewRow = Tuple[int, str, str, float, float, int, int, float]
+
+
+def get_data_dir() -> Path:
+    """
+    Get the directory used for saved progress.
+
+    Honors FLASHCARDS_DATA_DIR, then XDG_DATA_HOME, then falls back to ~/.local/share.
+
+    Returns:
+        Path of the flashcards data directory (may not exist yet)
+    """
+    override = os.environ.get("FLASHCARDS_DATA_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_DATA_HOME") or (Path.home() / ".local" / "share")
+    return Path(base) / "flashcards"
+
+
+def match_saved_cards(rows: Iterable[tuple], words: Sequence[str],
+                      meanings: Sequence[str]) -> Tuple[List[Tuple[int, tuple]], bool]:
+    """
+    Find the card each saved row belongs to.
+
+    A row whose card is still at its saved position is matched directly. The
+    others are matched, in one pass over the deck, to the first card with the
+    same word and meaning that no other row claimed, so duplicate cards keep
+    rows of their own. Rows whose card was removed from the deck are dropped.
+
+    Args:
+        rows: Saved rows starting with (position, word, meaning)
+        words: Words of the deck
+        meanings: Meanings of the deck
+
+    Returns:
+        ([(card index, row)], whether any row moved or was dropped)
+    """
+    matched = []
+    claimed = set()
+    moved = {}
+    for row in rows:
+        position, word, meaning = row[0], row[1], row[2]
+        if position < len(words) and words[position] == word and meanings[position] == meaning:
+            matched.append((position, row))
+            claimed.add(position)
+        else:
+            moved.setdefault((word, meaning), []).append(row)
+    if not moved:
+        return matched, False
+
+    for index, key in enumerate(zip(words, meanings)):
+        waiting = moved.get(key)
+        if waiting and index not in claimed:
+            matched.append((index, waiting.pop()))
+            if not waiting:
+                del moved[key]
+                if not moved:
+                    break
+    return matched, True
+
+
+class ProgressStore:
+    """
+    Memorize mode stage and review schedule of every card, keyed by wordlist
+    name and card.
+
+    Rows are keyed by card position, so duplicate cards keep their own, and
+    keep the card's word and meaning, so match_saved_cards() can follow cards
+    that moved when the wordlist file was edited. Every stage change is written
+    as its own small upsert; the database runs in WAL mode, which makes each
+    commit an append to the log instead of a rewrite.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (and create if needed) the progress database.
+
+        Args:
+            db_path: Database file (defaults to progress.db in get_data_dir())
+
+        Raises:
+            sqlite3.Error: If the database can't be opened
+        """
+        self.db_path = Path(db_path) if db_path else get_data_dir() / "progress.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.db_path))
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # A crash may lose the last answer or two, but never corrupts the file
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS memorize_progress ("
+                " wordlist TEXT NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " word TEXT NOT NULL,"
+                " meaning TEXT NOT NULL,"
+                " stage INTEGER NOT NULL,"
+                " updated REAL NOT NULL,"
+                " PRIMARY KEY (wordlist, position)"
+                ") WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS review_schedule ("
+                " wordlist TEXT NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " word TEXT NOT NULL,"
+                " meaning TEXT NOT NULL,"
+                " easiness REAL NOT NULL,"
+                " interval REAL NOT NULL,"
+                " repetitions INTEGER NOT NULL,"
+                " lapses INTEGER NOT NULL,"
+                " due REAL NOT NULL,"
+                " PRIMARY KEY (wordlist, position)"
+                ") WITHOUT ROWID"
+            )
+
+    def load_stages(self, wordlist: str) -> List[Tuple[int, str, str, int]]:
+        """
+        Read the saved stages of a wordlist.
+
+        Args:
+            wordlist: Wordlist name
+
+        Returns:
+            (position, word, meaning, stage) for every card that was started
+        """
+        return self._connection.execute(
+            "SELECT position, word, meaning, stage FROM memorize_progress WHERE wordlist = ?",
+            (wordlist,)).fetchall()
+
+    def save_stages(self, wordlist: str, stages: Iterable[Tuple[int, str, str, int]],
+                    replace_all: bool = False):
+        """
+        Save the stages of some cards in one transaction.
+
+        Args:
+            wordlist: Wordlist name
+            stages: (position, word, meaning, stage) tuples
+            replace_all: Drop the wordlist's other saved stages (after cards moved)
+        """
+        now = time.time()
+        with self._connection:
+            if replace_all:
+                self._connection.execute("DELETE FROM memorize_progress WHERE wordlist = ?", (wordlist,))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO memorize_progress"
+                " (wordlist, position, word, meaning, stage, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                ((wordlist, position, word, meaning, stage, now)
+                 for position, word, meaning, stage in stages))
+
+    def clear(self, wordlist: str):
+        """
+        Forget all saved progress of a wordlist.
+
+        Args:
+            wordlist: Wordlist name
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM memorize_progress WHERE wordlist = ?", (wordlist,))
+
+    def load_reviews(self, wordlist: str) -> List[ReviewRow]:
+        """
+        Read the saved review schedule of a wordlist.
+
+        Args:
+            wordlist: Wordlist name
+
+        Returns:
+            (position, word, meaning, easiness, interval, repetitions, lapses, due)
+            for every card that was reviewed
+        """
+        return self._connection.execute(
+            "SELECT position, word, meaning, easiness, interval, repetitions, lapses, due"
+            " FROM review_schedule WHERE wordlist = ?", (wordlist,)).fetchall()
+
+    def save_reviews(self, wordlist: str, reviews: Iterable[ReviewRow], replace_all: bool = False):
+        """
+        Save the review state of some cards in one transaction.
+
+        Args:
+            wordlist: Wordlist name
+            reviews: (position, word, meaning, easiness, interval, repetitions, lapses, due) tuples
+            replace_all: Drop the wordlist's other saved reviews (after cards moved)
+        """
+        with self._connection:
+            if replace_all:
+                self._connection.execute("DELETE FROM review_schedule WHERE wordlist = ?", (wordlist,))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO review_schedule (wordlist, position, word, meaning,"
+                " easiness, interval, repetitions, lapses, due) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((wordlist,) + tuple(review) for review in reviews))
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
@@ -0,0 +1,107 @@
+"""
+Replay Driver
+Runs the application against a file of answers and reports its throughput.
+
+Usage:
+    python src/replay.py session.txt             # one answer per line, menus included
+    python src/replay.py session.txt --output -  # also show the app's output
+    python src/replay.py session.txt --json      # print the summary as JSON
+
+The answers are fed to every prompt in order, starting with the wordlist menu.
+The replay ends when the app quits or the answers run out. Saved memorize
+progress goes to a temporary directory unless --keep-progress is given, so a
+replay never changes the user's progress.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from colors import Colors
+from console import ScriptExhausted, ScriptedConsole
+import instrumentation
+import main as app
+
+
+def replay(console: ScriptedConsole) -> str:
+    """
+    Run the application on a scripted console until it quits or runs out of answers.
+
+    Args:
+        console: Console holding the answers
+
+    Returns:
+        "quit" if the app exited by itself, "exhausted" if the answers ran out
+    """
+    try:
+        app.main(console)
+    except SystemExit:
+        return "quit"
+    except ScriptExhausted:
+        return "exhausted"
+    return "quit"
+
+
+def print_summary(summary: dict, outcome: str):
+    """Print a replay summary for people."""
+    print(Colors.banner("            REPLAY SUMMARY"), file=sys.stderr)
+    print(f"Answers: {summary['answers']} in {summary['seconds']:.3f}s "
+          f"({summary['answers_per_second']:.0f}/s)", file=sys.stderr)
+    if "latency_mean" in summary:
+        print("Latency per prompt: " + ", ".join(
+            f"{name[len('latency_'):]} {summary[name] * 1000:.3f} ms"
+            for name in ("latency_mean", "latency_p50", "latency_p90", "latency_p99", "latency_max")),
+            file=sys.stderr)
+    ending = "the app quit" if outcome == "quit" else "the answers ran out"
+    print(f"Replay ended because {ending}.", file=sys.stderr)
+    print(Colors.rule(), file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    """Run a replay from the command line."""
+    parser = argparse.ArgumentParser(description="Replay a file of answers against the app")
+    parser.add_argument("script", help="text file with one answer per line ('-' for stdin)")
+    parser.add_argument("--output", help="write the app's output to this file ('-' for stdout)")
+    parser.add_argument("--echo", action="store_true", help="write each answer after its prompt")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--trace", help="append per-question timing events (JSONL) to this file")
+    parser.add_argument("--keep-progress", action="store_true",
+                        help="save memorize progress to the real data directory")
+    args = parser.parse_args(argv)
+
+    output = None
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output:
+        output = open(args.output, "w", encoding="utf-8")
+    if output is not sys.stdout:
+        Colors.configure(False)
+
+    if args.trace:
+        instrumentation.configure(args.trace)
+
+    if args.script == "-":
+        console = ScriptedConsole((line.rstrip("\r\n") for line in sys.stdin),
+                                  output=output, echo=args.echo)
+    else:
+        console = ScriptedConsole.from_file(args.script, output=output, echo=args.echo)
+
+    with tempfile.TemporaryDirectory(prefix="flashcards-replay-") as data_dir:
+        if not args.keep_progress:
+            os.environ["FLASHCARDS_DATA_DIR"] = data_dir
+        try:
+            outcome = replay(console)
+        finally:
+            if output is not None and output is not sys.stdout:
+                output.close()
+
+    summary = console.summary()
+    if args.json:
+        print(json.dumps(dict(summary, outcome=outcome), indent=2))
+    else:
+        print_summary(summary, outcome)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
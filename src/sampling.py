@@ -0,0 +1,202 @@
+"""
+Sampling Module
+Index sets that support O(1) membership updates and O(k) random draws, and
+weighted draws in O(log n).
+"""
+import random
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+
+class IndexedSet:
+    """
+    Set of integers in range(capacity) that can be sampled without a full copy.
+
+    Members are kept in a dense array, and each member's slot in that array is
+    recorded in a second array. Removing a member moves the last member into
+    its slot (swap-remove), so add, remove and membership tests are O(1), and
+    drawing k random members only touches k slots.
+    """
+
+    def __init__(self, capacity: int, items: Iterable[int] = ()):
+        """
+        Initialize the set.
+
+        Args:
+            capacity: Upper bound (exclusive) of the integers that can be stored
+            items: Initial members
+        """
+        self.capacity = capacity
+        self._items = array('l')
+        self._slots = array('l', [-1]) * capacity
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def full(cls, capacity: int) -> "IndexedSet":
+        """
+        Build a set containing every integer in range(capacity).
+
+        Args:
+            capacity: Number of members
+
+        Returns:
+            New IndexedSet
+        """
+        indexed_set = cls(0)
+        indexed_set.capacity = capacity
+        indexed_set._items = array('l', range(capacity))
+        indexed_set._slots = array('l', range(capacity))
+        return indexed_set
+
+    def add(self, item: int):
+        """Add a member (no effect if it is already present)."""
+        if self._slots[item] < 0:
+            self._slots[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: int):
+        """Remove a member if it is present."""
+        slot = self._slots[item]
+        if slot < 0:
+            return
+        last = self._items.pop()
+        if last != item:
+            self._items[slot] = last
+            self._slots[last] = slot
+        self._slots[item] = -1
+
+    def remove(self, item: int):
+        """Remove a member, raising KeyError if it is absent."""
+        if self._slots[item] < 0:
+            raise KeyError(item)
+        self.discard(item)
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        Draw k distinct random members in random order, in O(k).
+
+        Args:
+            k: Number of members to draw (at most len(self))
+            rng: Random generator to use (module-level random if None)
+
+        Returns:
+            List of members
+        """
+        items = self._items
+        return [items[slot] for slot in (rng or random).sample(range(len(items)), k)]
+
+    def __contains__(self, item: int) -> bool:
+        return 0 <= item < self.capacity and self._slots[item] >= 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"<IndexedSet of {len(self)} / {self.capacity}>"
+
+
+class WeightedSampler:
+    """
+    Random draws from range(capacity) in proportion to integer weights.
+
+    Weights are kept in a Fenwick (binary indexed) tree, so changing one
+    weight and drawing one item are both O(log n). Weights are integers so the
+    tree's partial sums stay exact however many updates it sees; an item with
+    weight 0 is never drawn.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the sampler with every weight 0.
+
+        Args:
+            capacity: Number of items
+        """
+        self.capacity = capacity
+        self._weights = array('q', bytes(8 * capacity))
+        self._tree = array('q', bytes(8 * (capacity + 1)))  # 1-based
+        self._total = 0
+        self._top_bit = 1 << capacity.bit_length() if capacity else 0
+
+    def set_weight(self, item: int, weight: int):
+        """
+        Change the weight of an item.
+
+        Args:
+            item: Item in range(capacity)
+            weight: New weight (0 removes the item from the draws)
+        """
+        delta = weight - self._weights[item]
+        if not delta:
+            return
+        self._weights[item] = weight
+        self._total += delta
+        tree = self._tree
+        position = item + 1
+        while position <= self.capacity:
+            tree[position] += delta
+            position += position & -position
+
+    def weight(self, item: int) -> int:
+        """Get the weight of an item."""
+        return self._weights[item]
+
+    @property
+    def total(self) -> int:
+        """Sum of all weights."""
+        return self._total
+
+    def draw(self, rng: Optional[random.Random] = None) -> int:
+        """
+        Draw one item in proportion to its weight.
+
+        Args:
+            rng: Random generator to use (module-level random if None)
+
+        Returns:
+            The item
+
+        Raises:
+            ValueError: If every weight is 0
+        """
+        if self._total <= 0:
+            raise ValueError("cannot draw from a sampler whose weights are all 0")
+        target = (rng or random).randrange(self._total)
+
+        # Walk down the tree to the first item whose running sum exceeds target
+        tree = self._tree
+        position = 0
+        bit = self._top_bit
+        while bit:
+            following = position + bit
+            if following <= self.capacity and tree[following] <= target:
+                target -= tree[following]
+                position = following
+            bit >>= 1
+        return position
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        Draw k distinct items, each draw in proportion to the remaining weights.
+
+        Args:
+            k: Number of items (at most the number of items with a weight)
+            rng: Random generator to use (module-level random if None)
+
+        Returns:
+            List of items in the order drawn
+        """
+        drawn = []
+        try:
+            for _ in range(k):
+                item = self.draw(rng)
+                drawn.append((item, self._weights[item]))
+                self.set_weight(item, 0)
+        finally:
+            for item, weight in drawn:
+                self.set_weight(item, weight)
+        return [item for item, _ in drawn]
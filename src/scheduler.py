@@ -0,0 +1,212 @@
+"""
+Scheduler Module
+Spaced-repetition scheduling (SM-2) with a priority queue of due times.
+"""
+import heapq
+import random
+import time
+from array import array
+from typing import Callable, Optional
+
+DAY = 24 * 60 * 60
+
+
+class ReviewScheduler:
+    """
+    SM-2 scheduler for the cards of one deck.
+
+    Each card has an easiness factor, an interval and a repetition count, kept
+    in flat arrays indexed by card. Scheduled cards sit in a heap of
+    (due time, sequence, card) entries. When a card is rescheduled, a new entry
+    is pushed and the old one is left in place; it is recognized as stale and
+    dropped once it reaches the top. Finding and updating the next card is
+    therefore O(log n) however large the deck is.
+
+    Cards that were never answered are introduced in random order once no
+    scheduled card is due.
+    """
+
+    DEFAULT_EASINESS = 2.5
+    MIN_EASINESS = 1.3
+    # Seconds before a forgotten card is asked again
+    RELEARN_DELAY = 60
+    # Cards due within this many seconds may be asked early when nothing else is left
+    LEARN_AHEAD = 20 * 60
+
+    def __init__(self, card_count: int, clock: Callable[[], float] = time.time,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize the scheduler with every card new.
+
+        Args:
+            card_count: Number of cards in the deck
+            clock: Function returning the current time in seconds
+            rng: Random generator for the order of new cards
+        """
+        self.card_count = card_count
+        self.clock = clock
+        self._easiness = array('d', [self.DEFAULT_EASINESS]) * card_count
+        self._interval = array('d', [0.0]) * card_count  # days
+        self._repetitions = array('I', [0]) * card_count
+        self._lapses = array('I', [0]) * card_count
+        self._due = array('d', [-1.0]) * card_count  # -1 = never answered
+        self._heap = []
+        self._sequence = 0
+
+        self._new_order = array('I', range(card_count))
+        (rng or random).shuffle(self._new_order)
+        self._next_new = 0
+
+    def next_card(self, now: Optional[float] = None, allow_new: bool = True) -> Optional[int]:
+        """
+        Get the card to ask next without removing it from the queue.
+
+        Overdue cards come first, then new cards, then cards due within
+        LEARN_AHEAD seconds.
+
+        Args:
+            now: Current time (defaults to the clock)
+            allow_new: Whether a card that was never answered may be returned
+
+        Returns:
+            Card index, or None if nothing is due
+        """
+        if now is None:
+            now = self.clock()
+
+        top = self._peek()
+        if top is not None and top[0] <= now:
+            return top[2]
+        new_card = self._peek_new() if allow_new else None
+        if new_card is not None:
+            return new_card
+        if top is not None and top[0] <= now + self.LEARN_AHEAD:
+            return top[2]
+        return None
+
+    def next_due_time(self) -> Optional[float]:
+        """
+        Get the time the earliest scheduled card becomes due.
+
+        Returns:
+            Timestamp, or None if no card has been scheduled
+        """
+        top = self._peek()
+        return top[0] if top is not None else None
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        """
+        Count the scheduled cards that are due (O(n), for display only).
+
+        Args:
+            now: Current time (defaults to the clock)
+
+        Returns:
+            Number of answered cards due by now
+        """
+        if now is None:
+            now = self.clock()
+        return sum(1 for due in self._due if 0 <= due <= now)
+
+    def is_new(self, index: int) -> bool:
+        """Check whether a card was never answered."""
+        return self._due[index] < 0
+
+    def new_count(self) -> int:
+        """Get the number of cards that were never answered."""
+        return sum(1 for due in self._due if due < 0)
+
+    def record(self, index: int, quality: int, now: Optional[float] = None) -> float:
+        """
+        Update a card from an answer and schedule its next review.
+
+        Args:
+            index: Card index
+            quality: SM-2 answer quality from 0 (blackout) to 5 (perfect);
+                below 3 counts as forgotten
+            now: Time of the answer (defaults to the clock)
+
+        Returns:
+            Time the card is due next
+        """
+        if now is None:
+            now = self.clock()
+
+        if quality < 3:
+            self._repetitions[index] = 0
+            self._interval[index] = 0.0
+            self._lapses[index] += 1
+            due = now + self.RELEARN_DELAY
+        else:
+            repetitions = self._repetitions[index] + 1
+            if repetitions == 1:
+                interval = 1.0
+            elif repetitions == 2:
+                interval = 6.0
+            else:
+                interval = round(self._interval[index] * self._easiness[index])
+            self._repetitions[index] = repetitions
+            self._interval[index] = interval
+            due = now + interval * DAY
+
+        penalty = 5 - quality
+        self._easiness[index] = max(self.MIN_EASINESS,
+                                    self._easiness[index] + 0.1 - penalty * (0.08 + penalty * 0.02))
+        self._schedule(index, due)
+        return due
+
+    def card_state(self, index: int) -> tuple:
+        """
+        Get the scheduling state of a card, e.g. for saving it.
+
+        Args:
+            index: Card index
+
+        Returns:
+            (easiness, interval in days, repetitions, lapses, due time or None if new)
+        """
+        due = self._due[index]
+        return (self._easiness[index], self._interval[index], self._repetitions[index],
+                self._lapses[index], due if due >= 0 else None)
+
+    def restore(self, index: int, easiness: float, interval: float, repetitions: int,
+                lapses: int, due: Optional[float]):
+        """
+        Set the scheduling state of a card, e.g. from saved progress.
+
+        Args:
+            index: Card index
+            easiness: SM-2 easiness factor
+            interval: Current interval in days
+            repetitions: Successful reviews in a row
+            lapses: Times the card was forgotten
+            due: Time the card is due, or None if it is still new
+        """
+        self._easiness[index] = easiness
+        self._interval[index] = interval
+        self._repetitions[index] = repetitions
+        self._lapses[index] = lapses
+        if due is not None:
+            self._schedule(index, due)
+
+    def _schedule(self, index: int, due: float):
+        """Push a heap entry for a card, making any older entry stale."""
+        self._due[index] = due
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, index))
+
+    def _peek(self) -> Optional[tuple]:
+        """Get the earliest live heap entry, dropping stale ones."""
+        heap = self._heap
+        while heap and heap[0][0] != self._due[heap[0][2]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _peek_new(self) -> Optional[int]:
+        """Get the next new card, skipping cards answered in the meantime."""
+        while self._next_new < self.card_count:
+            index = self._new_order[self._next_new]
+            if self._due[index] < 0:
+                return index
+            self._next_new += 1
+        return None
@@ -0,0 +1,64 @@
+"""
+Search Index Module
+Case-insensitive substring search over word pairs using a trigram index.
+"""
+from array import array
+from typing import List, Sequence
+
+
+class SubstringIndex:
+    """
+    Finds the pairs whose word or meaning contains a query.
+
+    Every pair's text is split into overlapping three-character slices
+    (trigrams), and each trigram maps to the pairs containing it. A pair can
+    only contain a query if it contains every trigram of the query, so only
+    the pairs listed under the query's rarest trigram have to be checked.
+    Queries shorter than three characters are answered by a plain scan.
+    """
+
+    N = 3
+
+    def __init__(self, words: Sequence[str], meanings: Sequence[str]):
+        """
+        Build the index.
+
+        Args:
+            words: Words in deck order
+            meanings: Meanings in the same order
+        """
+        # "\n" can't be typed into a query, so matches never span both fields
+        self._texts = [f"{word}\n{meaning}".casefold() for word, meaning in zip(words, meanings)]
+        postings = {}
+        n = self.N
+        for index, text in enumerate(self._texts):
+            for gram in {text[i:i + n] for i in range(len(text) - n + 1)}:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(index)
+        self._postings = postings
+
+    def find(self, query: str) -> List[int]:
+        """
+        Find the pairs containing a query in their word or meaning.
+
+        Args:
+            query: Text to look for (case-insensitive)
+
+        Returns:
+            Sorted indices of the matching pairs
+        """
+        query = query.casefold()
+        if not query:
+            return []
+        texts = self._texts
+        if len(query) < self.N:
+            return [index for index, text in enumerate(texts) if query in text]
+
+        n = self.N
+        empty = array('I')
+        rarest = min((self._postings.get(query[i:i + n], empty) for i in range(len(query) - n + 1)),
+                     key=len)
+        # Postings are built in deck order, so the result is already sorted
+        return [index for index in rarest if query in texts[index]]
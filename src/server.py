@@ -0,0 +1,755 @@
+"""
+HTTP Server
+Serves the web app and a JSON API over the wordlists and the Test and Memorize
+engines, from one asyncio event loop (standard library only, Python 3.7+).
+
+Usage:
+    python src/main.py serve                        # http://127.0.0.1:8000/
+    python src/main.py serve --host 0.0.0.0 --port 8080 --no-history
+
+API:
+    GET    /api/wordlists               wordlists and folders, with pair counts once loaded
+    GET    /api/wordlists/NAME          pairs of a wordlist, or of a folder ("Dutch/")
+    POST   /api/sessions                start a session: {"mode": "test", "wordlist": NAME,
+                                        "questions": 20, "direction": "random", "seed": 1}
+                                        or {"mode": "memorize", "wordlist": NAME}
+    GET    /api/sessions/ID             current question and score
+    POST   /api/sessions/ID/answer      {"answer": "..."} ({"word": ..., "meaning": ...} at
+                                        memorize stage 1); returns the verdict and the next
+                                        question
+    DELETE /api/sessions/ID             end a session
+
+The list and every deck are encoded once per version of their files and kept
+in memory (the most recently used decks), plain and gzipped, with an ETag;
+repeated requests are answered from memory, with 304 Not Modified when the
+client already has them. Reading the wordlists directory and loading decks
+happens on a worker thread, and the sessions are started, answered and closed
+on another, so neither a slow load nor building a deck's answer indexes or
+writing the answer history holds up other requests.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+import time
+import traceback
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+from answer_matcher import AnswerMatcher
+from console import TerminalConsole
+from practice_sessions import MemorizeSession, SessionError, TestSession
+from wordlist_manager import WordlistManager
+
+# Project root, where the web app's files are
+ROOT = Path(__file__).resolve().parent.parent
+
+# Files served from the project root, by extension (wordlists/ serves .json only)
+STATIC_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".ico": "image/x-icon",
+}
+JSON_TYPE = "application/json; charset=utf-8"
+
+# Largest request head and body accepted
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+# Smaller bodies are always sent uncompressed
+GZIP_MIN_BYTES = 512
+# Connections waiting to be accepted; asyncio's default of 100 makes a burst of
+# hundreds of clients wait for SYN retries
+LISTEN_BACKLOG = 1024
+
+
+class HTTPError(Exception):
+    """An error response, sent as {"error": message}."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class Request:
+    """A parsed HTTP request."""
+
+    __slots__ = ("method", "path", "version", "headers", "body")
+
+    def __init__(self, method: str, path: str, version: str, headers: Dict[str, str], body: bytes = b""):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open after the response."""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> Dict:
+        """Parse the body as a JSON object (an empty body is {})."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body.decode("utf-8"))
+        except ValueError:
+            raise HTTPError(400, "the body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "the body must be a JSON object")
+        return data
+
+
+class Response:
+    """An HTTP response ready to be written."""
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(self, status: int = 200, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    @classmethod
+    def json(cls, data, status: int = 200) -> "Response":
+        """Build a JSON response."""
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cls(status, body, {"Content-Type": JSON_TYPE, "Cache-Control": "no-store"})
+
+    def encode(self, keep_alive: bool, head_only: bool = False) -> bytes:
+        """Encode the status line, headers and body."""
+        lines = [f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in self.headers.items())
+        if self.status not in (204, 304):
+            lines.append(f"Content-Length: {len(self.body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if head_only or self.status == 304 else head + self.body
+
+
+class Encoded:
+    """
+    A body encoded once for every request: plain, gzipped and its ETag.
+
+    The ETag is weak because the gzipped and the plain body share it.
+    """
+
+    __slots__ = ("body", "gzipped", "etag", "content_type", "version", "data")
+
+    def __init__(self, body: bytes, content_type: str, version=None, data=None):
+        """
+        Encode a body.
+
+        Args:
+            body: Plain body
+            content_type: Content-Type header
+            version: Version of the source it was built from, to detect changes
+            data: Anything to keep with it (e.g. the loaded wordlist)
+        """
+        self.body = body
+        self.gzipped = gzip.compress(body) if len(body) >= GZIP_MIN_BYTES else None
+        self.etag = f'W/"{hashlib.sha1(body).hexdigest()[:24]}"'
+        self.content_type = content_type
+        self.version = version
+        self.data = data
+
+    def response(self, request: Request) -> Response:
+        """
+        Answer a request for this body.
+
+        Args:
+            request: Request, for If-None-Match and Accept-Encoding
+
+        Returns:
+            304 if the client's copy is current, else the body (gzipped if accepted)
+        """
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(304, b"", headers)
+        headers["Content-Type"] = self.content_type
+        if self.gzipped is not None and accepts_gzip(request.headers.get("accept-encoding")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(200, self.gzipped, headers)
+        return Response(200, self.body, headers)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not header:
+        return False
+    tag = etag[2:]
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate == etag or candidate == tag or candidate == f"W/{tag}":
+            return True
+    return False
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    """Check whether an Accept-Encoding header allows gzip."""
+    if not header:
+        return False
+    for coding in header.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def remember(cache: OrderedDict, key, value, limit: int):
+    """Store a value in an LRU cache, dropping the least recently used entries over the limit."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+def content_length(request: Request) -> int:
+    """
+    Get the length of a request's body from its Content-Length header.
+
+    Returns:
+        Number of body bytes (0 if a GET, HEAD or DELETE has no header)
+
+    Raises:
+        HTTPError: 400 if the header is missing on a request with a body,
+            negative or not a number, 413 if it is over MAX_BODY_BYTES
+    """
+    text = request.headers.get("content-length")
+    if text is None:
+        if request.method in ("GET", "HEAD", "DELETE"):
+            return 0
+        raise HTTPError(400, "missing Content-Length")
+    # int() would also take "-1", "+1", " 1" and "1_000"
+    if not (text.isascii() and text.isdigit()):
+        raise HTTPError(400, "invalid Content-Length")
+    length = int(text)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "request body too large")
+    return length
+
+
+class DeckCache:
+    """
+    The wordlist list and decks, encoded and kept in memory.
+
+    The wordlists directory is checked again at most every CATALOG_TTL
+    seconds for new and removed files, while a deck's own files are checked
+    on every request and the deck is reloaded as soon as any of them changed
+    size or modification time. All WordlistManager calls run on one worker
+    thread, one at a time, and concurrent requests for a deck being loaded
+    wait for the same load.
+    """
+
+    # Seconds between checks of the wordlists directory
+    CATALOG_TTL = 1.0
+    # Encoded decks kept in memory, least recently used dropped first
+    MAX_DECKS = 16
+
+    def __init__(self, manager: WordlistManager):
+        """
+        Initialize the cache.
+
+        Args:
+            manager: Manager to list and load the wordlists with
+        """
+        self.manager = manager
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordlists")
+        self.catalog = None
+        self._checked = 0.0
+        self._files = {}
+        self._decks = OrderedDict()
+        self._loading = {}
+
+    async def refresh(self):
+        """Re-read the wordlists directory if the last check is older than CATALOG_TTL."""
+        if self.catalog is not None and time.monotonic() - self._checked < self.CATALOG_TTL:
+            return
+        catalog, folders = await asyncio.get_running_loop().run_in_executor(self.executor, self._scan)
+        self._checked = time.monotonic()
+
+        files = {}
+        for entry in catalog:
+            files[entry["name"]] = [entry["path"]]
+            parts = entry["name"].split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                files.setdefault("/".join(parts[:depth]) + "/", []).append(entry["path"])
+        self._files = files
+
+        body = json.dumps({
+            "wordlists": [{"name": entry["name"], "pairs": entry["pair_count"], "invalid": entry["invalid"]}
+                          for entry in catalog],
+            "folders": [{"name": folder["name"], "lists": folder["lists"], "pairs": folder["pair_count"]}
+                        for folder in folders],
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.catalog is None or self.catalog.body != body:
+            self.catalog = Encoded(body, JSON_TYPE)
+
+    async def deck(self, name: str) -> Encoded:
+        """
+        Get a deck, loading it if it isn't cached or its files changed.
+
+        Args:
+            name: Wordlist name, or folder name ending with "/" (the "/" may be left out)
+
+        Returns:
+            Encoded deck, whose data is the loaded wordlist dictionary
+
+        Raises:
+            HTTPError: 404 if there is no such wordlist, 422 if it can't be loaded
+        """
+        await self.refresh()
+        if name not in self._files and name + "/" in self._files:
+            name += "/"
+        paths = self._files.get(name)
+        if paths is None:
+            raise HTTPError(404, f"wordlist '{name}' not found")
+        try:
+            version = self._version(paths)
+        except OSError:
+            raise HTTPError(404, f"wordlist '{name}' not found")
+        cached = self._decks.get(name)
+        if cached is not None and cached.version == version:
+            self._decks.move_to_end(name)
+            return cached
+
+        future = self._loading.get(name)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, self._load, name, version)
+            self._loading[name] = future
+            future.add_done_callback(lambda _: self._loading.pop(name, None))
+        encoded = await future
+        if encoded is None:
+            raise HTTPError(422, f"wordlist '{name}' could not be loaded")
+        remember(self._decks, name, encoded, self.MAX_DECKS)
+        return encoded
+
+    @staticmethod
+    def _version(paths: List[str]) -> tuple:
+        """
+        Get the version of a deck from its files as they are now.
+
+        Args:
+            paths: Files of the wordlist, or of every wordlist in the folder
+
+        Returns:
+            Modification time and size of every file
+
+        Raises:
+            OSError: If a file is gone
+        """
+        version = []
+        for path in paths:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    def _scan(self):
+        """List the wordlists and folders (on the worker thread)."""
+        return self.manager.get_catalog(), self.manager.get_folders()
+
+    def _load(self, name: str, version) -> Optional[Encoded]:
+        """Load and encode a deck (on the worker thread)."""
+        if name.endswith("/"):
+            wordlist = self.manager.load_folder(name)
+        else:
+            wordlist = self.manager.load_wordlist(name)
+        if wordlist is None:
+            return None
+        pairs = wordlist["pairs"]
+        body = json.dumps({"name": name, "pairs": [
+            {"word": word, "meaning": meaning} for word, meaning in zip(pairs.words, pairs.meanings)
+        ]}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return Encoded(body, JSON_TYPE, version, wordlist)
+
+    def close(self):
+        """Stop the worker thread."""
+        self.executor.shutdown(wait=False)
+
+
+class SessionStore:
+    """
+    Running sessions by id; sessions idle for SESSION_TTL seconds are dropped.
+
+    At most MAX_SESSIONS sessions run at once, and together they may hold at
+    most MAX_SESSION_BYTES (by their footprint()), so a few memorize sessions
+    on a large deck count for as much as many small tests.
+    """
+
+    SESSION_TTL = 3600.0
+    MAX_SESSIONS = 2000
+    MAX_SESSION_BYTES = 256 * 1024 * 1024
+    # Seconds between sweeps for idle sessions
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Initialize the store.
+
+        Args:
+            executor: Thread the sessions are closed on (here if None)
+        """
+        self.executor = executor
+        self._sessions = {}
+        self._bytes = 0
+        self._swept = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session) -> str:
+        """
+        Keep a new session.
+
+        Args:
+            session: TestSession or MemorizeSession
+
+        Returns:
+            Its id
+
+        Raises:
+            HTTPError: 503 if MAX_SESSIONS sessions are running or it would
+                take the sessions over MAX_SESSION_BYTES
+        """
+        now = time.monotonic()
+        size = session.footprint()
+        if now - self._swept >= self.SWEEP_INTERVAL or not self._fits(size):
+            self._sweep(now)
+        if not self._fits(size):
+            self._close(session)
+            raise HTTPError(503, "too many sessions are running; try again later", {"Retry-After": "60"})
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = [session, now, size]
+        self._bytes += size
+        return session_id
+
+    def get(self, session_id: str):
+        """Get a session and mark it as used, or raise a 404 HTTPError."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            raise HTTPError(404, "session not found (it may have expired)")
+        entry[1] = time.monotonic()
+        return entry[0]
+
+    def remove(self, session_id: str):
+        """End a session, or raise a 404 HTTPError."""
+        entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            raise HTTPError(404, "session not found (it may have expired)")
+        self._bytes -= entry[2]
+        self._close(entry[0])
+
+    def close(self):
+        """End every session."""
+        for session, _, _ in self._sessions.values():
+            self._close(session)
+        self._sessions.clear()
+        self._bytes = 0
+
+    def _fits(self, size: int) -> bool:
+        """Check whether a session of this footprint can be added."""
+        return len(self._sessions) < self.MAX_SESSIONS and self._bytes + size <= self.MAX_SESSION_BYTES
+
+    def _close(self, session):
+        """Close a session on the executor, or here without one."""
+        if self.executor is None:
+            session.close()
+        else:
+            self.executor.submit(session.close)
+
+    def _sweep(self, now: float):
+        """Drop the sessions idle for longer than SESSION_TTL."""
+        self._swept = now
+        for session_id, (session, used, size) in list(self._sessions.items()):
+            if now - used > self.SESSION_TTL:
+                del self._sessions[session_id]
+                self._bytes -= size
+                self._close(session)
+
+
+class FlashcardServer:
+    """The HTTP server: API routes, static files and the connection loop."""
+
+    # Encoded static files kept in memory, least recently used dropped first
+    MAX_STATIC_FILES = 64
+
+    def __init__(self, manager: Optional[WordlistManager] = None, root: Path = ROOT,
+                 record_history: bool = True, log: bool = False):
+        """
+        Initialize the server.
+
+        Args:
+            manager: Manager for the wordlists (the default directory if None)
+            root: Directory the web app is served from
+            record_history: Add the answers of test and memorize sessions to the answer history
+            log: Write one line per request to stderr
+        """
+        self.decks = DeckCache(manager or WordlistManager("wordlists", console=TerminalConsole(sys.stderr)))
+        # Sessions use the history's SQLite connection, so they all run on this one thread
+        self.session_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sessions")
+        self.sessions = SessionStore(self.session_executor)
+        self.root = Path(root).resolve()
+        self.wordlists_dir = self.decks.manager.wordlists_dir.resolve()
+        self.record_history = record_history
+        self.log = log
+        self._static = OrderedDict()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 for any free port)
+
+        Returns:
+            The asyncio server
+        """
+        return await asyncio.start_server(self._serve_connection, host, port, limit=MAX_HEADER_BYTES,
+                                          backlog=LISTEN_BACKLOG)
+
+    def close(self):
+        """End the sessions, wait for their answers to be written, and stop the worker threads."""
+        self.sessions.close()
+        self.session_executor.shutdown(wait=True)
+        self.decks.close()
+
+    async def handle(self, request: Request) -> Response:
+        """
+        Answer one request.
+
+        Args:
+            request: Parsed request
+
+        Returns:
+            Response (errors included)
+        """
+        try:
+            if request.path.startswith("/api/"):
+                return await self._handle_api(request)
+            if request.method not in ("GET", "HEAD"):
+                raise HTTPError(405, "method not allowed", {"Allow": "GET, HEAD"})
+            return self._handle_static(request)
+        except HTTPError as e:
+            response = Response.json({"error": e.message}, e.status)
+            response.headers.update(e.headers)
+            return response
+        except Exception:
+            traceback.print_exc()
+            return Response.json({"error": "internal server error"}, 500)
+
+    async def _handle_api(self, request: Request) -> Response:
+        """Route an /api/ request."""
+        parts = request.path[len("/api/"):].split("/", 1)
+        resource, rest = parts[0], parts[1] if len(parts) > 1 else None
+        method = request.method
+
+        if resource == "wordlists":
+            self._allow(method, "GET", "HEAD")
+            if not rest:
+                await self.decks.refresh()
+                return self.decks.catalog.response(request)
+            return (await self.decks.deck(unquote(rest))).response(request)
+
+        if resource == "sessions":
+            if not rest:
+                self._allow(method, "POST")
+                return await self._start_session(request.json())
+            session_id, _, action = rest.partition("/")
+            if action == "answer":
+                self._allow(method, "POST")
+                session = self.sessions.get(session_id)
+                try:
+                    return Response.json(await self._in_session_thread(session.answer, request.json()))
+                except SessionError as e:
+                    raise HTTPError(400, str(e))
+            if action:
+                raise HTTPError(404, "no such endpoint")
+            self._allow(method, "GET", "DELETE")
+            if method == "DELETE":
+                self.sessions.remove(session_id)
+                return Response(204)
+            state = await self._in_session_thread(self.sessions.get(session_id).state)
+            return Response.json(dict(state, id=session_id))
+
+        raise HTTPError(404, "no such endpoint")
+
+    async def _start_session(self, data: Dict) -> Response:
+        """Start a test or memorize session on a deck."""
+        mode = data.get("mode", "test")
+        if mode not in ("test", "memorize"):
+            raise HTTPError(400, "'mode' must be 'test' or 'memorize'")
+        name = data.get("wordlist")
+        if not isinstance(name, str) or not name:
+            raise HTTPError(400, "'wordlist' must be a wordlist name")
+        wordlist = (await self.decks.deck(name)).data
+        try:
+            session, state = await self._in_session_thread(self._create_session, mode, wordlist, data)
+        except SessionError as e:
+            raise HTTPError(400, str(e))
+        session_id = self.sessions.add(session)
+        response = Response.json(dict(state, id=session_id), 201)
+        response.headers["Location"] = f"/api/sessions/{session_id}"
+        return response
+
+    def _create_session(self, mode: str, wordlist: Dict, data: Dict):
+        """
+        Start a session and build its deck's answer indexes (on the sessions thread).
+
+        Returns:
+            (session, its first state)
+        """
+        if mode == "test":
+            session = TestSession(wordlist, data, record=self.record_history)
+        else:
+            session = MemorizeSession(wordlist, data, record=self.record_history)
+        # Built here once per deck instead of by the first wrong answer
+        AnswerMatcher.for_pairs(wordlist["pairs"]).prepare_suggestions()
+        return session, session.state()
+
+    async def _in_session_thread(self, function, *args):
+        """Run a session call on the sessions thread and wait for it."""
+        return await asyncio.get_running_loop().run_in_executor(self.session_executor, function, *args)
+
+    @staticmethod
+    def _allow(method: str, *allowed: str):
+        """Raise a 405 HTTPError unless the method is allowed."""
+        if method not in allowed:
+            raise HTTPError(405, "method not allowed", {"Allow": ", ".join(allowed)})
+
+    def _handle_static(self, request: Request) -> Response:
+        """Serve a file of the web app or a wordlist file."""
+        relative = unquote(request.path).lstrip("/") or "index.html"
+        path = (self.root / relative).resolve()
+        suffix = path.suffix.lower()
+        if path.parent == self.root:
+            allowed = suffix in STATIC_TYPES
+        else:
+            allowed = suffix == ".json" and self.wordlists_dir in path.parents
+        if not allowed:
+            raise HTTPError(404, "not found")
+        try:
+            stat = path.stat()
+        except OSError:
+            raise HTTPError(404, "not found")
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._static.get(path)
+        if cached is None or cached.version != version:
+            try:
+                cached = Encoded(path.read_bytes(), STATIC_TYPES[suffix], version)
+            except OSError:
+                raise HTTPError(404, "not found")
+        remember(self._static, path, cached, self.MAX_STATIC_FILES)
+        return cached.response(request)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer the requests of one connection until either side closes it."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(Response.json({"error": "request head too large"}, 431).encode(False))
+                    break
+
+                started = time.perf_counter()
+                try:
+                    request = self._parse_head(head)
+                    length = content_length(request)
+                except HTTPError as e:
+                    writer.write(Response.json({"error": e.message}, e.status).encode(False))
+                    break
+                if length:
+                    request.body = await reader.readexactly(length)
+
+                response = await self.handle(request)
+                keep_alive = request.keep_alive
+                writer.write(response.encode(keep_alive, head_only=request.method == "HEAD"))
+                await writer.drain()
+                if self.log:
+                    print(f"{request.method} {request.path} {response.status} "
+                          f"{(time.perf_counter() - started) * 1000:.3f} ms", file=sys.stderr)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Request:
+        """Parse the request line and headers."""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        if not version.startswith("HTTP/1."):
+            raise HTTPError(505, "only HTTP/1.x is supported")
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, colon, value = line.partition(":")
+            if not colon:
+                raise HTTPError(400, "malformed header")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise HTTPError(501, "chunked request bodies are not supported")
+        return Request(method.upper(), urlsplit(target).path, version, headers)
+
+
+async def serve(host: str, port: int, record_history: bool = True, log: bool = False):
+    """Run the server until it is interrupted."""
+    server = FlashcardServer(record_history=record_history, log=log)
+    listener = await server.start(host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Serving flashcards on http://{address[0]}:{address[1]}/ (Ctrl+C to stop)")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    """Run the server from the command line."""
+    parser = argparse.ArgumentParser(prog=prog, description="Serve the web app and the flashcards JSON API")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="don't add session answers to the answer history (e.g. for load tests)")
+    parser.add_argument("--log", action="store_true", help="write one line per request to stderr")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, not args.no_history, args.log))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+        return 130
+    except OSError as e:
+        print(f"❌ Could not start the server: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
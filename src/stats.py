@@ -0,0 +1,102 @@
+"""
+Stats Command
+Shows how well each card is known, from the answers recorded in Learn and Test mode.
+
+Usage:
+    python src/main.py stats                          # weakest cards of every wordlist
+    python src/main.py stats --wordlist NAME --days 30
+    python src/main.py stats --sort asked --limit 50 --json
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List
+from colors import Colors
+
+# Orders cards can be sorted by (see history_store.STATS_ORDERS)
+SORTS = ("accuracy", "asked", "latency", "recent")
+
+
+def print_stats(totals: Dict, cards: List[Dict], show_wordlist: bool, period: str):
+    """Print the totals and the card table for people."""
+    print(Colors.banner(f"       ANSWER HISTORY ({period})"))
+    if not totals["answers"]:
+        print(Colors.yellow("No answers recorded yet. Practice in Learn or Test mode first."))
+        print(Colors.rule())
+        return
+    accuracy = totals["correct"] / totals["answers"] * 100
+    print(f"{Colors.bold('Sessions:')} {totals['sessions']}   "
+          f"{Colors.bold('Answers:')} {totals['answers']}   "
+          f"{Colors.bold('Cards:')} {totals['cards']}   "
+          f"{Colors.bold('Accuracy:')} {Colors.cyan(f'{accuracy:.1f}%')}")
+    print(Colors.rule())
+    print(Colors.bold(f"{'Accuracy':>8} {'Asked':>6} {'Time':>7}  Card"))
+    for card in cards:
+        percent = card["accuracy"] * 100
+        if percent >= 90:
+            color = Colors.green
+        elif percent >= 70:
+            color = Colors.yellow
+        else:
+            color = Colors.red
+        where = f"  {Colors.cyan(card['wordlist'])}" if show_wordlist else ""
+        print(f"{color(f'{percent:>7.0f}%')} {card['asked']:>6} {card['mean_latency']:>6.1f}s  "
+              f"{Colors.blue(card['word'])} → {card['meaning']}{where}")
+    print(Colors.rule())
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the options of the stats command to a parser."""
+    parser.add_argument("--wordlist", help="only this wordlist (as shown in the wordlist menu)")
+    parser.add_argument("--days", type=float, help="only answers from the last DAYS days (default: all time)")
+    parser.add_argument("--sort", choices=SORTS, default="accuracy",
+                        help="order of the cards (default: accuracy, weakest first)")
+    parser.add_argument("--limit", type=int, default=20, help="cards to show (0 for all, default: 20)")
+    parser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Show the answer history statistics.
+
+    Args:
+        args: Parsed options (see add_arguments)
+
+    Returns:
+        Exit code: 0, or 1 if the history can't be read
+    """
+    # Only this command needs SQLite, so it isn't imported before it runs
+    import sqlite3
+    from history_store import HistoryStore
+
+    since = time.time() - args.days * 86400 if args.days is not None else None
+    try:
+        store = HistoryStore()
+        try:
+            totals = store.totals(args.wordlist, since)
+            cards = store.card_stats(args.wordlist, since, args.sort, args.limit or None)
+        finally:
+            store.close()
+    except (sqlite3.Error, OSError) as e:
+        print(Colors.red(f"❌ Could not read the answer history: {e}"), file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({"wordlist": args.wordlist, "since": since, "totals": totals, "cards": cards},
+                         ensure_ascii=False, indent=2))
+    else:
+        period = f"last {args.days:g} days" if args.days is not None else "all time"
+        print_stats(totals, cards, args.wordlist is None, period)
+    return 0
+
+
+def main(argv=None) -> int:
+    """Show the answer history statistics from the command line."""
+    parser = argparse.ArgumentParser(prog="stats", description="Show per-card accuracy from the answer history")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
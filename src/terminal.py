@@ -0,0 +1,104 @@
+"""
+Terminal Module
+Helpers for writing large blocks of text to the terminal: display width of
+wide (CJK) characters, padding by display width, and paging.
+"""
+import os
+import shutil
+import sys
+import unicodedata
+
+
+def display_width(text: str) -> int:
+    """
+    Get the number of terminal columns a string occupies.
+
+    East Asian wide and fullwidth characters (Korean, Chinese, Japanese) take
+    two columns and combining marks take none.
+
+    Args:
+        text: Text without escape codes
+
+    Returns:
+        Width in columns
+    """
+    # Nothing below U+0300 (where combining marks start) is wide or zero-width
+    if max(text, default=' ') < '\u0300':
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+    return width
+
+
+def pad_to_width(text: str, width: int) -> str:
+    """
+    Left-align text in a column of the given display width.
+
+    Args:
+        text: Text without escape codes
+        width: Column width in terminal columns
+
+    Returns:
+        Text followed by enough spaces to fill the column
+    """
+    return text + " " * (width - display_width(text))
+
+
+def fit_to_width(text: str, width: int) -> str:
+    """
+    Cut or pad text to exactly the given display width.
+
+    Args:
+        text: Text without escape codes
+        width: Column width in terminal columns
+
+    Returns:
+        Text that fills the column without overflowing it
+    """
+    if max(text, default=' ') < '\u0300':
+        return text[:width].ljust(width)
+    used = 0
+    chars = []
+    for char in text:
+        char_width = 0 if unicodedata.combining(char) else display_width(char)
+        if used + char_width > width:
+            break
+        chars.append(char)
+        used += char_width
+    return "".join(chars) + " " * (width - used)
+
+
+def terminal_height() -> int:
+    """Get the number of rows of the terminal (24 if unknown)."""
+    return shutil.get_terminal_size((80, 24)).lines
+
+
+def write_paged(text: str) -> bool:
+    """
+    Write text to stdout, through a pager if it doesn't fit on the screen.
+
+    The pager is $PAGER, or "less -R" so colors are kept. Output that isn't
+    going to a terminal, or that fits on it, is written in one call.
+
+    Args:
+        text: Text to show (may contain ANSI color codes)
+
+    Returns:
+        True if a pager was used (the user already closed it)
+    """
+    if sys.stdout.isatty() and text.count("\n") >= terminal_height():
+        pager = os.environ.get("PAGER") or ("less -R" if shutil.which("less") else None)
+        if pager:
+            import subprocess  # only needed for paging, so not at startup
+            sys.stdout.flush()
+            try:
+                subprocess.run(pager, shell=True, input=text, encoding="utf-8", check=False)
+                return True
+            except OSError:
+                pass
+    sys.stdout.write(text)
+    sys.stdout.flush()
+    return False
@@ -0,0 +1,243 @@
+"""
+Test Generator Module
+Generates tests (which cards, in which direction) from a deck, reproducibly
+from a seed, and writes batches of them out as exam sheets.
+"""
+import csv
+import hashlib
+import random
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Test directions, as chosen in the test mode menu
+TEST_DIRECTIONS = ("word-to-meaning", "meaning-to-word", "random")
+
+# Turns the text of a binary number into one 0/1 byte per digit
+_BITS_TO_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def deck_fingerprint(pairs: Sequence) -> str:
+    """
+    Get a short hash of the words and meanings of a deck, in order.
+
+    Exported question ids carry it, so answers to an exam aren't graded
+    against a deck whose cards were added, removed or reordered since.
+
+    Args:
+        pairs: Pairs of the deck (a PairStore or a sequence of pairs)
+
+    Returns:
+        8 hex digits
+    """
+    if hasattr(pairs, "words"):
+        words, meanings = pairs.words, pairs.meanings
+    else:
+        words, meanings = [pair["word"] for pair in pairs], [pair["meaning"] for pair in pairs]
+    digest = hashlib.blake2b(digest_size=4)
+    for column in (words, meanings):
+        digest.update("\x1e".join(column).encode("utf-8", "surrogatepass"))
+        digest.update(b"\x1d")
+    return digest.hexdigest()
+
+
+def question_id(card: int, word_to_meaning: bool, deck: Optional[str] = None) -> str:
+    """
+    Build the id of a question: its direction ("w" shows the word, "m" the
+    meaning) followed by the card's index in the deck, e.g. "w17", and for
+    exported tests the deck's fingerprint, e.g. "w17@3fa2c1d0".
+
+    Args:
+        card: Index of the card in the deck
+        word_to_meaning: Whether the word is shown and the meaning asked
+        deck: Fingerprint of the deck (see deck_fingerprint()), if any
+
+    Returns:
+        Question id
+    """
+    qid = f"{'w' if word_to_meaning else 'm'}{card}"
+    return f"{qid}@{deck}" if deck else qid
+
+
+def parse_question_id(text: str) -> Tuple[int, bool, Optional[str]]:
+    """
+    Read a question id made by question_id().
+
+    Args:
+        text: Question id, e.g. "w17" or "w17@3fa2c1d0"
+
+    Returns:
+        (card index, word_to_meaning, deck fingerprint or None)
+
+    Raises:
+        ValueError: If the text isn't a question id
+    """
+    qid, _, deck = text.partition("@")
+    if len(qid) < 2 or qid[0] not in "wm" or not qid[1:].isdigit() or (_ and not deck):
+        raise ValueError(f"not a question id: {text!r}")
+    return int(qid[1:]), qid[0] == "w", deck or None
+
+
+class GeneratedTest:
+    """
+    One generated test: the cards asked, and for each whether the word is shown.
+
+    Cards are kept in an array of deck indices and directions in a bytes
+    object (1 = word shown), so a batch of thousands of tests stays small.
+    """
+
+    __slots__ = ("number", "seed", "cards", "directions")
+
+    def __init__(self, number: int, seed: Optional[str], cards: Sequence[int], directions: bytes):
+        """
+        Initialize a test.
+
+        Args:
+            number: Position of the test in its batch (from 1)
+            seed: Seed the test was generated from (None if unseeded)
+            cards: Deck indices of the questions, in order
+            directions: One byte per question, 1 if the word is shown
+        """
+        self.number = number
+        self.seed = seed
+        self.cards = cards
+        self.directions = directions
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __iter__(self) -> Iterator[Tuple[int, bool]]:
+        """Iterate over (card index, word_to_meaning) in question order."""
+        return zip(self.cards, map(bool, self.directions))
+
+
+class TestGenerator:
+    """
+    Generates tests for a deck.
+
+    Every test is drawn from its own random generator. With a seed, test n of
+    a batch is seeded from (seed, n), so any single test can be regenerated
+    without the ones before it, and the same seed always gives the same batch.
+    """
+
+    def __init__(self, card_count: int, seed: Optional[int] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            card_count: Number of cards in the deck
+            seed: Seed for reproducible tests (random tests if None)
+        """
+        self.card_count = card_count
+        self.seed = seed
+        self._generated = 0
+
+    def generate(self, num_questions: int, direction: str,
+                 number: Optional[int] = None) -> GeneratedTest:
+        """
+        Generate one test with distinct cards.
+
+        Args:
+            num_questions: Number of questions (at most card_count)
+            direction: One of TEST_DIRECTIONS
+            number: Position in the batch (the next one if None)
+
+        Returns:
+            GeneratedTest
+        """
+        if number is None:
+            number = self._generated + 1
+        self._generated = max(self._generated, number)
+        seed = None if self.seed is None else f"{self.seed}/{number}"
+        rng = random.Random(seed)
+        cards = rng.sample(range(self.card_count), num_questions)
+        return GeneratedTest(number, seed, cards, self.directions(num_questions, direction, rng))
+
+    def generate_many(self, count: int, num_questions: int, direction: str) -> Iterator[GeneratedTest]:
+        """
+        Generate a batch of tests, one at a time.
+
+        Args:
+            count: Number of tests
+            num_questions: Questions per test
+            direction: One of TEST_DIRECTIONS
+
+        Returns:
+            Iterator over tests numbered 1 to count
+        """
+        for number in range(1, count + 1):
+            yield self.generate(num_questions, direction, number)
+
+    @staticmethod
+    def directions(num_questions: int, direction: str, rng: Optional[random.Random] = None) -> bytes:
+        """
+        Choose the direction of every question.
+
+        Args:
+            num_questions: Number of questions
+            direction: One of TEST_DIRECTIONS
+            rng: Random generator for "random" (module-level random if None)
+
+        Returns:
+            One byte per question, 1 if the word is shown
+        """
+        if direction == "word-to-meaning":
+            return b"\x01" * num_questions
+        if direction == "meaning-to-word":
+            return bytes(num_questions)
+        if direction != "random":
+            raise ValueError(f"unknown test direction: {direction!r}")
+        if not num_questions:
+            return b""
+        # All coin flips at once, as the digits of one random number
+        bits = (rng or random).getrandbits(num_questions)
+        return format(bits, f"0{num_questions}b").encode("ascii").translate(_BITS_TO_BYTES)
+
+
+def export_exam_sheets(pairs: Sequence, tests: Iterator[GeneratedTest], directory: Path,
+                       title: str) -> List[Path]:
+    """
+    Write a question sheet and an answer sheet for every test, plus one answer
+    key (CSV) covering the whole batch. Question ids carry the deck's
+    fingerprint, so grading can tell answers to an older version of the deck.
+
+    Args:
+        pairs: Pairs of the deck the tests were generated from
+        tests: Tests to write
+        directory: Output directory (created if needed)
+        title: Title printed on every sheet, e.g. the wordlist name
+
+    Returns:
+        Paths of the written files, the answer key first
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    key_path = directory / "answer_key.csv"
+    written = [key_path]
+    deck = deck_fingerprint(pairs)
+
+    with open(key_path, "w", encoding="utf-8", newline="") as key_file:
+        key = csv.writer(key_file)
+        key.writerow(["test", "number", "question_id", "direction", "question", "answer"])
+        for test in tests:
+            stem = directory / f"test_{test.number:04}"
+            question_lines = [f"{title} - Test {test.number}", "", "Name: ______________________", ""]
+            answer_lines = [f"{title} - Test {test.number} - Answers", ""]
+            rows = []
+            for number, (card, word_to_meaning) in enumerate(test, 1):
+                pair = pairs[card]
+                if word_to_meaning:
+                    shown, answer, label = pair.word, pair.meaning, "Word → Meaning"
+                else:
+                    shown, answer, label = pair.meaning, pair.word, "Meaning → Word"
+                qid = question_id(card, word_to_meaning, deck)
+                question_lines.append(f"{number:>3}. [{qid}] {label}: {shown}")
+                question_lines.append("     ______________________")
+                answer_lines.append(f"{number:>3}. [{qid}] {shown} → {answer}")
+                rows.append([test.number, number, qid, label, shown, answer])
+            key.writerows(rows)
+
+            for suffix, lines in (("questions", question_lines), ("answers", answer_lines)):
+                path = stem.with_name(f"{stem.name}_{suffix}.txt")
+                path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+                written.append(path)
+    return written
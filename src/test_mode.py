@@ -2,63 +2,218 @@
 Test Mode Module
 Handles the test mode functionality with scoring.
 """
+import json
 import random
-from typing import Dict, List
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
 from colors import Colors
+from console import Console, TerminalConsole
+from grading import AnswerSource, TestSummary, build_result, read_answer_rows
+from history_store import HistoryStore, open_session
+from instrumentation import get_instrumentation
+from test_generator import TestGenerator, deck_fingerprint, export_exam_sheets, parse_question_id
+from answer_matcher import AnswerMatcher, CLOSE, INCORRECT, suggestion_text
+from wordlist_stream import PairStream
+
+# Close and wrong answers of a graded batch kept for display, each
+BATCH_DETAIL_LIMIT = 20
 
 
 class TestMode:
     """Manages the test mode for flashcard assessment."""
     
-    def __init__(self, wordlist: Dict):
+    def __init__(self, wordlist: Dict, console: Optional[Console] = None, seed: Optional[int] = None,
+                 history: Optional[HistoryStore] = None):
         """
         Initialize test mode with a wordlist.
         
         Args:
             wordlist: Dictionary containing word pairs
+            console: Console for prompts and output (the terminal if None)
+            seed: Seed for reproducible tests (random tests if None)
+            history: Store answers are recorded to (the default one if None)
         """
+        self.console = console or TerminalConsole()
+        self.trace = get_instrumentation()
+        self.history = history
         self.wordlist = wordlist
         self.pairs = wordlist["pairs"]
-        self.max_questions = min(100, len(self.pairs))
+        self.streaming = isinstance(self.pairs, PairStream)
+        # Streamed pairs aren't indexed, so their answers are normalized as they come
+        self.matcher = AnswerMatcher() if self.streaming else AnswerMatcher.for_pairs(self.pairs)
+        # The size of a streamed wordlist is unknown until it has been read
+        self.max_questions = None if self.streaming else len(self.pairs)
+        self.generator = TestGenerator(0 if self.streaming else len(self.pairs), seed)
     
     def start(self):
         """Start the test mode."""
-        print("\n" + Colors.cyan("="*50))
-        print(Colors.bold_cyan("              TEST MODE"))
-        print(Colors.cyan("="*50))
+        self.console.print(Colors.banner("              TEST MODE"))
         
         # Select test direction mode
         test_mode = self._select_test_mode()
         if test_mode is None:
             return
+        if test_mode == "export":
+            self._export_exams()
+            return
         
         # Get number of questions
         num_questions = self._get_question_count()
         if num_questions is None:
             return
         
-        # Run the test
+        self.run(num_questions, test_mode)
+    
+    def run(self, num_questions: int, test_mode: str, wait: bool = True) -> TestSummary:
+        """
+        Take a test and show its results.
+        
+        Args:
+            num_questions: Number of questions to ask
+            test_mode: Test direction ('word-to-meaning', 'meaning-to-word', or 'random')
+            wait: Wait for Enter after the results
+        
+        Returns:
+            TestSummary of the answers
+        """
         results = self._run_test(num_questions, test_mode)
         
-        # Display results
-        self._display_results(results, num_questions, test_mode)
+        # Display results (a streamed wordlist may have fewer pairs than requested)
+        summary = TestSummary.from_results(results)
+        self.display_results(summary, test_mode, wait)
+        return summary
+    
+    def export_exams(self, directory: Path, count: int, num_questions: int,
+                     test_mode: str, seed: int) -> List[Path]:
+        """
+        Generate a batch of tests and write them out as exam sheets.
+        
+        Args:
+            directory: Output directory (created if needed)
+            count: Number of tests (one per student)
+            num_questions: Questions per test
+            test_mode: Test direction ('word-to-meaning', 'meaning-to-word', or 'random')
+            seed: Seed the tests are generated from
+        
+        Returns:
+            Paths of the written files, the answer key first
+        
+        Raises:
+            ValueError: If the wordlist is streamed
+            OSError: If the sheets can't be written
+        """
+        if self.streaming:
+            raise ValueError("exam sheets need the whole wordlist in memory")
+        generator = TestGenerator(len(self.pairs), seed)
+        tests = generator.generate_many(count, num_questions, test_mode)
+        return export_exam_sheets(self.pairs, tests, directory, self.wordlist["name"])
+    
+    def grade_batch(self, answers: AnswerSource, report: Optional[TextIO] = None,
+                    shard: int = 0, shards: int = 1,
+                    detail_limit: Optional[int] = BATCH_DETAIL_LIMIT) -> TestSummary:
+        """
+        Grade submitted answers against the wordlist in a single pass.
+        
+        Rows are read, graded and reported one at a time, so memory use
+        doesn't grow with the number of answers. Question ids must carry the
+        fingerprint of the deck as it is now; rows exported from another
+        version of it are counted as invalid instead of being graded against
+        whatever card has the same index today. Large batches can be split
+        across processes: each grades the rows whose position modulo shards
+        is its shard, and the returned summaries are merged afterwards.
+        
+        Args:
+            answers: CSV file, stream or iterable of (question_id, answer) rows,
+                with question ids as written in the exam answer key (e.g. "w17@3fa2c1d0")
+            report: Stream to write one JSON line per graded row to (none if None)
+            shard: Shard of the rows to grade (from 0)
+            shards: Number of shards the rows are split into
+            detail_limit: Close and wrong answers kept for display, each (all if None)
+        
+        Returns:
+            TestSummary of the graded rows
+        
+        Raises:
+            ValueError: If the wordlist is streamed or the shard is out of range
+        """
+        if self.streaming:
+            raise ValueError("batch grading needs the whole wordlist in memory")
+        if not 0 <= shard < shards:
+            raise ValueError(f"shard {shard} is not in 0-{shards - 1}")
+        
+        summary = TestSummary(detail_limit)
+        card_count = len(self.pairs)
+        fingerprint = deck_fingerprint(self.pairs)
+        for row_number, (qid, user_answer, extra) in enumerate(read_answer_rows(answers), 1):
+            if (row_number - 1) % shards != shard:
+                continue
+            try:
+                card, is_word_to_meaning, deck = parse_question_id(qid)
+            except ValueError:
+                card = deck = None
+            wrong_deck = deck is not None and deck != fingerprint
+            if card is None or deck is None or wrong_deck or card >= card_count:
+                summary.add_invalid(wrong_deck)
+                if report is not None:
+                    self._write_report_line(report, row_number, qid, user_answer,
+                                            "wrong deck" if wrong_deck else "invalid", None, extra)
+                continue
+            
+            pair = self.pairs[card]
+            answer_field = "meaning" if is_word_to_meaning else "word"
+            user_answer = user_answer.strip()
+            outcome = self.matcher.check(user_answer, card, answer_field)
+            is_correct = outcome != INCORRECT
+            is_close = outcome == CLOSE
+            if summary.wants_detail(is_correct, is_close):
+                suggestion = None
+                if not is_correct:
+                    other_index = self.matcher.suggest(user_answer, answer_field, card)
+                    if other_index is not None:
+                        suggestion = suggestion_text(self.pairs[other_index], answer_field)
+                summary.add(build_result(row_number, pair, is_word_to_meaning,
+                                         user_answer, outcome, suggestion))
+            else:
+                summary.count(is_correct, is_close)
+            if report is not None:
+                self._write_report_line(report, row_number, qid, user_answer, outcome,
+                                        pair[answer_field], extra)
+        return summary
+    
+    @staticmethod
+    def _write_report_line(report: TextIO, row_number: int, qid: str, user_answer: str,
+                           outcome: str, expected: Optional[str], extra: Dict[str, str]):
+        """Write the grading of one submitted row as a JSON line."""
+        record = {"row": row_number, "question_id": qid, "answer": user_answer,
+                  "result": outcome, "expected": expected}
+        record.update(extra)
+        report.write(json.dumps(record, ensure_ascii=False) + "\n")
     
-    def _select_test_mode(self) -> str:
+    def _select_test_mode(self, allow_export: bool = True) -> str:
         """
         Prompt user to select test mode.
         
+        Args:
+            allow_export: Offer exporting exam sheets instead of taking a test
+        
         Returns:
-            Test mode string ('word-to-meaning', 'meaning-to-word', 'random') or None if cancelled
+            Test mode string ('word-to-meaning', 'meaning-to-word', 'random'),
+            'export', or None if cancelled
         """
+        back = "5" if allow_export else "4"
         while True:
-            print(f"\n{Colors.bold('Select Test Direction:')}")
-            print(f"  {Colors.yellow('1.')} Word → Meaning (you see the word, type the meaning)")
-            print(f"  {Colors.yellow('2.')} Meaning → Word (you see the meaning, type the word)")
-            print(f"  {Colors.yellow('3.')} Random (questions in random directions)")
-            print(f"  {Colors.yellow('4.')} Back to menu")
-            print(Colors.cyan("="*50))
+            self.console.print(f"\n{Colors.bold('Select Test Direction:')}")
+            self.console.print(f"  {Colors.yellow('1.')} Word → Meaning (you see the word, type the meaning)")
+            self.console.print(f"  {Colors.yellow('2.')} Meaning → Word (you see the meaning, type the word)")
+            self.console.print(f"  {Colors.yellow('3.')} Random (questions in random directions)")
+            if allow_export:
+                self.console.print(f"  {Colors.yellow('4.')} Export exam sheets (a batch of printable tests)")
+            self.console.print(f"  {Colors.yellow(back + '.')} Back to menu")
+            self.console.print(Colors.rule())
             
-            choice = input(Colors.magenta("\nYour choice: ")).strip().lower()
+            choice = self.console.input(Colors.magenta("\nYour choice: ")).strip().lower()
             
             if choice == "1":
                 return "word-to-meaning"
@@ -66,10 +221,12 @@ class TestMode:
                 return "meaning-to-word"
             elif choice == "3":
                 return "random"
-            elif choice == "4" or choice == "back":
+            elif choice == "4" and allow_export:
+                return "export"
+            elif choice == back or choice == "back":
                 return None
             else:
-                print(Colors.red("Invalid choice. Please enter 1, 2, 3, or 4."))
+                self.console.print(Colors.red(f"Invalid choice. Please enter a number from 1 to {back}."))
     
     def _get_question_count(self) -> int:
         """
@@ -79,22 +236,73 @@ class TestMode:
             Number of questions or None if cancelled
         """
         while True:
-            print(f"\nWordlist size: {Colors.cyan(str(len(self.pairs)))} words")
-            print(f"Maximum questions: {Colors.cyan(str(self.max_questions))}")
+            if self.streaming:
+                self.console.print(f"\nWordlist size: {Colors.cyan('streamed')} (counted while testing)")
+            else:
+                self.console.print(f"\nWordlist size: {Colors.cyan(str(len(self.pairs)))} words")
             
-            user_input = input(Colors.magenta(f"\nHow many questions (1-{self.max_questions}, or 'back' to cancel)? ")).strip()
+            limit = f"1-{self.max_questions}" if self.max_questions is not None else "at least 1"
+            user_input = self.console.input(Colors.magenta(f"\nHow many questions ({limit}, or 'back' to cancel)? ")).strip()
             
             if user_input.lower() == "back":
                 return None
             
             try:
                 num = int(user_input)
-                if 1 <= num <= self.max_questions:
+                if 1 <= num and (self.max_questions is None or num <= self.max_questions):
                     return num
                 else:
-                    print(Colors.red(f"Please enter a number between 1 and {self.max_questions}."))
+                    self.console.print(Colors.red(f"Please enter a number ({limit})."))
             except ValueError:
-                print(Colors.red("Invalid input. Please enter a number."))
+                self.console.print(Colors.red("Invalid input. Please enter a number."))
+    
+    def _export_exams(self):
+        """Generate a batch of tests and write them out as exam sheets."""
+        if self.streaming:
+            self.console.print(Colors.red("Exam sheets need the whole wordlist in memory; take a test instead."))
+            return
+        
+        direction = self._select_test_mode(allow_export=False)
+        if direction is None:
+            return
+        num_questions = self._get_question_count()
+        if num_questions is None:
+            return
+        
+        while True:
+            user_input = self.console.input(Colors.magenta("\nHow many tests (one per student)? ")).strip()
+            if user_input.lower() == "back":
+                return
+            if user_input.isdigit() and int(user_input) >= 1:
+                count = int(user_input)
+                break
+            self.console.print(Colors.red("Please enter a number of at least 1."))
+        
+        while True:
+            user_input = self.console.input(Colors.magenta("Seed (blank for a new one): ")).strip()
+            if not user_input:
+                seed = random.randrange(1000000)
+                break
+            try:
+                seed = int(user_input)
+                break
+            except ValueError:
+                self.console.print(Colors.red("Invalid input. Please enter a number."))
+        
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.wordlist["name"])
+        default_dir = Path("exams") / f"{safe_name}_seed{seed}"
+        user_input = self.console.input(Colors.magenta(f"Output folder [{default_dir}]: ")).strip()
+        directory = Path(user_input) if user_input else default_dir
+        
+        try:
+            written = self.export_exams(directory, count, num_questions, direction, seed)
+        except OSError as e:
+            self.console.print(Colors.red(f"❌ Could not write the exam sheets: {e}"))
+            return
+        
+        self.console.print(Colors.bold_green(f"\n✓ Wrote {count} tests of {num_questions} questions to {directory}"))
+        self.console.print(f"  Answer key: {Colors.cyan(str(written[0]))}")
+        self.console.print(f"  Seed: {Colors.cyan(str(seed))} (the same seed gives the same tests)")
     
     def _run_test(self, num_questions: int, test_mode: str) -> List[Dict]:
         """
@@ -107,83 +315,97 @@ class TestMode:
         Returns:
             List of result dictionaries
         """
-        # Select random unique pairs
-        test_pairs = random.sample(self.pairs, num_questions)
-        results = []
-        
-        mode_display = {
-            "word-to-meaning": "Word → Meaning",
-            "meaning-to-word": "Meaning → Word",
-            "random": "Random Direction"
-        }
-        
-        print(f"\n{Colors.cyan('='*50)}")
-        print(Colors.bold_cyan(f"  TEST STARTED - {num_questions} questions"))
-        print(Colors.bold(f"  Mode: {Colors.blue(mode_display[test_mode])}"))
-        print(f"{Colors.cyan('='*50)}\n")
-        
-        for i, pair in enumerate(test_pairs, 1):
-            # Determine question direction based on test mode
-            if test_mode == "word-to-meaning":
-                is_word_to_meaning = True
-            elif test_mode == "meaning-to-word":
-                is_word_to_meaning = False
-            else:  # random
-                is_word_to_meaning = random.choice([True, False])
-            
-            if is_word_to_meaning:
-                question = pair["word"]
-                correct_answer = pair["meaning"]
-                question_type = "Word → Meaning"
+        self.trace.start_session("test", self.wordlist, direction=test_mode, questions=num_questions)
+        with open_session("test", self.wordlist["name"], test_mode, self.history) as recorder:
+            # Select random unique pairs and the direction of every question
+            if self.streaming:
+                # Drawn lazily so the first question appears before the file is fully read
+                test_pairs = ((None, pair) for pair in islice(self.pairs.shuffled(), num_questions))
+                directions = self.generator.directions(num_questions, test_mode)
             else:
-                question = pair["meaning"]
-                correct_answer = pair["word"]
-                question_type = "Meaning → Word"
+                test = self.generator.generate(num_questions, test_mode)
+                test_pairs = ((index, self.pairs[index]) for index in test.cards)
+                directions = test.directions
+            results = []
             
-            print(Colors.yellow(f"Question {i}/{num_questions}"))
-            print(f"{Colors.bold(question_type)}: {Colors.blue(question)}")
-            user_answer = input(Colors.magenta("Your answer: ")).strip()
+            mode_display = {
+                "word-to-meaning": "Word → Meaning",
+                "meaning-to-word": "Meaning → Word",
+                "random": "Random Direction"
+            }
             
-            # Check answer (case-insensitive)
-            is_correct = user_answer.lower() == correct_answer.lower()
+            self.console.print(f"\n{Colors.rule()}")
+            self.console.print(Colors.bold_cyan(f"  TEST STARTED - {num_questions} questions"))
+            self.console.print(Colors.bold(f"  Mode: {Colors.blue(mode_display[test_mode])}"))
+            self.console.print(f"{Colors.rule()}\n")
             
-            results.append({
-                "question_number": i,
-                "question": question,
-                "question_type": question_type,
-                "user_answer": user_answer,
-                "correct_answer": correct_answer,
-                "is_correct": is_correct,
-                "word": pair["word"],
-                "meaning": pair["meaning"]
-            })
+            for i, ((pair_index, pair), is_word_to_meaning) in enumerate(zip(test_pairs, directions), 1):
+                if is_word_to_meaning:
+                    question = pair["word"]
+                    correct_answer = pair["meaning"]
+                    answer_field = "meaning"
+                    question_type = "Word → Meaning"
+                else:
+                    question = pair["meaning"]
+                    correct_answer = pair["word"]
+                    answer_field = "word"
+                    question_type = "Meaning → Word"
+                self.trace.lap("select")
+                
+                self.console.print(Colors.yellow(f"Question {i}/{num_questions}"))
+                self.console.print(f"{Colors.bold(question_type)}: {Colors.blue(question)}")
+                asked_at = time.perf_counter()
+                user_answer = self.trace.ask(self.console, Colors.magenta("Your answer: ")).strip()
+                latency = time.perf_counter() - asked_at
+                
+                # Check answer (normalized, case-insensitive, small typos count as close)
+                suggestion = None
+                if pair_index is None:
+                    outcome = self.matcher.check_text(user_answer, correct_answer)
+                else:
+                    outcome = self.matcher.check(user_answer, pair_index, answer_field)
+                    if outcome == INCORRECT:
+                        other_index = self.matcher.suggest(user_answer, answer_field, pair_index)
+                        if other_index is not None:
+                            suggestion = suggestion_text(self.pairs[other_index], answer_field)
+                self.trace.lap("check")
+                
+                results.append(build_result(i, pair, is_word_to_meaning, user_answer, outcome, suggestion))
+                recorder.record(pair["word"], pair["meaning"], answer_field, outcome, latency)
+                
+                self.console.print()  # Empty line for readability
+                self.trace.question(card=pair_index, direction=answer_field, result=outcome)
             
-            print()  # Empty line for readability
-        
+        self.trace.end_session(self.console)
+        if recorder.error:
+            self.console.print(Colors.red(f"Answers couldn't be added to your history: {recorder.error}"))
         return results
     
-    def _display_results(self, results: List[Dict], total_questions: int, test_mode: str):
+    def display_results(self, summary: TestSummary, test_mode: str, wait: bool = True):
         """
         Display test results with score and wrong answers.
         
         Args:
-            results: List of result dictionaries
-            total_questions: Total number of questions
-            test_mode: Test direction that was used
+            summary: Summary of the answers
+            test_mode: Test direction that was used, or "batch" for graded answers
+            wait: Wait for Enter before returning
         """
         mode_display = {
             "word-to-meaning": "Word → Meaning",
             "meaning-to-word": "Meaning → Word",
-            "random": "Random Direction"
+            "random": "Random Direction",
+            "batch": "Batch Grading"
         }
         
-        correct_count = sum(1 for r in results if r["is_correct"])
-        percentage = (correct_count / total_questions) * 100
+        correct_count = summary.correct
+        total_questions = summary.total
+        close_answers = summary.close_answers
+        percentage = summary.percentage
         
-        print("\n" + Colors.cyan("="*50))
-        print(Colors.bold_cyan("              TEST RESULTS"))
-        print(Colors.bold(f"       Mode: {Colors.blue(mode_display[test_mode])}"))
-        print(Colors.cyan("="*50))
+        self.console.print("\n" + Colors.rule())
+        self.console.print(Colors.bold_cyan("              TEST RESULTS"))
+        self.console.print(Colors.bold(f"       Mode: {Colors.blue(mode_display[test_mode])}"))
+        self.console.print(Colors.rule())
         
         # Determine color based on percentage
         if percentage >= 90:
@@ -193,27 +415,56 @@ class TestMode:
         else:
             score_color = Colors.red
         
-        print(f"\n{Colors.bold('Score:')} {score_color(f'{correct_count}/{total_questions}')}")
-        print(f"{Colors.bold('Percentage:')} {score_color(f'{percentage:.1f}%')}")
+        self.console.print(f"\n{Colors.bold('Score:')} {score_color(f'{correct_count}/{total_questions}')}")
+        self.console.print(f"{Colors.bold('Percentage:')} {score_color(f'{percentage:.1f}%')}")
+        if summary.close:
+            self.console.print(f"{Colors.bold('Accepted with typos:')} {Colors.yellow(str(summary.close))}")
+        unknown = summary.invalid - summary.wrong_deck
+        if unknown:
+            self.console.print(f"{Colors.bold('Not graded (unknown question):')} {Colors.red(str(unknown))}")
+        if summary.wrong_deck:
+            self.console.print(f"{Colors.bold('Not graded (exported from another version of the deck):')} "
+                               f"{Colors.red(str(summary.wrong_deck))}")
+        
+        if close_answers:
+            self.console.print(f"\n{Colors.rule()}")
+            self.console.print(Colors.bold_yellow(f"  CLOSE ANSWERS ({summary.close})"))
+            self.console.print(f"{Colors.rule()}\n")
+            
+            for result in close_answers:
+                self.console.print(Colors.yellow(f"Question {result['question_number']}:"))
+                self.console.print(f"  Your answer: {Colors.yellow(result['user_answer'])}")
+                self.console.print(f"  Correct spelling: {Colors.green(result['correct_answer'])}")
+                self.console.print()
+            self._print_omitted(summary.close - len(close_answers))
         
         # Display wrong answers
-        wrong_answers = [r for r in results if not r["is_correct"]]
+        wrong_answers = summary.wrong_answers
         
         if wrong_answers:
-            print(f"\n{Colors.cyan('='*50)}")
-            print(Colors.bold_red(f"  INCORRECT ANSWERS ({len(wrong_answers)})"))
-            print(f"{Colors.cyan('='*50)}\n")
+            self.console.print(f"\n{Colors.rule()}")
+            self.console.print(Colors.bold_red(f"  INCORRECT ANSWERS ({summary.incorrect})"))
+            self.console.print(f"{Colors.rule()}\n")
             
             for result in wrong_answers:
-                print(Colors.yellow(f"Question {result['question_number']}:"))
-                print(f"  Asked: {Colors.cyan(result['question_type'])} - {Colors.blue(result['question'])}")
-                print(f"  Your answer: {Colors.red(result['user_answer'])}")
-                print(f"  Correct answer: {Colors.green(result['correct_answer'])}")
-                print(f"  [Word: '{Colors.cyan(result['word'])}' = Meaning: '{Colors.cyan(result['meaning'])}']")
-                print()
-        else:
-            print(Colors.bold_green("\n🎉 Perfect score! All answers correct!"))
+                self.console.print(Colors.yellow(f"Question {result['question_number']}:"))
+                self.console.print(f"  Asked: {Colors.cyan(result['question_type'])} - {Colors.blue(result['question'])}")
+                self.console.print(f"  Your answer: {Colors.red(result['user_answer'])}")
+                self.console.print(f"  Correct answer: {Colors.green(result['correct_answer'])}")
+                if result['suggestion']:
+                    self.console.print(f"  {Colors.yellow(result['suggestion'])}")
+                self.console.print(f"  [Word: '{Colors.cyan(result['word'])}' = Meaning: '{Colors.cyan(result['meaning'])}']")
+                self.console.print()
+            self._print_omitted(summary.incorrect - len(wrong_answers))
+        elif total_questions:
+            self.console.print(Colors.bold_green("\n🎉 Perfect score! All answers correct!"))
         
-        print(Colors.cyan("="*50))
-        input(Colors.magenta("\nPress Enter to return to main menu..."))
+        self.console.print(Colors.rule())
+        if wait:
+            self.console.input(Colors.magenta("\nPress Enter to return to main menu..."))
+    
+    def _print_omitted(self, count: int):
+        """Note how many answers of a list were left out of a batch summary."""
+        if count > 0:
+            self.console.print(Colors.yellow(f"... and {count} more (see the report for all of them)\n"))
 
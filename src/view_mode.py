@@ -1,87 +1,363 @@
 """
 View Mode Module
-Displays all word pairs in a simple list format.
+Displays all word pairs in a scrollable, searchable list.
 """
-from typing import Dict
+import shutil
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 from colors import Colors
+from console import Console, TerminalConsole
+from search_index import SubstringIndex
+from terminal import display_width, fit_to_width
 import sys
 import os
 
-# Platform-specific imports for key detection
-if os.name == 'nt':  # Windows
-    import msvcrt
-else:  # Unix/Linux/Mac
-    import tty
-    import termios
+# The platform-specific key reading modules (msvcrt, or termios, tty and
+# select) are imported when the scrollable view opens, not at startup
+
+# Escape sequences of the keys the viewer understands
+_KEY_SEQUENCES = {
+    "[A": "up", "[B": "down", "[5~": "pgup", "[6~": "pgdn",
+    "[H": "home", "[F": "end", "[1~": "home", "[4~": "end", "OH": "home", "OF": "end",
+}
+_WINDOWS_KEYS = {"H": "up", "P": "down", "I": "pgup", "Q": "pgdn", "G": "home", "O": "end"}
+
+
+def _sequence_complete(sequence: str) -> bool:
+    """
+    Check whether the characters read after an Escape form a whole key.
+    
+    A CSI sequence ("[" then parameters) ends with a final character from "@"
+    to "~"; an SS3 sequence ("O") is one character long after its introducer.
+    Anything else (e.g. Alt+key) is a single character.
+    
+    Args:
+        sequence: Characters read after the Escape so far
+        
+    Returns:
+        True if no more characters belong to the key
+    """
+    if not sequence:
+        return False
+    if sequence[0] == "[":
+        return len(sequence) > 1 and "@" <= sequence[-1] <= "~"
+    if sequence[0] == "O":
+        return len(sequence) == 2
+    return True
 
 
 class ViewMode:
-    """Manages the view mode for displaying all word pairs."""
+    """
+    Manages the view mode for displaying all word pairs.
+    
+    On a terminal only the rows that fit on the screen are drawn, so memory
+    and drawing time depend on the screen size rather than the deck size.
+    The search index is built the first time "/" is pressed. When input or
+    output isn't a terminal, the whole table is written in one go instead.
+    """
     
-    def __init__(self, wordlist: Dict):
+    # Rows taken by the title, the rule, the column header and the status line
+    CHROME_ROWS = 4
+    
+    def __init__(self, wordlist: Dict, console: Optional[Console] = None):
         """
         Initialize view mode with a wordlist.
         
         Args:
-            wordlist: Dictionary containing word pairs
+            wordlist: Dictionary containing word pairs (a PairStore)
+            console: Console for output (the terminal if None); the scrollable
+                view is only used when it is interactive
         """
+        self.console = console or TerminalConsole()
         self.wordlist = wordlist
         self.pairs = wordlist["pairs"]
+        self.search_index = None
+    
+    def start(self, browse: Optional[bool] = None):
+        """
+        Display all word pairs.
+        
+        Args:
+            browse: Use the scrollable view (only if the console is interactive
+                when None); otherwise the whole table is written at once
+        """
+        if browse is None:
+            browse = self.console.interactive
+        if browse:
+            self._browse()
+            return
+        
+        # Scripts and pipes get the whole table, built in memory and written at once
+        header = "\n".join([
+            Colors.banner("                           VIEW MODE", 70),
+            Colors.yellow(f"Displaying all {len(self.pairs)} word pairs"),
+            Colors.rule(70) + "\n\n",
+        ])
+        self.console.page(header + self._render_table() + "\n" + Colors.rule(70) + "\n")
     
-    def start(self):
-        """Display all word pairs in a list format."""
-        print("\n" + Colors.cyan("="*70))
-        print(Colors.bold_cyan("                           VIEW MODE"))
-        print(Colors.cyan("="*70))
-        print(Colors.yellow(f"Displaying all {len(self.pairs)} word pairs"))
-        print(Colors.cyan("Press Enter or Escape to return to mode selection"))
-        print(Colors.cyan("="*70) + "\n")
-        
-        # Display all pairs in a table format
-        max_word_length = max(len(pair["word"]) for pair in self.pairs)
-        max_meaning_length = max(len(pair["meaning"]) for pair in self.pairs)
+    def _render_table(self) -> str:
+        """
+        Render every pair as one block of text.
+        
+        Returns:
+            Table text ending with a newline
+        """
+        words = self.pairs.words
+        meanings = self.pairs.meanings
+        
+        # Column widths in terminal columns, so Korean and other wide text lines up
+        word_widths = list(map(display_width, words))
+        max_word_length = max(word_widths, default=0)
+        max_meaning_length = max(map(display_width, meanings), default=0)
         num_width = len(str(len(self.pairs)))
         
-        # Print header
+        lines = []
+        
+        # Header
         header_num = "#".rjust(num_width)
         header_word = "WORD".ljust(max_word_length)
         header_meaning = "MEANING".ljust(max_meaning_length)
-        print(f"  {Colors.bold_cyan(header_num)}  {Colors.bold_cyan(header_word)}   {Colors.bold_cyan(header_meaning)}")
-        print(Colors.cyan("  " + "-"*(num_width + max_word_length + max_meaning_length + 6)))
-        
-        # Print all pairs
-        for i, pair in enumerate(self.pairs, 1):
-            num = str(i).rjust(num_width)
-            word = pair["word"].ljust(max_word_length)
-            meaning = pair["meaning"]
-            print(f"  {Colors.yellow(num)}  {Colors.green(word)} → {Colors.blue(meaning)}")
+        lines.append(f"  {Colors.bold_cyan(header_num)}  {Colors.bold_cyan(header_word)}   {Colors.bold_cyan(header_meaning)}")
+        lines.append(Colors.cyan("  " + "-"*(num_width + max_word_length + max_meaning_length + 6)))
         
-        print(Colors.cyan("\n" + "="*70))
-        print(Colors.yellow("\nPress Enter or Escape to return..."))
+        # Rows share one pre-colored template instead of three color calls each
+        row = f"  {Colors.yellow('{0}')}  {Colors.green('{1}')} → {Colors.blue('{2}')}".format
+        for i, (word, width, meaning) in enumerate(zip(words, word_widths, meanings), 1):
+            lines.append(row(str(i).rjust(num_width), word + " " * (max_word_length - width), meaning))
         
-        # Wait for user input
-        self._wait_for_exit()
+        lines.append("")
+        return "\n".join(lines)
     
-    def _wait_for_exit(self):
-        """Wait for user to press Enter or Escape."""
-        if os.name == 'nt':  # Windows
-            while True:
-                if msvcrt.kbhit():
-                    key = msvcrt.getch()
-                    # Enter (13) or Escape (27)
-                    if key in (b'\r', b'\x1b'):
-                        break
-        else:  # Unix/Linux/Mac
-            # Save terminal settings
-            fd = sys.stdin.fileno()
-            old_settings = termios.tcgetattr(fd)
+    def _browse(self):
+        """Show the pairs one screen at a time until the user leaves."""
+        total = len(self.pairs)
+        top = 0              # First visible row
+        selected = None      # Row of the current search match
+        query = None         # Search text while typing after "/"
+        matches = []
+        message = ""
+        
+        with self._raw_terminal():
+            # Alternate screen, cursor hidden; both are undone on exit
+            sys.stdout.write("\033[?1049h\033[?25l")
             try:
-                tty.setraw(sys.stdin.fileno())
                 while True:
-                    key = sys.stdin.read(1)
-                    # Enter (10 or 13) or Escape (27)
-                    if ord(key) in (10, 13, 27):
+                    columns, rows = shutil.get_terminal_size((80, 24))
+                    page = max(1, rows - self.CHROME_ROWS)
+                    top = max(0, min(top, total - page))
+                    
+                    if query is not None:
+                        status = f"/{query}  ({len(matches)} matches, Enter to keep, Esc to cancel)"
+                    else:
+                        last = min(total, top + page)
+                        status = message or (f"{top + 1}-{last} of {total}  ↑↓ PgUp/PgDn Home/End  "
+                                             "/ search  n/N next/previous  q/Enter/Esc back")
+                    self._draw(top, page, columns, selected, status)
+                    message = ""
+                    
+                    key = self._read_key()
+                    if key == "eof":
+                        # stdin was closed; nothing more can be read
+                        break
+                    if query is not None:
+                        # Incremental search: every keystroke updates the matches
+                        if key == "enter":
+                            query = None
+                            if not matches:
+                                selected = None
+                            continue
+                        if key == "escape":
+                            query = None
+                            matches = []
+                            selected = None
+                            continue
+                        if key == "backspace":
+                            query = query[:-1]
+                        elif len(key) == 1 and key.isprintable():
+                            query += key
+                        else:
+                            continue
+                        matches = self._search(query)
+                        selected = self._next_match(matches, top, forward=True)
+                        if selected is not None:
+                            top = self._scroll_to(selected, top, page)
+                        continue
+                    
+                    if key in ("enter", "escape", "q"):
                         break
+                    elif key in ("down", "j"):
+                        top += 1
+                    elif key in ("up", "k"):
+                        top -= 1
+                    elif key in ("pgdn", " "):
+                        top += page
+                    elif key == "pgup":
+                        top -= page
+                    elif key == "home":
+                        top = 0
+                    elif key == "end":
+                        top = total
+                    elif key == "/":
+                        if self.search_index is None:
+                            self._draw(top, page, columns, selected, "Building search index...")
+                            self.search_index = SubstringIndex(self.pairs.words, self.pairs.meanings)
+                        query = ""
+                        matches = []
+                    elif key in ("n", "N") and matches:
+                        start = selected if selected is not None else top
+                        selected = self._next_match(matches, start + (1 if key == "n" else -1),
+                                                    forward=key == "n")
+                        top = self._scroll_to(selected, top, page)
+                    elif key in ("n", "N"):
+                        message = "No search results; press / to search"
             finally:
-                # Restore terminal settings
-                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+                sys.stdout.write("\033[?25h\033[?1049l")
+                sys.stdout.flush()
+    
+    def _draw(self, top: int, page: int, columns: int, selected: Optional[int], status: str):
+        """
+        Draw the visible rows in a single write.
+        
+        Args:
+            top: Index of the first visible pair
+            page: Number of rows available for pairs
+            columns: Terminal width
+            selected: Index of the highlighted pair, if any
+            status: Text of the bottom line
+        """
+        total = len(self.pairs)
+        end = min(total, top + page)
+        words = self.pairs.words[top:end]
+        meanings = self.pairs.meanings[top:end]
+        num_width = len(str(total))
+        
+        # Widths only depend on the visible rows; the word column gets at most half the screen
+        word_width = min(max(map(display_width, words), default=0), max(4, columns // 2))
+        meaning_width = max(0, columns - num_width - word_width - 7)
+        
+        lines = [
+            Colors.bold_cyan(fit_to_width(f"VIEW MODE - {self.wordlist['name']} ({total} pairs)", columns)),
+            Colors.rule(columns),
+            "  " + Colors.bold_cyan(f"{'#'.rjust(num_width)}  {fit_to_width('WORD', word_width)}   MEANING"),
+        ]
+        row = f"  {Colors.yellow('{0}')}  {Colors.green('{1}')} → {Colors.blue('{2}')}".format
+        for offset, (word, meaning) in enumerate(zip(words, meanings)):
+            index = top + offset
+            num = str(index + 1).rjust(num_width)
+            if index == selected:
+                num = f"\033[7m{num}\033[27m"
+            lines.append(row(num, fit_to_width(word, word_width), fit_to_width(meaning, meaning_width)))
+        lines.extend([""] * (page - (end - top)))
+        lines.append(Colors.magenta(fit_to_width(status, columns - 1)))
+        
+        # Raw mode doesn't translate "\n", so lines end in "\r\n"; \033[K clears leftovers
+        sys.stdout.write("\033[H" + "\033[K\r\n".join(lines) + "\033[K\033[J")
+        sys.stdout.flush()
+    
+    def _search(self, query: str) -> List[int]:
+        """
+        Find the pairs whose word or meaning contains the query.
+        
+        Args:
+            query: Search text
+            
+        Returns:
+            Sorted indices of the matching pairs
+        """
+        return self.search_index.find(query)
+    
+    @staticmethod
+    def _next_match(matches: List[int], start: int, forward: bool) -> Optional[int]:
+        """
+        Get the first match at or after start (or at or before it), wrapping around.
+        
+        Args:
+            matches: Sorted indices of the matching pairs
+            start: Index to search from
+            forward: Search towards the end of the list
+            
+        Returns:
+            Index of the match, or None if there are no matches
+        """
+        if not matches:
+            return None
+        if forward:
+            position = bisect_left(matches, start)
+            return matches[position % len(matches)]
+        position = bisect_right(matches, start) - 1
+        return matches[position]
+    
+    @staticmethod
+    def _scroll_to(index: int, top: int, page: int) -> int:
+        """Get the first visible row that keeps a row on screen."""
+        if index < top or index >= top + page:
+            return max(0, index - page // 3)
+        return top
+    
+    @contextmanager
+    def _raw_terminal(self):
+        """Put the terminal in raw mode for single-key input, restoring it afterwards."""
+        if os.name == 'nt':  # Windows
+            yield
+            return
+        import termios
+        import tty
+        
+        # Save terminal settings
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setraw(fd)
+            yield
+        finally:
+            # Restore terminal settings
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    
+    def _read_key(self) -> str:
+        """
+        Read one key press.
+        
+        Returns:
+            A printable character, or "up", "down", "pgup", "pgdn", "home",
+            "end", "enter", "escape", "backspace", or "eof" once stdin is closed
+        """
+        if os.name == 'nt':  # Windows
+            import msvcrt
+            key = msvcrt.getwch()
+            if key in ('\x00', '\xe0'):
+                return _WINDOWS_KEYS.get(msvcrt.getwch(), "")
+            return {'\r': "enter", '\x1b': "escape", '\x08': "backspace"}.get(key, key)
+        
+        import select
+        
+        fd = sys.stdin.fileno()
+        key = self._read_char(fd)
+        if not key:
+            return "eof"
+        if key == '\x1b':
+            # A lone Escape has nothing right behind it; arrows and paging keys do
+            sequence = ""
+            while not _sequence_complete(sequence) and select.select([fd], [], [], 0.05)[0]:
+                char = self._read_char(fd)
+                if not char:
+                    break
+                sequence += char
+            return _KEY_SEQUENCES.get(sequence, "") if sequence else "escape"
+        if key in ('\r', '\n'):
+            return "enter"
+        if key in ('\x7f', '\x08'):
+            return "backspace"
+        if key == '\x03':
+            raise KeyboardInterrupt
+        return key
+    
+    @staticmethod
+    def _read_char(fd: int) -> str:
+        """Read one (possibly multi-byte UTF-8) character from a raw terminal ("" at end of file)."""
+        data = os.read(fd, 1)
+        if data and data[0] >= 0xC0:
+            # Leading byte tells how many continuation bytes follow
+            extra = 3 if data[0] >= 0xF0 else 2 if data[0] >= 0xE0 else 1
+            data += os.read(fd, extra)
+        return data.decode('utf-8', errors='replace')
@@ -0,0 +1,146 @@
+"""
+Wordlist Cache Module
+Keeps parsed wordlists in memory and on disk so reloads can skip JSON parsing.
+"""
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory used for on-disk caches.
+
+    Honors FLASHCARDS_CACHE_DIR, then XDG_CACHE_HOME, then falls back to ~/.cache.
+
+    Returns:
+        Path of the flashcards cache directory (may not exist yet)
+    """
+    override = os.environ.get("FLASHCARDS_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or (Path.home() / ".cache")
+    return Path(base) / "flashcards"
+
+
+class WordlistCache:
+    """LRU cache of parsed wordlists keyed on file path, mtime and size."""
+
+    # Bump when the cached payload format changes so stale entries are ignored
+    CACHE_VERSION = 3
+
+    def __init__(self, max_entries: int = 8, cache_dir: Optional[Path] = None,
+                 use_disk: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of wordlists kept in memory
+            cache_dir: Directory for the on-disk cache (defaults to get_cache_dir())
+            use_disk: Whether to read and write the on-disk cache
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir() / "wordlists"
+        self.use_disk = use_disk
+        self._memory = OrderedDict()
+
+    @staticmethod
+    def file_key(file_path: Path) -> Optional[Tuple[str, int, int]]:
+        """
+        Build the cache key for a file.
+
+        Args:
+            file_path: Path of the source JSON file
+
+        Returns:
+            (resolved path, mtime in ns, size) or None if the file can't be stat'ed
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[Any]:
+        """
+        Look up a parsed wordlist.
+
+        Args:
+            key: Key returned by file_key()
+
+        Returns:
+            Cached value or None on a miss
+        """
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            return value
+
+        if not self.use_disk:
+            return None
+
+        try:
+            with open(self._disk_path(key[0]), 'rb') as f:
+                version, stored_key, value = pickle.load(f)
+        except Exception:
+            return None
+
+        if version != self.CACHE_VERSION or tuple(stored_key) != key:
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def put(self, key: Tuple[str, int, int], value: Any):
+        """
+        Store a parsed wordlist in memory and on disk.
+
+        Args:
+            key: Key returned by file_key() before the file was parsed
+            value: Parsed wordlist data
+        """
+        self._remember(key, value)
+
+        if not self.use_disk:
+            return
+
+        import tempfile  # only needed when writing, so not at startup
+
+        # Write to a temp file and rename so readers never see a partial cache
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((self.CACHE_VERSION, key, value), f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._disk_path(key[0]))
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            # The disk cache is best-effort; loading still works without it
+            pass
+
+    def clear(self):
+        """Drop all in-memory entries."""
+        self._memory.clear()
+
+    def _remember(self, key: Tuple[str, int, int], value: Any):
+        """Insert into the in-memory LRU, evicting the oldest entry if needed."""
+        # A newer version of the same file replaces any older entry
+        for old_key in [k for k in self._memory if k[0] == key[0] and k != key]:
+            del self._memory[old_key]
+
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, resolved_path: str) -> Path:
+        """Get the on-disk cache file for a source path."""
+        digest = hashlib.sha1(resolved_path.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.pickle"
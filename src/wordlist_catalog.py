@@ -0,0 +1,207 @@
+"""
+Wordlist Catalog Module
+Keeps a persistent index of the wordlist files under a directory so that
+listing decks only has to list directories that changed.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from wordlist_cache import get_cache_dir
+
+
+class WordlistCatalog:
+    """
+    Persistent index of wordlists (name, path, mtime, size, pair count, folder).
+
+    A directory is only listed again when its own mtime changes, which happens
+    whenever files are added, removed or renamed in it. Every indexed file is
+    stat'ed on each refresh, so a file rewritten in place is noticed too.
+    Listing never opens the JSON files: pair counts are learned when a file is
+    loaded (see update_pair_count) and are None until then, and again after
+    the file changes.
+    """
+
+    # Bump when the on-disk index format changes
+    INDEX_VERSION = 2
+
+    def __init__(self, root: Path, index_dir: Optional[Path] = None):
+        """
+        Initialize the catalog.
+
+        Args:
+            root: Directory containing the wordlists
+            index_dir: Directory for the index file (defaults to the cache directory)
+        """
+        self.root = Path(root)
+        index_dir = Path(index_dir) if index_dir else get_cache_dir() / "catalog"
+        digest = hashlib.sha1(str(self.root.resolve()).encode('utf-8')).hexdigest()
+        self.index_path = index_dir / f"{digest}.json"
+        self._dirs = None   # relative dir -> {"mtime_ns", "subdirs", "files"}
+        self._files = None  # wordlist name -> entry dictionary
+        self._dirty = False
+
+    def entries(self) -> List[Dict]:
+        """
+        Refresh the index and return all wordlist entries.
+
+        Returns:
+            List of entry dictionaries sorted by name
+        """
+        self.refresh()
+        return [self._files[name] for name in sorted(self._files)]
+
+    def refresh(self):
+        """Bring the index up to date, rescanning only changed directories."""
+        if self._dirs is None:
+            self._load()
+
+        seen_dirs = set()
+        seen_files = set()
+        visited = set()
+        pending = [""]
+
+        while pending:
+            rel_dir = pending.pop()
+            dir_path = self.root / rel_dir if rel_dir else self.root
+            try:
+                stat = os.stat(dir_path)
+            except OSError:
+                continue
+
+            # Guard against symlink loops
+            if (stat.st_dev, stat.st_ino) in visited:
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+            seen_dirs.add(rel_dir)
+
+            cached = self._dirs.get(rel_dir)
+            if cached is None or cached["mtime_ns"] != stat.st_mtime_ns:
+                cached = self._scan_directory(rel_dir, dir_path, stat.st_mtime_ns)
+            else:
+                self._check_files(rel_dir, cached["files"])
+
+            seen_files.update(cached["files"])
+            pending.extend(f"{rel_dir}/{sub}" if rel_dir else sub for sub in cached["subdirs"])
+
+        for rel_dir in set(self._dirs) - seen_dirs:
+            del self._dirs[rel_dir]
+            self._dirty = True
+        for name in set(self._files) - seen_files:
+            del self._files[name]
+            self._dirty = True
+
+        if self._dirty:
+            self._save()
+
+    def update_pair_count(self, name: str, pair_count: Optional[int]):
+        """
+        Record what loading a file found.
+
+        Args:
+            name: Wordlist name
+            pair_count: Number of pairs just loaded, or None if the file couldn't be parsed
+        """
+        if self._files is None:
+            self._load()
+        file_path = self.root / f"{name}.json"
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        # A file loaded before it was ever listed is indexed now
+        self._index_file(name, name.rpartition("/")[0], file_path, stat)
+        entry = self._files[name]
+        invalid = pair_count is None
+        if entry["pair_count"] != pair_count or entry["invalid"] != invalid:
+            entry.update(pair_count=pair_count, invalid=invalid)
+            self._dirty = True
+        if self._dirty:
+            self._save()
+
+    def _check_files(self, rel_dir: str, names: List[str]):
+        """Re-stat the files of an unchanged directory, for files rewritten in place."""
+        for name in names:
+            file_path = self.root / f"{name}.json"
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                # Removed since; the directory's mtime will show it on the next refresh
+                continue
+            self._index_file(name, rel_dir, file_path, stat)
+
+    def _scan_directory(self, rel_dir: str, dir_path: Path, mtime_ns: int) -> Dict:
+        """List a directory and (re)index the wordlist files in it."""
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(dir_path) as it:
+                for item in it:
+                    if item.is_dir():
+                        subdirs.append(item.name)
+                    elif item.name.endswith(".json") and item.is_file():
+                        name = f"{rel_dir}/{item.name[:-5]}" if rel_dir else item.name[:-5]
+                        files.append(name)
+                        self._index_file(name, rel_dir, Path(item.path), item.stat())
+        except OSError:
+            pass
+
+        cached = {"mtime_ns": mtime_ns, "subdirs": sorted(subdirs), "files": sorted(files)}
+        self._dirs[rel_dir] = cached
+        self._dirty = True
+        return cached
+
+    def _index_file(self, name: str, rel_dir: str, file_path: Path, stat: os.stat_result):
+        """Add or update the entry for one file, forgetting its pair count if it changed."""
+        entry = self._files.get(name)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return
+
+        self._files[name] = {
+            "name": name,
+            "path": str(file_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "pair_count": None,
+            "invalid": False,
+            "folder": rel_dir.split("/", 1)[0],
+        }
+        self._dirty = True
+
+    def _load(self):
+        """Read the index from disk, starting empty if it is missing or stale."""
+        self._dirs = {}
+        self._files = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.INDEX_VERSION or data.get("root") != str(self.root.resolve()):
+            return
+        self._dirs = data.get("dirs", {})
+        self._files = data.get("files", {})
+
+    def _save(self):
+        """Write the index atomically; failures only cost a rescan next time."""
+        data = {
+            "version": self.INDEX_VERSION,
+            "root": str(self.root.resolve()),
+            "dirs": self._dirs,
+            "files": self._files,
+        }
+        import tempfile  # only needed when writing, so not at startup
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.index_path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            pass
+        self._dirty = False
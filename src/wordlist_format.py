@@ -0,0 +1,187 @@
+"""
+Wordlist Format Module
+Detects and validates the two supported wordlist JSON formats:
+
+    {"pairs": [{"word": "hello", "meaning": "hola"}, ...]}   (recommended)
+    {"hello": "hola", ...}                                     (legacy)
+"""
+import gc
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+from pair_store import PairStore
+
+
+class WordlistFormatError(ValueError):
+    """Raised when a wordlist file is not valid."""
+
+
+def keep_object_pairs(pairs: List[Tuple]) -> List[Tuple]:
+    """
+    object_pairs_hook that keeps JSON objects as (key, value) lists.
+    Unlike a dict this keeps duplicate keys, so they can be reported.
+    """
+    return pairs
+
+
+def check_pair(word, meaning) -> Optional[str]:
+    """
+    Validate the types of a single word/meaning pair.
+
+    Args:
+        word: The word value from the file
+        meaning: The meaning value from the file
+
+    Returns:
+        Error message, or None if the pair is valid
+    """
+    if not isinstance(word, str):
+        return "word must be a string"
+    if not isinstance(meaning, str):
+        return "meaning must be a string"
+    if not word.strip() or not meaning.strip():
+        return "word and meaning must not be empty"
+    return None
+
+
+def check_entry(entry) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+    """
+    Validate one entry of the "pairs" array.
+
+    Args:
+        entry: Entry as a dict or as a (key, value) list from keep_object_pairs
+
+    Returns:
+        ((word, meaning), None) if valid, or (None, error message)
+    """
+    if isinstance(entry, dict):
+        fields = entry.items()
+    elif isinstance(entry, list) and all(isinstance(f, tuple) for f in entry):
+        fields = entry
+    else:
+        return None, "expected an object with \"word\" and \"meaning\""
+
+    word = meaning = None
+    for key, value in fields:
+        if key == "word":
+            word = value
+        elif key == "meaning":
+            meaning = value
+
+    if word is None or meaning is None:
+        return None, "missing \"word\" or \"meaning\""
+    error = check_pair(word, meaning)
+    if error:
+        return None, error
+    return (word, meaning), None
+
+
+def parse_wordlist_data(data) -> Tuple[PairStore, List[Tuple[int, str]]]:
+    """
+    Convert decoded JSON into pairs, detecting the format and validating in a
+    single pass over the decoded entries.
+
+    Args:
+        data: Decoded JSON, with objects as (key, value) lists (see keep_object_pairs) or dicts
+
+    Returns:
+        (PairStore of valid pairs, list of (entry number, problem) for skipped or
+        overwritten entries)
+    """
+    if isinstance(data, dict):
+        data = list(data.items())
+    # JSON arrays decode to lists of values, objects to lists of (key, value) tuples
+    if not isinstance(data, list) or (data and type(data[0]) is not tuple):
+        raise WordlistFormatError("Expected a JSON object")
+
+    # Common case first: a legacy file whose entries are all valid is checked with
+    # C-level builtins; the per-entry loop below only runs to report problems
+    mapping = dict(data)
+    pairs_value = mapping.get("pairs")
+    if isinstance(pairs_value, list):
+        return _parse_pairs_array(pairs_value)
+    words = list(mapping)
+    meanings = list(mapping.values())
+    if (len(mapping) == len(data) and set(map(type, meanings)) <= {str}
+            and all(words) and all(meanings)
+            and not any(map(str.isspace, words)) and not any(map(str.isspace, meanings))):
+        return PairStore.from_columns(words, meanings), []
+
+    problems = []
+    legacy_words = []
+    legacy_meanings = []
+    legacy_index = {}
+    index_of = legacy_index.setdefault
+
+    for position, (key, value) in enumerate(data, 1):
+        # Fast path for the common case of a valid legacy entry
+        if type(value) is str and value and not value.isspace() and key and not key.isspace():
+            count = len(legacy_words)
+            index = index_of(key, count)
+            if index == count:
+                legacy_words.append(key)
+                legacy_meanings.append(value)
+            else:
+                # A duplicate key overwrites the earlier meaning, like a dict would
+                legacy_meanings[index] = value
+                problems.append((position, f"duplicate word '{key}' replaces an earlier entry "
+                                           "(use the \"pairs\" format to keep both)"))
+        else:
+            problems.append((position, check_pair(key, value)))
+
+    return PairStore.from_columns(legacy_words, legacy_meanings), problems
+
+
+def _parse_pairs_array(entries: list) -> Tuple[PairStore, List[Tuple[int, str]]]:
+    """Validate the entries of a "pairs" array, keeping duplicates."""
+    problems = []
+    words = []
+    meanings = []
+    for position, entry in enumerate(entries, 1):
+        pair, error = check_entry(entry)
+        if error:
+            problems.append((position, error))
+        else:
+            words.append(pair[0])
+            meanings.append(pair[1])
+    return PairStore.from_columns(words, meanings), problems
+
+
+def load_wordlist_file(file_path: Path) -> Tuple[PairStore, List[Tuple[int, str]]]:
+    """
+    Read and validate a wordlist file.
+
+    Args:
+        file_path: Path of the JSON file
+
+    Returns:
+        Same as parse_wordlist_data()
+    """
+    # Parsing creates millions of small objects on big decks; pausing the cyclic
+    # garbage collector meanwhile roughly halves the load time
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f, object_pairs_hook=keep_object_pairs)
+        return parse_wordlist_data(data)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def format_problems(problems: List[Tuple[int, str]], limit: int = 5) -> List[str]:
+    """
+    Describe validation problems for display.
+
+    Args:
+        problems: (entry number, problem) tuples
+        limit: Maximum number of problems listed individually
+
+    Returns:
+        Lines of text
+    """
+    lines = [f"entry {position}: {message}" for position, message in problems[:limit]]
+    if len(problems) > limit:
+        lines.append(f"... and {len(problems) - limit} more")
+    return lines
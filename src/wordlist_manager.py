@@ -4,19 +4,35 @@ Handles loading and managing word lists from JSON files.
 """
 import json
 import os
+from array import array
 from pathlib import Path
 from typing import Dict, List, Optional
+from console import Console, TerminalConsole
+from pair_store import PairStore
+from wordlist_cache import WordlistCache
+from wordlist_catalog import WordlistCatalog
+from wordlist_format import WordlistFormatError, format_problems, load_wordlist_file
+from wordlist_stream import PairStream
 
 
 class WordlistManager:
     """Manages word lists for the flashcard application."""
     
-    def __init__(self, wordlists_dir: str = "wordlists"):
+    # Files at least this large are streamed instead of loaded into memory
+    STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+    
+    # Minimum total size before load_many parses files in worker processes
+    PARALLEL_THRESHOLD_BYTES = 4 * 1024 * 1024
+    
+    def __init__(self, wordlists_dir: str = "wordlists", cache: Optional[WordlistCache] = None,
+                 console: Optional[Console] = None):
         """
         Initialize the WordlistManager.
         
         Args:
             wordlists_dir: Directory containing JSON wordlist files
+            cache: Cache for parsed wordlists (a default LRU + disk cache if None)
+            console: Console load errors and warnings are written to (the terminal if None)
         """
         # Convert to Path and resolve to absolute path
         wordlists_path = Path(wordlists_dir)
@@ -29,6 +45,9 @@ class WordlistManager:
             wordlists_path = (script_dir / ".." / wordlists_dir).resolve()
         
         self.wordlists_dir = wordlists_path
+        self.cache = cache if cache is not None else WordlistCache()
+        self.console = console or TerminalConsole()
+        self.catalog = WordlistCatalog(self.wordlists_dir)
         self._ensure_wordlists_directory()
     
     def _ensure_wordlists_directory(self):
@@ -39,30 +58,30 @@ class WordlistManager:
     def get_available_wordlists(self) -> List[str]:
         """
         Get list of available wordlist names.
-        Scans both root directory and subdirectories for JSON files.
+        Finds JSON files in the root directory and in subdirectories at any depth.
         
         Returns:
-            List of wordlist names (with folder prefix if in subdirectory)
+            List of wordlist names (with folder path prefix if in subdirectory)
+        """
+        return [entry["name"] for entry in self.get_catalog()]
+    
+    def get_catalog(self) -> List[Dict]:
+        """
+        Get catalog entries for all available wordlists.
+        Backed by a persistent index, so only directories that changed are rescanned
+        and no file is opened; pair counts are known once a file has been loaded.
+        
+        Returns:
+            List of dictionaries with "name", "path", "mtime_ns", "size",
+            "pair_count" (None until the file has been loaded), "invalid"
+            (the last load failed) and "folder", sorted by name
         """
         if not self.wordlists_dir.exists():
             return []
         
-        wordlists = []
-        
-        # Check root directory for JSON files
-        for file in self.wordlists_dir.glob("*.json"):
-            wordlists.append(file.stem)
-        
-        # Check subdirectories for JSON files
-        for subdir in self.wordlists_dir.iterdir():
-            if subdir.is_dir():
-                for file in subdir.glob("*.json"):
-                    # Add as "foldername/filename"
-                    wordlists.append(f"{subdir.name}/{file.stem}")
-        
-        return sorted(wordlists)
+        return self.catalog.entries()
     
-    def load_wordlist(self, name: str) -> Optional[Dict[str, List[Dict[str, str]]]]:
+    def load_wordlist(self, name: str) -> Optional[Dict]:
         """
         Load a wordlist from JSON file.
         Supports both root files and subdirectory files (e.g., "dutch/dutch_A2_01").
@@ -72,7 +91,7 @@ class WordlistManager:
                   Can be "filename" or "folder/filename"
             
         Returns:
-            Dictionary with wordlist data or None if error
+            Dictionary with "name" and "pairs" (a PairStore) or None if error
         """
         # Check if name includes a folder path
         if '/' in name:
@@ -81,37 +100,276 @@ class WordlistManager:
             file_path = self.wordlists_dir / f"{name}.json"
         
         if not file_path.exists():
-            print(f"Error: Wordlist '{name}' not found.")
+            self.console.print(f"Error: Wordlist '{name}' not found.")
             return None
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Validate that data is a dictionary
-            if not isinstance(data, dict):
-                print(f"Error: Invalid format in '{name}.json'. Expected key-value pairs.")
+        # Take the cache key before reading so a concurrent edit invalidates it
+        cache_key = self.cache.file_key(file_path)
+        cached = self.cache.get(cache_key) if cache_key is not None else None
+        
+        if cached is not None:
+            pairs, problems = cached
+        else:
+            try:
+                pairs, problems = load_wordlist_file(file_path)
+            except Exception as e:
+                self.console.print(self._describe_load_error(name, e))
+                self.catalog.update_pair_count(name, None)
                 return None
             
-            # Convert to internal format
-            pairs = [{"word": word, "meaning": meaning} 
-                    for word, meaning in data.items()]
+            self._remember_parsed(name, cache_key, pairs, problems)
+        
+        self._report_problems(name, problems)
+        
+        if not pairs:
+            self.console.print(f"Error: Wordlist '{name}' is empty.")
+            return None
+        
+        return {
+            "name": name,
+            "pairs": pairs
+        }
+    
+    def load_many(self, names: List[str], display_name: Optional[str] = None,
+                  max_workers: Optional[int] = None) -> Optional[Dict]:
+        """
+        Load several wordlists and merge them into one deck.
+        Files missing from the cache are parsed concurrently in a process pool,
+        so parse time scales with CPU cores rather than with the number of files.
+        Pairs that appear in more than one file are kept once.
+        
+        Args:
+            names: Names of the wordlists to load
+            display_name: Name for the merged deck (defaults to the names joined)
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Dictionary with "name", "pairs" (a PairStore), "sources" (the loaded
+            wordlist names) and "pair_sources" (index into "sources" for every pair),
+            or None if nothing could be loaded
+        """
+        loaded = {}
+        to_parse = []
+        
+        for name in names:
+            file_path = self.wordlists_dir / f"{name}.json"
+            cache_key = self.cache.file_key(file_path)
+            if cache_key is None:
+                self.console.print(f"Error: Wordlist '{name}' not found.")
+                continue
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                loaded[name] = cached
+            else:
+                to_parse.append((name, file_path, cache_key))
+        
+        outcomes = self._parse_files([entry[1] for entry in to_parse], max_workers)
+        for (name, file_path, cache_key), outcome in zip(to_parse, outcomes):
+            if isinstance(outcome, Exception):
+                self.console.print(self._describe_load_error(name, outcome))
+                self.catalog.update_pair_count(name, None)
+                continue
+            pairs, problems = outcome
+            self._remember_parsed(name, cache_key, pairs, problems)
+            loaded[name] = outcome
+        
+        # Merge in the order requested, keeping the first copy of each pair
+        sources = []
+        pair_sources = array('I')
+        words = []
+        meanings = []
+        seen = set()
+        for name in names:
+            if name not in loaded:
+                continue
+            pairs, problems = loaded[name]
+            self._report_problems(name, problems)
+            source_index = len(sources)
+            sources.append(name)
+            for key in zip(pairs.words, pairs.meanings):
+                if key in seen:
+                    continue
+                seen.add(key)
+                words.append(key[0])
+                meanings.append(key[1])
+                pair_sources.append(source_index)
+        
+        if not words:
+            self.console.print(f"Error: No word pairs could be loaded from {display_name or ', '.join(names)}.")
+            return None
+        
+        return {
+            "name": display_name or ", ".join(sources),
+            "pairs": PairStore.from_columns(words, meanings),
+            "sources": sources,
+            "pair_sources": pair_sources
+        }
+    
+    def load_folder(self, folder: str, max_workers: Optional[int] = None) -> Optional[Dict]:
+        """
+        Load every wordlist in a folder (including nested folders) as one deck.
+        
+        Args:
+            folder: Folder path relative to the wordlists directory (e.g. "Dutch")
+            max_workers: Number of worker processes (defaults to the CPU count)
             
-            if not pairs:
-                print(f"Error: Wordlist '{name}' is empty.")
-                return None
+        Returns:
+            Merged wordlist dictionary (see load_many) or None if error
+        """
+        prefix = folder.strip("/") + "/"
+        names = [name for name in self.get_available_wordlists() if name.startswith(prefix)]
+        if not names:
+            self.console.print(f"Error: Folder '{folder}' has no wordlists.")
+            return None
+        return self.load_many(names, display_name=prefix, max_workers=max_workers)
+    
+    def get_folders(self) -> List[Dict]:
+        """
+        Get the folders that contain wordlists, at any depth.
+        
+        Returns:
+            List of dictionaries with "name" (e.g. "Dutch/"), "lists" and
+            "pair_count" (total over its valid wordlists, None while some of
+            them haven't been loaded yet), sorted by name
+        """
+        folders = {}
+        for entry in self.get_catalog():
+            parts = entry["name"].split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                name = "/".join(parts[:depth]) + "/"
+                folder = folders.setdefault(name, {"name": name, "lists": 0, "pair_count": 0})
+                folder["lists"] += 1
+                if entry["invalid"] or folder["pair_count"] is None:
+                    continue
+                if entry["pair_count"] is None:
+                    folder["pair_count"] = None
+                else:
+                    folder["pair_count"] += entry["pair_count"]
+        return [folders[name] for name in sorted(folders)]
+    
+    def open_wordlist(self, name: str) -> Optional[Dict]:
+        """
+        Load a wordlist, streaming it if the file is too large to load at once.
+        
+        Args:
+            name: Name of the wordlist (without .json extension)
             
-            return {
-                "name": name,
-                "pairs": pairs
-            }
+        Returns:
+            Dictionary with wordlist data or None if error
+        """
+        file_path = self.wordlists_dir / f"{name}.json"
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            size = 0
+        
+        if size >= self.STREAM_THRESHOLD_BYTES:
+            return self.stream_wordlist(name)
+        return self.load_wordlist(name)
+    
+    def stream_wordlist(self, name: str) -> Optional[Dict]:
+        """
+        Open a wordlist for incremental reading.
+        The returned "pairs" is a PairStream that parses the file as it is iterated,
+        so modes can start before the whole file has been read.
+        
+        Args:
+            name: Name of the wordlist (without .json extension)
             
-        except json.JSONDecodeError:
-            print(f"Error: Invalid JSON format in '{name}.json'.")
+        Returns:
+            Dictionary with "name", "pairs" (a PairStream) and "streaming" or None if error
+        """
+        file_path = self.wordlists_dir / f"{name}.json"
+        
+        if not file_path.exists():
+            self.console.print(f"Error: Wordlist '{name}' not found.")
+            return None
+        
+        stream = PairStream(file_path)
+        
+        # Read just far enough to reject empty or malformed files up front
+        try:
+            first_pair = next(iter(stream), None)
+        except WordlistFormatError as e:
+            self.console.print(f"Error: Invalid JSON format in '{name}.json': {e}.")
+            self.catalog.update_pair_count(name, None)
             return None
         except Exception as e:
-            print(f"Error loading wordlist '{name}': {str(e)}")
+            self.console.print(f"Error loading wordlist '{name}': {str(e)}")
             return None
+        
+        if first_pair is None:
+            self.console.print(f"Error: Wordlist '{name}' is empty.")
+            return None
+        
+        return {
+            "name": name,
+            "pairs": stream,
+            "streaming": True
+        }
+    
+    def _parse_files(self, file_paths: List[Path], max_workers: Optional[int]) -> List:
+        """
+        Parse wordlist files, in parallel when there is enough work to pay for it.
+        
+        Args:
+            file_paths: Files to parse
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            (pairs, problems) tuple or the raised exception for every file, in order
+        """
+        total_bytes = 0
+        for file_path in file_paths:
+            try:
+                total_bytes += file_path.stat().st_size
+            except OSError:
+                pass
+        
+        # Starting worker processes costs more than parsing a few small files
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        if workers > 1 and total_bytes >= self.PARALLEL_THRESHOLD_BYTES:
+            # Imported here: it pulls in multiprocessing, which most runs never need
+            from concurrent.futures import ProcessPoolExecutor
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(load_wordlist_file, file_path) for file_path in file_paths]
+                    outcomes = [future.exception() or future.result() for future in futures]
+                if not any(isinstance(outcome, BrokenProcessPool) for outcome in outcomes):
+                    return outcomes
+            except (OSError, NotImplementedError):
+                pass
+            # No usable process pool here; fall back to parsing in-process
+        
+        outcomes = []
+        for file_path in file_paths:
+            try:
+                outcomes.append(load_wordlist_file(file_path))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def _remember_parsed(self, name: str, cache_key, pairs, problems):
+        """Store a freshly parsed wordlist in the cache and catalog."""
+        if cache_key is not None:
+            self.cache.put(cache_key, (pairs, problems))
+        self.catalog.update_pair_count(name, len(pairs))
+    
+    def _report_problems(self, name: str, problems):
+        """Print the entries that were skipped or replaced while loading."""
+        if problems:
+            self.console.print(f"Warning: skipped or replaced {len(problems)} entries in '{name}.json':")
+            for line in format_problems(problems):
+                self.console.print(f"  {line}")
+    
+    def _describe_load_error(self, name: str, error: Exception) -> str:
+        """Build the error message for a wordlist that failed to parse."""
+        if isinstance(error, json.JSONDecodeError):
+            return f"Error: Invalid JSON format in '{name}.json' (line {error.lineno}, column {error.colno})."
+        if isinstance(error, WordlistFormatError):
+            return f"Error: Invalid format in '{name}.json'. Expected a \"pairs\" list or key-value pairs."
+        return f"Error loading wordlist '{name}': {str(error)}"
     
     def get_wordlist_size(self, wordlist: Dict) -> int:
         """
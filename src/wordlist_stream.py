@@ -0,0 +1,308 @@
+"""
+Wordlist Stream Module
+Parses wordlist JSON files incrementally so very large decks can be used
+without holding the whole file in memory.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+from pair_store import Pair
+from wordlist_format import WordlistFormatError, check_entry, check_pair, keep_object_pairs
+
+# Characters the JSON grammar treats as insignificant whitespace
+_JSON_WHITESPACE = ' \t\n\r'
+
+_DECODER = json.JSONDecoder(object_pairs_hook=keep_object_pairs)
+
+# A decode error this close to the end of the buffer may just be a value cut
+# off by the chunk boundary (a partial "false", a "\\u00e9" escape, ...)
+_TRUNCATION_MARGIN = 16
+
+
+class _StreamReader:
+    """Minimal pull reader over a text file, decoding one JSON value at a time."""
+
+    def __init__(self, f, chunk_size: int):
+        """
+        Initialize the reader.
+
+        Args:
+            f: Text file object opened for reading
+            chunk_size: Number of characters read per chunk
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0  # Characters discarded before the start of buf
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """
+        Read the next chunk, dropping the already consumed part of the buffer.
+
+        Returns:
+            True if more data was read, False at end of file
+        """
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            Next significant character, or '' at end of file
+        """
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def advance(self):
+        """Consume the character returned by peek()."""
+        self.pos += 1
+
+    def expect(self, char: str):
+        """
+        Consume the next significant character, which must be char.
+
+        Args:
+            char: Expected character
+        """
+        if self.peek() != char:
+            raise self.error(f"Expected '{char}'")
+        self.advance()
+
+    def value(self):
+        """
+        Decode the next complete JSON value.
+
+        Returns:
+            Decoded Python value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # Only a value cut off at the end of the chunk is worth reading more
+                # for; anything else is a syntax error, reported without reading on
+                if self._may_be_truncated(e) and self._fill():
+                    continue
+                raise self.error("Invalid JSON value")
+            # A number near the end of the buffer may continue in the next chunk ("1." + "5")
+            left = len(self.buf) - end
+            if left <= _TRUNCATION_MARGIN and (not left or type(value) in (int, float)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _may_be_truncated(self, error: json.JSONDecodeError) -> bool:
+        """Check whether a decode error could be caused by the end of the buffer."""
+        return (error.msg.startswith("Unterminated string")
+                or len(self.buf) - error.pos <= _TRUNCATION_MARGIN)
+
+    def error(self, message: str) -> WordlistFormatError:
+        """Build an error that points at the current character offset."""
+        return WordlistFormatError(f"{message} at character {self.offset + self.pos}")
+
+
+def iter_wordlist_pairs(file_path: Path, chunk_size: int = 1 << 16,
+                        problems: Optional[List[Tuple[int, str]]] = None) -> Iterator[Pair]:
+    """
+    Yield word pairs from a wordlist file one at a time.
+    Both formats are supported; as in parse_wordlist_data(), a file is read as
+    the "pairs" format when any of its keys is "pairs" with an array value.
+    Invalid entries are skipped.
+
+    Pairs are yielded as they are parsed, except in a file whose text mentions
+    "pairs" as a key: there the entries before it are held back until it is
+    known whether they are pairs or the metadata of a "pairs" file.
+
+    Args:
+        file_path: Path of the JSON wordlist
+        chunk_size: Number of characters read from disk at once
+        problems: List that receives (entry number, problem) for skipped entries
+
+    Yields:
+        Pair objects in file order
+    """
+    if problems is None:
+        problems = []
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        reader = _StreamReader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+
+        # Entries held back while the file may still turn out to be a "pairs" file
+        held = [] if _mentions_pairs_key(file_path, chunk_size) else None
+        held_problems = []
+        position = 0
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader.error("Expected a string key")
+            reader.expect(':')
+
+            if key == "pairs" and reader.peek() == '[':
+                # Whatever came before it was metadata
+                reader.advance()
+                yield from _iter_pairs_array(reader, problems)
+                # Any other top-level keys are metadata
+                while reader.peek() == ',':
+                    reader.advance()
+                    reader.value()
+                    reader.expect(':')
+                    reader.value()
+                reader.expect('}')
+                return
+
+            position += 1
+            meaning = reader.value()
+            error = check_pair(key, meaning)
+            if held is not None:
+                if error:
+                    held_problems.append((position, error))
+                else:
+                    held.append(Pair(key, meaning))
+            elif error:
+                problems.append((position, error))
+            else:
+                yield Pair(key, meaning)
+
+            char = reader.peek()
+            if char == ',':
+                reader.advance()
+            elif char == '}':
+                if held is not None:
+                    problems.extend(held_problems)
+                    yield from held
+                return
+            else:
+                raise reader.error("Expected ',' or '}'")
+
+
+def _mentions_pairs_key(file_path: Path, chunk_size: int) -> bool:
+    """Check whether the text of a file contains '"pairs"' (a quick scan before parsing)."""
+    needle = '"pairs"'
+    tail = ""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(max(chunk_size, 1 << 16))
+            if not chunk:
+                return False
+            window = tail + chunk
+            if needle in window:
+                return True
+            tail = window[-(len(needle) - 1):]
+
+
+def _iter_pairs_array(reader: _StreamReader, problems: List[Tuple[int, str]]) -> Iterator[Pair]:
+    """Yield the valid entries of a "pairs" array whose '[' was just consumed."""
+    if reader.peek() == ']':
+        reader.advance()
+        return
+
+    position = 0
+    while True:
+        position += 1
+        pair, error = check_entry(reader.value())
+        if error:
+            problems.append((position, error))
+        else:
+            yield Pair(*pair)
+
+        char = reader.peek()
+        if char == ',':
+            reader.advance()
+        elif char == ']':
+            reader.advance()
+            return
+        else:
+            raise reader.error("Expected ',' or ']'")
+
+
+def shuffle_buffer(pairs: Iterable, buffer_size: int, rng: Optional[random.Random] = None) -> Iterator:
+    """
+    Shuffle an iterable using a bounded buffer.
+
+    Items are yielded as soon as the buffer is full, so memory stays at
+    buffer_size items. Every item is yielded exactly once, but items near the
+    start of the input tend to come out earlier than a full shuffle would give.
+
+    Args:
+        pairs: Items to shuffle
+        buffer_size: Maximum number of items held at once
+        rng: Random generator to use (module-level random if None)
+
+    Yields:
+        Items in shuffled order
+    """
+    rng = rng or random
+    buffer = []
+    for item in pairs:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        index = rng.randrange(buffer_size)
+        yield buffer[index]
+        buffer[index] = item
+
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+class PairStream:
+    """Re-iterable, incrementally parsed sequence of word pairs."""
+
+    def __init__(self, file_path: Path, chunk_size: int = 1 << 16, buffer_size: int = 10000):
+        """
+        Initialize the stream.
+
+        Args:
+            file_path: Path of the JSON wordlist
+            chunk_size: Number of characters read from disk at once
+            buffer_size: Number of pairs held when drawing in random order
+        """
+        self.file_path = Path(file_path)
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+        # (entry number, problem) for entries skipped by the latest pass
+        self.problems = []
+
+    def __iter__(self) -> Iterator[Pair]:
+        """Iterate over pairs in file order, re-reading the file each time."""
+        self.problems = []
+        return iter_wordlist_pairs(self.file_path, self.chunk_size, self.problems)
+
+    def shuffled(self) -> Iterator[Pair]:
+        """Yield every pair once in (buffered) random order."""
+        return shuffle_buffer(self, self.buffer_size)
+
+    def random_pairs(self) -> Iterator[Pair]:
+        """Yield pairs in random order forever, starting a new pass when one ends."""
+        while True:
+            empty = True
+            for pair in self.shuffled():
+                empty = False
+                yield pair
+            if empty:
+                return
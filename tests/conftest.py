@@ -0,0 +1,31 @@
+"""
+Shared test setup: the modules under src/ are imported by name, as main.py
+does, and every test gets its own cache and data directories.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Keep caches, progress and history out of the user's home directory."""
+    monkeypatch.setenv("FLASHCARDS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("FLASHCARDS_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.delenv("FLASHCARDS_TRACE", raising=False)
+
+
+@pytest.fixture
+def write_json(tmp_path):
+    """Write a JSON wordlist under tmp_path/wordlists and return its path."""
+    import json
+
+    def write(name, data):
+        path = tmp_path / "wordlists" / f"{name}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        return path
+    return write
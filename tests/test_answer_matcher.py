@@ -0,0 +1,113 @@
+import random
+
+from answer_matcher import CLOSE, CORRECT, INCORRECT, AnswerMatcher, edit_distance, max_typos
+from pair_store import PairStore
+
+
+def test_articles_and_punctuation_are_ignored_by_default():
+    matcher = AnswerMatcher(PairStore([("het huis", "the house"), ("de auto", "the car!")]))
+    assert matcher.check("house", 0, "meaning") == CORRECT
+    assert matcher.check("The House.", 0, "meaning") == CORRECT
+    assert matcher.check("huis", 0, "word") == CORRECT
+    assert matcher.check("car", 1, "meaning") == CORRECT
+    assert matcher.check("the", 0, "meaning") == INCORRECT
+
+
+def test_strict_matching_can_be_turned_on():
+    matcher = AnswerMatcher(PairStore([("het huis", "the house!")]),
+                            strip_articles=False, strip_punctuation=False)
+    assert matcher.check("the house!", 0, "meaning") == CORRECT
+    assert not matcher.is_correct("the house", 0, "meaning")
+    assert not matcher.is_correct("house!", 0, "meaning")
+
+
+def test_variants_in_parentheses_and_alternatives_are_accepted():
+    matcher = AnswerMatcher(PairStore([("de lerares", "the teacher (female)"),
+                                       ("de directeur", "the director/principal"),
+                                       ("km/u", "km/h")]))
+    for answer in ("teacher", "the teacher (female)", "teacher female"):
+        assert matcher.is_correct(answer, 0, "meaning"), answer
+    for answer in ("director", "the principal", "principal"):
+        assert matcher.is_correct(answer, 1, "meaning"), answer
+    assert matcher.is_correct("km/h", 2, "meaning")
+    assert not matcher.is_correct("km", 2, "meaning")
+
+
+def test_typos_are_close_within_max_typos():
+    matcher = AnswerMatcher(PairStore([("de boom", "the tree"), ("het raam", "the window")]))
+    assert matcher.check("tere", 0, "meaning") == CLOSE
+    assert matcher.check("windwo", 1, "meaning") == CLOSE
+    assert matcher.check("wnidwo", 1, "meaning") == INCORRECT
+    assert matcher.check("tre", 0, "meaning") == INCORRECT  # too short for typos
+    assert [max_typos(n) for n in (3, 4, 7, 8)] == [0, 1, 1, 2]
+
+
+def test_another_cards_answer_is_not_a_typo():
+    matcher = AnswerMatcher(PairStore([("het huis", "the house"), ("de muis", "the mouse")]))
+    assert matcher.check("muis", 0, "word") == INCORRECT
+    assert matcher.suggest("muis", "word", exclude=0) == 1
+    assert matcher.check("mouse", 0, "meaning") == INCORRECT
+    assert matcher.check("huys", 0, "word") == CLOSE
+
+
+def test_check_text_grades_unindexed_pairs():
+    matcher = AnswerMatcher()
+    assert matcher.check_text("house", "the house") == CORRECT
+    assert matcher.check_text("hous", "the house") == CLOSE
+
+
+def test_suggest_finds_the_card_an_answer_belongs_to():
+    matcher = AnswerMatcher(PairStore([("het huis", "the house"), ("de boom", "the tree"),
+                                       ("de tuin", "the garden")]))
+    assert matcher.suggest("tree", "meaning", exclude=0) == 1
+    assert matcher.suggest("gardne", "meaning", exclude=0) == 2
+    assert matcher.suggest("house", "meaning", exclude=0) is None
+
+
+def test_for_pairs_shares_one_matcher_per_deck():
+    pairs = PairStore([("het huis", "the house")])
+    assert AnswerMatcher.for_pairs(pairs) is AnswerMatcher.for_pairs(pairs)
+    assert AnswerMatcher.for_pairs(pairs) is not AnswerMatcher.for_pairs(pairs, strip_articles=False)
+
+
+def _full_distance(a, b):
+    """Unbounded optimal string alignment distance."""
+    d = [[i + j if not i or not j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def test_edit_distance_matches_the_full_table():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        bound = rng.randint(0, 3)
+        assert edit_distance(a, b, bound) == min(_full_distance(a, b), bound + 1), (a, b, bound)
+
+
+def test_suggest_finds_transposed_answers():
+    matcher = AnswerMatcher(PairStore([("x", "hbga"), ("y", "zzzz")]))
+    assert matcher.suggest("hgba", "meaning", exclude=1) == 0
+
+
+def test_ngram_candidates_include_every_card_within_the_distance():
+    rng = random.Random(3)
+    texts = ["".join(rng.choice("abcd") for _ in range(rng.randint(4, 9))) for _ in range(300)]
+    matcher = AnswerMatcher(PairStore([(text, text) for text in texts]))
+    for _ in range(300):
+        typed = "".join(rng.choice("abcd") for _ in range(rng.randint(4, 9)))
+        limit = max_typos(len(typed))
+        expected = None
+        best = limit + 1
+        for index, text in enumerate(texts):
+            distance = edit_distance(typed, text, best - 1)
+            if distance < best:
+                expected, best = index, distance
+        if typed in texts:
+            continue  # found by the exact lookup instead
+        assert matcher.suggest(typed, "meaning", exclude=-1) == expected, typed
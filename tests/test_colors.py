@@ -0,0 +1,29 @@
+import pytest
+
+from colors import Colors, styling_supported
+
+
+@pytest.fixture
+def restore_colors():
+    enabled = Colors.enabled
+    yield
+    Colors.configure(enabled)
+
+
+def test_helpers_follow_configure(restore_colors):
+    Colors.configure(True)
+    assert Colors.red("x") == f"{Colors.RED}x{Colors.RESET}"
+    assert Colors.bold_green(3) == f"{Colors.BOLD}{Colors.GREEN}3{Colors.RESET}"
+    assert Colors.CYAN in Colors.rule()
+    Colors.configure(False)
+    assert Colors.red("x") == "x"
+    assert Colors.bold_green(3) == "3"
+    assert Colors.rule(3) == "==="
+    assert Colors.banner("T", 3) == "\n===\nT\n==="
+
+
+def test_styling_is_off_for_pipes_and_no_color(monkeypatch, tmp_path):
+    with open(tmp_path / "out.txt", "w") as stream:
+        assert not styling_supported(stream)
+    monkeypatch.setenv("NO_COLOR", "1")
+    assert not styling_supported()
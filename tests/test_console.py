@@ -0,0 +1,33 @@
+import io
+
+import pytest
+
+from console import Console, ScriptedConsole, ScriptExhausted, percentiles
+
+
+def test_a_console_must_implement_print_and_input():
+    class PrintOnly(Console):
+        def print(self, *values, sep=" ", end="\n"):
+            pass
+
+    with pytest.raises(TypeError):
+        PrintOnly()
+    with pytest.raises(TypeError):
+        Console()
+
+
+def test_scripted_console_answers_in_order_then_runs_out():
+    output = io.StringIO()
+    console = ScriptedConsole(["1", "huis"], output=output, echo=True)
+    assert console.input("Choice: ") == "1"
+    console.page("a page\n")
+    assert console.input("Answer: ") == "huis"
+    with pytest.raises(ScriptExhausted):
+        console.input("More: ")
+    assert output.getvalue().startswith("Choice: 1\na page\nAnswer: huis\n")
+    assert console.answers_given == 2
+
+
+def test_percentiles_use_the_nearest_rank():
+    assert percentiles([3, 1, 2, 4]) == {"p50": 2, "p90": 4, "p99": 4}
+    assert percentiles([]) == {}
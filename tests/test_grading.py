@@ -0,0 +1,43 @@
+import io
+
+from answer_matcher import CLOSE, CORRECT, INCORRECT
+# Imported as a module so pytest doesn't try to collect the TestSummary class
+import grading
+from grading import build_result, read_answer_rows
+from pair_store import Pair
+
+
+def result(outcome):
+    return build_result(1, Pair("huis", "house"), True, "answer", outcome, None)
+
+
+def test_summary_counts_and_keeps_limited_detail():
+    summary = grading.TestSummary(detail_limit=1)
+    for outcome in (CORRECT, CLOSE, INCORRECT, INCORRECT):
+        summary.add(result(outcome))
+    assert (summary.total, summary.correct, summary.close, summary.incorrect) == (4, 2, 1, 2)
+    assert len(summary.wrong_answers) == 1
+    assert summary.percentage == 50.0
+
+
+def test_merge_through_dicts():
+    first, second = grading.TestSummary(), grading.TestSummary()
+    first.add(result(CORRECT))
+    second.add(result(INCORRECT))
+    second.add_invalid()
+    merged = grading.TestSummary().merge(grading.TestSummary.from_dict(first.to_dict()))
+    merged.merge(grading.TestSummary.from_dict(second.to_dict()))
+    assert merged.to_dict()["incorrect"] == 1
+    assert merged.invalid == 1
+
+
+def test_build_result_for_meaning_to_word():
+    row = build_result(2, Pair("huis", "house"), False, "huis", CORRECT, None)
+    assert (row["question"], row["correct_answer"], row["question_type"]) == ("house", "huis", "Meaning → Word")
+
+
+def test_read_rows_with_and_without_header():
+    with_header = io.StringIO("student,question_id,answer\nann, w1 ,house\n")
+    assert list(read_answer_rows(with_header)) == [("w1", "house", {"student": "ann"})]
+    plain = io.StringIO("w1,house\nm2\n")
+    assert list(read_answer_rows(plain)) == [("w1", "house", {}), ("m2", "", {})]
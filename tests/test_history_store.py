@@ -0,0 +1,32 @@
+import pytest
+
+from answer_matcher import CLOSE, CORRECT, INCORRECT
+from history_store import HistoryStore, SessionRecorder, open_session
+
+
+def test_recorder_buffers_and_flushes_on_exit(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    with pytest.raises(RuntimeError):
+        with open_session("test", "deck", "random", store) as recorder:
+            recorder.record("huis", "house", "meaning", CORRECT, 1.0)
+            assert store.totals("deck")["answers"] == 0
+            raise RuntimeError("crashed")
+    assert store.totals("deck")["answers"] == 1
+
+
+def test_recorder_writes_every_flush_every_answers(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    recorder = open_session("learn", "deck", None, store)
+    for _ in range(SessionRecorder.FLUSH_EVERY):
+        recorder.record("huis", "house", "meaning", CORRECT, 1.0)
+    assert store.totals("deck")["answers"] == SessionRecorder.FLUSH_EVERY
+
+
+def test_card_stats_count_close_answers_as_correct(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    with open_session("test", "deck", None, store) as recorder:
+        for result, latency in ((CORRECT, 1.0), (CLOSE, 2.0), (INCORRECT, 3.0)):
+            recorder.record("huis", "house", "meaning", result, latency)
+    [card] = store.card_stats("deck")
+    assert (card["asked"], card["correct"], card["close"], card["mean_latency"]) == (3, 2, 1, 2.0)
+    assert store.card_stats("other") == []
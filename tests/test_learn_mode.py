@@ -0,0 +1,20 @@
+import io
+
+from console import ScriptedConsole
+from learn_mode import LearnMode
+from pair_store import PairStore
+from progress_store import ProgressStore
+
+
+def test_reviews_are_saved_and_restored(tmp_path):
+    store = ProgressStore(tmp_path / "progress.db")
+    wordlist = {"name": "deck", "pairs": PairStore([("huis", "huis")])}
+    LearnMode(wordlist, console=ScriptedConsole(["4", "huis", "5"]), progress=store).start()
+    assert [row[:6] for row in store.load_reviews("deck")] == [(0, "huis", "huis", 2.5, 1.0, 1)]
+
+    output = io.StringIO()
+    later = LearnMode(wordlist, console=ScriptedConsole(["4", "5"], output=output), progress=store)
+    later.start()
+    assert not later.scheduler.is_new(0)
+    assert "0 cards due, 0 never reviewed" in output.getvalue()
+    assert "Next review in about" in output.getvalue()
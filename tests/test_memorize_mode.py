@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+from console import ScriptExhausted, ScriptedConsole
+from history_store import HistoryStore
+from memorize_mode import MemorizeMode
+from pair_store import PairStore
+from progress_store import ProgressStore
+
+
+def test_resume_restores_duplicate_and_moved_cards(tmp_path):
+    store = ProgressStore(tmp_path / "progress.db")
+    store.save_stages("deck", [(0, "een", "one", 2), (1, "een", "one", 3)])
+    pairs = PairStore([("nieuw", "new"), ("een", "one"), ("een", "one")])
+    mode = MemorizeMode({"name": "deck", "pairs": pairs}, progress=store,
+                        console=ScriptedConsole(["y"]))
+    mode._offer_resume()
+    assert sorted(mode.word_stages) == [0, 2, 3] and mode.word_stages[0] == 0
+    assert sorted(row[0] for row in store.load_stages("deck")) == [1, 2]
+
+
+def test_failed_questions_are_asked_once_more():
+    output = io.StringIO()
+    console = ScriptedConsole(["", "x", "x", "x", "x", "n"], output=output)
+    mode = MemorizeMode({"name": "deck", "pairs": PairStore([("huis", "house")])},
+                        new_words_per_run=1, questions_per_run=1, requeue_failed=True,
+                        console=console, save_progress=False)
+    mode.start()
+    assert console.answers_given == 6
+    assert "Question 2/2" in output.getvalue()
+    assert "Question 3" not in output.getvalue()
+
+
+def test_recalled_answers_are_recorded_even_when_the_session_fails(tmp_path):
+    history = HistoryStore(tmp_path / "history.db")
+    mode = MemorizeMode({"name": "deck", "pairs": PairStore([("huis", "house")])},
+                        new_words_per_run=1, questions_per_run=1, console=ScriptedConsole(
+                            ["", "huis", "house", "", "hous"]),
+                        save_progress=False, history=history)
+    with pytest.raises(ScriptExhausted):
+        mode.start()
+    # Stage 1 is copied from the screen; the stage 2 answer was close
+    assert [(row["word"], row["asked"], row["close"]) for row in history.card_stats("deck")] == [
+        ("huis", 1, 1)]
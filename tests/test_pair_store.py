@@ -0,0 +1,31 @@
+import pickle
+
+from pair_store import Pair, PairStore
+
+
+def test_pairs_read_like_dicts():
+    store = PairStore([("huis", "house"), ("boom", "tree")])
+    assert len(store) == 2
+    assert store[0]["word"] == "huis"
+    assert store[1].get("meaning") == "tree"
+    assert store[1].get("missing", "-") == "-"
+    assert list(store) == [Pair("huis", "house"), Pair("boom", "tree")]
+    assert store[0].to_dict() == {"word": "huis", "meaning": "house"}
+
+
+def test_columns_and_slices():
+    store = PairStore.from_columns(["a", "b", "c"], ["x", "y", "x"])
+    assert store.words == ["a", "b", "c"]
+    assert store.meanings == ["x", "y", "x"]
+    assert store[1:] == PairStore([("b", "y"), ("c", "x")])
+    assert store[-1] == Pair("c", "x")
+
+
+def test_repeated_meanings_share_one_string():
+    store = PairStore([("a", "".join(["sh", "ared"])), ("b", "".join(["sha", "red"]))])
+    assert store.meanings[0] is store.meanings[1]
+
+
+def test_pickle_round_trip():
+    store = PairStore([("a", "x"), ("b", "y")])
+    assert pickle.loads(pickle.dumps(store)) == store
@@ -0,0 +1,39 @@
+from progress_store import ProgressStore, match_saved_cards
+
+
+def test_reviews_round_trip(tmp_path):
+    store = ProgressStore(tmp_path / "progress.db")
+    store.save_reviews("deck", [(0, "een", "one", 2.5, 1.0, 1, 0, 86400.0)])
+    store.save_reviews("deck", [(0, "een", "one", 2.6, 6.0, 2, 0, 600000.0)])
+    store.save_reviews("other", [(0, "x", "y", 2.5, 1.0, 1, 0, 1.0)])
+    assert store.load_reviews("deck") == [(0, "een", "one", 2.6, 6.0, 2, 0, 600000.0)]
+    store.save_reviews("deck", [(3, "twee", "two", 2.5, 1.0, 1, 0, 5.0)], replace_all=True)
+    assert [row[0] for row in store.load_reviews("deck")] == [3]
+    store.close()
+    assert len(ProgressStore(tmp_path / "progress.db").load_reviews("other")) == 1
+
+
+def test_match_saved_cards_follows_moved_and_duplicate_cards():
+    words = ["nieuw", "een", "twee", "een"]
+    meanings = ["new", "one", "two", "one"]
+    rows = [(1, "twee", "two", "a"), (0, "een", "one", "b"), (3, "een", "one", "c"),
+            (2, "weg", "gone", "d")]
+    matched, moved = match_saved_cards(rows, words, meanings)
+    assert moved
+    assert sorted((index, row[3]) for index, row in matched) == [(1, "b"), (2, "a"), (3, "c")]
+
+
+def test_match_saved_cards_in_place():
+    rows = [(0, "een", "one"), (1, "twee", "two")]
+    matched, moved = match_saved_cards(rows, ["een", "twee"], ["one", "two"])
+    assert not moved
+    assert matched == [(0, rows[0]), (1, rows[1])]
+
+
+def test_duplicate_cards_keep_their_own_stage(tmp_path):
+    store = ProgressStore(tmp_path / "progress.db")
+    store.save_stages("deck", [(0, "een", "one", 2), (1, "een", "one", 3)])
+    assert sorted(store.load_stages("deck")) == [(0, "een", "one", 2), (1, "een", "one", 3)]
+    store.clear("deck")
+    assert store.load_stages("deck") == []
+
@@ -0,0 +1,48 @@
+import random
+from collections import Counter
+
+import pytest
+
+from sampling import IndexedSet, WeightedSampler
+
+
+def test_indexed_set_add_remove():
+    members = IndexedSet(10, [1, 5, 7])
+    members.remove(5)
+    members.add(1)
+    members.discard(9)
+    assert sorted(members) == [1, 7]
+    assert 5 not in members and 7 in members and 42 not in members
+    with pytest.raises(KeyError):
+        members.remove(5)
+
+
+def test_indexed_set_sample_is_distinct():
+    members = IndexedSet.full(100)
+    drawn = members.sample(30, random.Random(1))
+    assert len(set(drawn)) == 30
+    assert all(item in members for item in drawn)
+
+
+def test_weighted_sampler_follows_weights():
+    sampler = WeightedSampler(3)
+    sampler.set_weight(0, 1)
+    sampler.set_weight(2, 3)
+    rng = random.Random(7)
+    counts = Counter(sampler.draw(rng) for _ in range(4000))
+    assert counts[1] == 0
+    assert 2.5 < counts[2] / counts[0] < 3.5
+
+
+def test_weighted_sample_restores_weights():
+    sampler = WeightedSampler(5)
+    for item in range(5):
+        sampler.set_weight(item, item + 1)
+    drawn = sampler.sample(5, random.Random(3))
+    assert sorted(drawn) == [0, 1, 2, 3, 4]
+    assert sampler.total == 15
+
+
+def test_empty_sampler_refuses_to_draw():
+    with pytest.raises(ValueError):
+        WeightedSampler(2).draw()
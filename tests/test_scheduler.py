@@ -0,0 +1,48 @@
+import random
+
+from scheduler import DAY, ReviewScheduler
+
+
+def test_new_cards_are_introduced_then_scheduled():
+    scheduler = ReviewScheduler(3, clock=lambda: 0.0, rng=random.Random(1))
+    seen = set()
+    for _ in range(3):
+        card = scheduler.next_card(now=0.0)
+        assert scheduler.is_new(card)
+        scheduler.record(card, 4, now=0.0)
+        seen.add(card)
+    assert seen == {0, 1, 2}
+    assert scheduler.next_card(now=0.0) is None
+    assert scheduler.new_count() == 0
+    assert scheduler.due_count(now=DAY) == 3
+    assert scheduler.next_due_time() == DAY
+
+
+def test_sm2_intervals_and_lapses():
+    scheduler = ReviewScheduler(1)
+    assert scheduler.record(0, 5, now=0.0) == DAY
+    assert scheduler.record(0, 5, now=0.0) == 6 * DAY
+    easiness = scheduler.card_state(0)[0]
+    assert scheduler.record(0, 5, now=0.0) == round(6 * easiness) * DAY
+    assert scheduler.record(0, 1, now=0.0) == ReviewScheduler.RELEARN_DELAY
+    state = scheduler.card_state(0)
+    assert state[2] == 0 and state[3] == 1
+    assert state[0] >= ReviewScheduler.MIN_EASINESS
+
+
+def test_forgotten_card_is_asked_before_new_ones_once_due():
+    scheduler = ReviewScheduler(5, rng=random.Random(2))
+    first = scheduler.next_card(now=0.0)
+    scheduler.record(first, 0, now=0.0)
+    assert scheduler.next_card(now=ReviewScheduler.RELEARN_DELAY) == first
+    assert scheduler.next_card(now=0.0) != first
+
+
+def test_restore_brings_back_a_saved_state():
+    original = ReviewScheduler(2)
+    original.record(1, 4, now=100.0)
+    copy = ReviewScheduler(2)
+    copy.restore(1, *original.card_state(1))
+    assert copy.card_state(1) == original.card_state(1)
+    assert not copy.is_new(1) and copy.is_new(0)
+    assert copy.next_due_time() == 100.0 + DAY
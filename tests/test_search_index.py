@@ -0,0 +1,15 @@
+from search_index import SubstringIndex
+
+
+def test_find_matches_a_brute_force_scan():
+    words = ["het huis", "de boom", "de tuin", "huisdier"]
+    meanings = ["the house", "the tree", "the garden", "pet"]
+    index = SubstringIndex(words, meanings)
+    for query in ("huis", "HUIS", "he", "the", "tree", "arden", "x", "de t"):
+        expected = [i for i, (w, m) in enumerate(zip(words, meanings))
+                    if query.casefold() in w.casefold() or query.casefold() in m.casefold()]
+        assert index.find(query) == expected
+
+
+def test_matches_never_span_word_and_meaning():
+    assert SubstringIndex(["ab"], ["cd"]).find("bc") == []
@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+
+from server import FlashcardServer, Request, SessionStore
+from wordlist_manager import WordlistManager
+
+DECK = {"het huis": "the house", "de boom": "the tree", "de tuin": "the garden", "het raam": "the window"}
+
+
+@pytest.fixture
+def server(tmp_path, write_json):
+    write_json("Dutch/basics", DECK)
+    server = FlashcardServer(WordlistManager(str(tmp_path / "wordlists")), record_history=False)
+    yield server
+    server.close()
+
+
+def call(server, method, path, data=None, headers=None):
+    """Handle one request and return (status, headers, parsed JSON body or None)."""
+    body = json.dumps(data).encode("utf-8") if data is not None else b""
+    response = asyncio.run(server.handle(Request(method, path, "HTTP/1.1", headers or {}, body)))
+    return response.status, response.headers, json.loads(response.body) if response.body else None
+
+
+def test_wordlists_and_decks_are_listed_and_revalidated(server):
+    status, _, catalog = call(server, "GET", "/api/wordlists")
+    assert status == 200
+    assert [entry["name"] for entry in catalog["wordlists"]] == ["Dutch/basics"]
+    assert [folder["name"] for folder in catalog["folders"]] == ["Dutch/"]
+
+    status, headers, deck = call(server, "GET", "/api/wordlists/Dutch/basics")
+    assert status == 200 and len(deck["pairs"]) == 4
+    status, _, _ = call(server, "GET", "/api/wordlists/Dutch/basics", headers={"if-none-match": headers["ETag"]})
+    assert status == 304
+    status, _, folder = call(server, "GET", "/api/wordlists/Dutch")
+    assert status == 200 and folder["name"] == "Dutch/"
+    assert call(server, "GET", "/api/wordlists/missing")[0] == 404
+
+
+def test_a_changed_deck_is_served_before_the_directory_is_checked_again(server, write_json):
+    server.decks.CATALOG_TTL = 3600.0
+    _, headers, _ = call(server, "GET", "/api/wordlists/Dutch/basics")
+    path = write_json("Dutch/basics", dict(DECK, **{"de kat": "the cat"}))
+
+    status, changed, deck = call(server, "GET", "/api/wordlists/Dutch/basics",
+                                 headers={"if-none-match": headers["ETag"]})
+    assert status == 200 and len(deck["pairs"]) == 5
+    assert changed["ETag"] != headers["ETag"]
+    assert len(call(server, "GET", "/api/wordlists/Dutch/")[2]["pairs"]) == 5
+
+    path.unlink()
+    assert call(server, "GET", "/api/wordlists/Dutch/basics")[0] == 404
+
+
+def test_a_test_session_is_answered_until_it_is_finished(server):
+    status, headers, state = call(server, "POST", "/api/sessions",
+                                  {"mode": "test", "wordlist": "Dutch/basics", "questions": 2, "seed": 1})
+    assert status == 201 and headers["Location"] == f"/api/sessions/{state['id']}"
+    assert call(server, "GET", f"/api/sessions/{state['id']}")[2]["answered"] == 0
+
+    answers = {**DECK, **{meaning: word for word, meaning in DECK.items()}}
+    question = state["question"]
+    for _ in range(2):
+        status, _, result = call(server, "POST", f"/api/sessions/{state['id']}/answer",
+                                 {"answer": answers[question["prompt"]]})
+        assert status == 200 and result["result"] == "correct"
+        question = result["next"]
+    assert result["done"] and result["summary"]["correct"] == 2
+    assert call(server, "POST", f"/api/sessions/{state['id']}/answer", {"answer": "x"})[0] == 400
+    assert call(server, "DELETE", f"/api/sessions/{state['id']}")[0] == 204
+    assert call(server, "GET", f"/api/sessions/{state['id']}")[0] == 404
+
+
+def test_a_memorize_session_starts_at_stage_one(server):
+    status, _, state = call(server, "POST", "/api/sessions", {"mode": "memorize", "wordlist": "Dutch/"})
+    assert status == 201 and state["question"]["stage"] == 1
+    question = state["question"]
+    status, _, result = call(server, "POST", f"/api/sessions/{state['id']}/answer",
+                             {"word": question["word"], "meaning": question["meaning"]})
+    assert status == 200 and result["result"] == "correct"
+    assert call(server, "POST", "/api/sessions", {"mode": "memorize", "wordlist": "Dutch/",
+                                                  "new_words_per_run": 0})[0] == 400
+
+
+def test_sessions_are_limited_by_count_and_size(server, monkeypatch):
+    monkeypatch.setattr(SessionStore, "MAX_SESSIONS", 2)
+    options = {"mode": "test", "wordlist": "Dutch/basics"}
+    assert call(server, "POST", "/api/sessions", options)[0] == 201
+    assert call(server, "POST", "/api/sessions", options)[0] == 201
+    status, headers, _ = call(server, "POST", "/api/sessions", options)
+    assert status == 503 and headers["Retry-After"] == "60"
+
+    server.sessions.close()
+    monkeypatch.setattr(SessionStore, "MAX_SESSIONS", 100)
+    monkeypatch.setattr(SessionStore, "MAX_SESSION_BYTES", 3000)
+    assert call(server, "POST", "/api/sessions", {"mode": "memorize", "wordlist": "Dutch/"})[0] == 201
+    assert call(server, "POST", "/api/sessions", {"mode": "memorize", "wordlist": "Dutch/"})[0] == 201
+    assert call(server, "POST", "/api/sessions", {"mode": "memorize", "wordlist": "Dutch/"})[0] == 503
+
+
+def exchange(server, raw):
+    """Send raw bytes to a listening server and return the status and error of its response."""
+    async def run():
+        listener = await server.start("127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+            writer.write(raw)
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            body = json.loads(await reader.readexactly(length))
+            writer.close()
+            return int(head.split(b" ")[1]), body["error"]
+        finally:
+            listener.close()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("length, status, error", [
+    (None, 400, "missing Content-Length"), ("-1", 400, "invalid Content-Length"),
+    ("abc", 400, "invalid Content-Length"), ("+2", 400, "invalid Content-Length"),
+    (str(2 * 1024 * 1024), 413, "request body too large"), ("2", 400, "'wordlist' must be a wordlist name"),
+])
+def test_content_length_is_checked(server, length, status, error):
+    header = f"Content-Length: {length}\r\n" if length is not None else ""
+    raw = f"POST /api/sessions HTTP/1.1\r\nHost: x\r\n{header}\r\n{{}}".encode("latin-1")
+    assert exchange(server, raw) == (status, error)
+
+
+def test_only_recently_used_decks_and_files_are_kept(server, write_json, monkeypatch):
+    write_json("other", {"a": "x"})
+    monkeypatch.setattr(type(server.decks), "MAX_DECKS", 1)
+    for name in ("Dutch/basics", "other", "Dutch/"):
+        assert call(server, "GET", f"/api/wordlists/{name}")[0] == 200
+    assert list(server.decks._decks) == ["Dutch/"]
+
+    server.root = server.wordlists_dir.parent
+    monkeypatch.setattr(FlashcardServer, "MAX_STATIC_FILES", 1)
+    for path in ("/wordlists/other.json", "/wordlists/Dutch/basics.json"):
+        assert call(server, "GET", path)[0] == 200
+    assert len(server._static) == 1
@@ -0,0 +1,39 @@
+import pytest
+
+# Imported as a module so pytest doesn't try to collect the TestGenerator class
+import test_generator
+from pair_store import PairStore
+from test_generator import deck_fingerprint, parse_question_id, question_id
+
+
+def test_question_ids_round_trip():
+    assert question_id(17, True) == "w17"
+    assert question_id(17, True, "3fa2c1d0") == "w17@3fa2c1d0"
+    assert parse_question_id("m3") == (3, False, None)
+    assert parse_question_id("m3@3fa2c1d0") == (3, False, "3fa2c1d0")
+    for text in ("x1", "w", "w1a", "", "w1@"):
+        with pytest.raises(ValueError):
+            parse_question_id(text)
+
+
+def test_seeded_tests_are_reproducible_one_at_a_time():
+    batch = list(test_generator.TestGenerator(50, seed=4).generate_many(3, 10, "random"))
+    again = test_generator.TestGenerator(50, seed=4).generate(10, "random", number=3)
+    assert list(again) == list(batch[2])
+    assert len(set(batch[0].cards)) == 10
+
+
+def test_directions():
+    assert test_generator.TestGenerator.directions(3, "word-to-meaning") == b"\x01\x01\x01"
+    assert test_generator.TestGenerator.directions(2, "meaning-to-word") == b"\x00\x00"
+    assert set(test_generator.TestGenerator.directions(64, "random")) <= {0, 1}
+    with pytest.raises(ValueError):
+        test_generator.TestGenerator.directions(1, "sideways")
+
+
+def test_deck_fingerprint_follows_content_and_order():
+    deck = PairStore([("een", "one"), ("twee", "two")])
+    assert deck_fingerprint(deck) == deck_fingerprint([{"word": "een", "meaning": "one"},
+                                                       {"word": "twee", "meaning": "two"}])
+    assert deck_fingerprint(deck) != deck_fingerprint(PairStore([("twee", "two"), ("een", "one")]))
+    assert deck_fingerprint(deck) != deck_fingerprint(PairStore([("een", "one"), ("twee", "twee")]))
@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+
+from pair_store import PairStore
+# Imported as modules so pytest doesn't try to collect the TestMode and TestGenerator classes
+import test_generator
+import test_mode
+
+
+def export_and_read_key(mode, tmp_path):
+    key_path = mode.export_exams(tmp_path / "exams", 2, 3, "random", seed=5)[0]
+    with open(key_path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_exported_answers_grade_correctly(tmp_path):
+    deck = {"name": "deck", "pairs": PairStore([("een", "one"), ("twee", "two"), ("drie", "three")])}
+    mode = test_mode.TestMode(deck)
+    key = export_and_read_key(mode, tmp_path)
+    summary = mode.grade_batch([(row["question_id"], row["answer"]) for row in key])
+    assert (summary.total, summary.correct, summary.invalid) == (6, 6, 0)
+
+
+def test_answers_to_another_deck_version_are_not_graded(tmp_path):
+    old = {"name": "deck", "pairs": PairStore([("een", "one"), ("twee", "two"), ("drie", "three")])}
+    key = export_and_read_key(test_mode.TestMode(old), tmp_path)
+    new = {"name": "deck", "pairs": PairStore([("nul", "zero"), ("een", "one"), ("twee", "two")])}
+    summary = test_mode.TestMode(new).grade_batch([(row["question_id"], row["answer"]) for row in key]
+                                                  + [("w0", "zero")])
+    assert (summary.total, summary.invalid, summary.wrong_deck) == (0, 7, 6)
+
+
+def test_batch_answers_naming_another_card_are_wrong():
+    pairs = PairStore([("het huis", "the house"), ("de muis", "the mouse")])
+    fingerprint = test_generator.deck_fingerprint(pairs)
+    report = io.StringIO()
+    summary = test_mode.TestMode({"name": "deck", "pairs": pairs}).grade_batch(
+        [(test_generator.question_id(0, False, fingerprint), "muis"),
+         (test_generator.question_id(0, True, fingerprint), "mouse"),
+         (test_generator.question_id(1, False, fingerprint), "muys")], report)
+    assert (summary.total, summary.correct, summary.close) == (3, 1, 1)
+    assert [json.loads(line)["result"] for line in report.getvalue().splitlines()] == [
+        "incorrect", "incorrect", "close"]
+    assert [result["suggestion"] is not None for result in summary.wrong_answers] == [True, True]
@@ -0,0 +1,64 @@
+import contextlib
+import os
+
+import pytest
+
+from pair_store import PairStore
+from view_mode import ViewMode, _sequence_complete
+
+
+@pytest.mark.parametrize("sequence, complete", [
+    ("", False), ("[", False), ("[5", False), ("[5~", True), ("[A", True), ("[1;5A", True),
+    ("O", False), ("OH", True), ("x", True),
+])
+def test_sequence_complete(sequence, complete):
+    assert _sequence_complete(sequence) is complete
+
+
+@pytest.mark.skipif(os.name == "nt", reason="reads a POSIX file descriptor")
+@pytest.mark.parametrize("typed, key", [
+    ("\x1b[A", "up"), ("\x1b[6~", "pgdn"), ("\x1bOH", "home"), ("\x1bOF", "end"),
+    ("\x1b[F", "end"), ("\x1b", "escape"), ("é", "é"), ("\r", "enter"),
+])
+def test_read_key(monkeypatch, typed, key):
+    read_fd, write_fd = os.pipe()
+    try:
+        # A second key right behind must not be swallowed by the first one
+        os.write(write_fd, (typed + "q").encode("utf-8") if typed != "\x1b" else b"\x1b")
+        monkeypatch.setattr("sys.stdin", os.fdopen(read_fd, closefd=False))
+        view = ViewMode({"name": "deck", "pairs": PairStore([("een", "one")])})
+        assert view._read_key() == key
+        if typed != "\x1b":
+            assert view._read_key() == "q"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="reads a POSIX file descriptor")
+@pytest.mark.parametrize("typed, keys", [(b"", ["eof"]), (b"\x1b[", ["", "eof"]), (b"/ab", ["/", "a", "b", "eof"])])
+def test_closed_stdin_reads_as_eof(monkeypatch, typed, keys):
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, typed)
+    os.close(write_fd)
+    try:
+        monkeypatch.setattr("sys.stdin", os.fdopen(read_fd, closefd=False))
+        view = ViewMode({"name": "deck", "pairs": PairStore([("een", "one")])})
+        assert [view._read_key() for _ in keys] == keys
+    finally:
+        os.close(read_fd)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="reads a POSIX file descriptor")
+def test_browsing_ends_when_stdin_is_closed(monkeypatch, capsys):
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"j/on")
+    os.close(write_fd)
+    try:
+        monkeypatch.setattr("sys.stdin", os.fdopen(read_fd, closefd=False))
+        view = ViewMode({"name": "deck", "pairs": PairStore([("een", "one"), ("twee", "two")])})
+        monkeypatch.setattr(view, "_raw_terminal", contextlib.nullcontext)
+        view._browse()
+    finally:
+        os.close(read_fd)
+    assert capsys.readouterr().out.endswith("\033[?25h\033[?1049l")
@@ -0,0 +1,33 @@
+from wordlist_cache import WordlistCache
+
+
+def test_disk_cache_survives_a_new_instance(tmp_path):
+    source = tmp_path / "deck.json"
+    source.write_text("{}", encoding="utf-8")
+    key = WordlistCache.file_key(source)
+
+    WordlistCache(cache_dir=tmp_path / "cache").put(key, ["parsed"])
+    assert WordlistCache(cache_dir=tmp_path / "cache").get(key) == ["parsed"]
+
+
+def test_changed_file_misses(tmp_path):
+    source = tmp_path / "deck.json"
+    source.write_text("{}", encoding="utf-8")
+    cache = WordlistCache(cache_dir=tmp_path / "cache")
+    cache.put(WordlistCache.file_key(source), ["old"])
+
+    source.write_text('{"a": "b"}', encoding="utf-8")
+    assert cache.get(WordlistCache.file_key(source)) is None
+
+
+def test_memory_lru_evicts_oldest(tmp_path):
+    cache = WordlistCache(max_entries=2, use_disk=False)
+    keys = [(str(tmp_path / f"{n}.json"), 0, 0) for n in range(3)]
+    for n, key in enumerate(keys):
+        cache.put(key, n)
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == 2
+
+
+def test_missing_file_has_no_key(tmp_path):
+    assert WordlistCache.file_key(tmp_path / "missing.json") is None
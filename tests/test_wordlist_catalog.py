@@ -0,0 +1,65 @@
+import json
+import os
+
+from wordlist_catalog import WordlistCatalog
+from wordlist_manager import WordlistManager
+
+
+def entries_by_name(catalog):
+    return {entry["name"]: entry for entry in catalog.entries()}
+
+
+def test_lists_nested_files_without_opening_them(write_json, tmp_path):
+    write_json("top", {"a": "x"})
+    write_json("Dutch/A2/huis", {"huis": "house", "boom": "tree"})
+    catalog = WordlistCatalog(tmp_path / "wordlists", index_dir=tmp_path / "index")
+    entries = entries_by_name(catalog)
+    assert set(entries) == {"top", "Dutch/A2/huis"}
+    assert entries["Dutch/A2/huis"]["folder"] == "Dutch"
+    assert entries["top"]["pair_count"] is None
+
+
+def test_file_rewritten_in_place_is_noticed(write_json, tmp_path):
+    path = write_json("deck", {"a": "x"})
+    manager = WordlistManager(str(tmp_path / "wordlists"))
+    manager.load_wordlist("deck")
+    assert manager.get_catalog()[0]["pair_count"] == 1
+
+    # Same directory mtime, new contents
+    dir_mtime = os.stat(path.parent).st_mtime_ns
+    path.write_text(json.dumps({"a": "x", "b": "y", "c": "z"}), encoding="utf-8")
+    os.utime(path.parent, ns=(dir_mtime, dir_mtime))
+
+    entry = manager.get_catalog()[0]
+    assert entry["size"] == path.stat().st_size
+    assert entry["pair_count"] is None
+    manager.load_wordlist("deck")
+    assert manager.get_catalog()[0]["pair_count"] == 3
+
+
+def test_index_persists_counts_and_drops_removed_files(write_json, tmp_path):
+    write_json("keep", {"a": "x"})
+    gone = write_json("gone", {"b": "y"})
+    WordlistManager(str(tmp_path / "wordlists")).load_wordlist("keep")
+
+    gone.unlink()
+    entries = {entry["name"]: entry for entry in WordlistManager(str(tmp_path / "wordlists")).get_catalog()}
+    assert list(entries) == ["keep"]
+    assert entries["keep"]["pair_count"] == 1
+
+
+def test_failed_load_marks_the_file_invalid(tmp_path):
+    (tmp_path / "wordlists").mkdir()
+    (tmp_path / "wordlists" / "bad.json").write_text("{not json", encoding="utf-8")
+    manager = WordlistManager(str(tmp_path / "wordlists"))
+    assert manager.load_wordlist("bad") is None
+    assert manager.get_catalog()[0]["invalid"]
+
+
+def test_folder_totals_wait_for_every_list(write_json, tmp_path):
+    write_json("Dutch/a", {"a": "x"})
+    write_json("Dutch/b", {"b": "y", "c": "z"})
+    manager = WordlistManager(str(tmp_path / "wordlists"))
+    assert manager.get_folders()[0]["pair_count"] is None
+    manager.load_folder("Dutch", max_workers=1)
+    assert manager.get_folders() == [{"name": "Dutch/", "lists": 2, "pair_count": 3}]
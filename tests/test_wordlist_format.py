@@ -0,0 +1,40 @@
+import pytest
+
+from wordlist_format import WordlistFormatError, format_problems, load_wordlist_file, parse_wordlist_data
+
+
+def test_legacy_format(write_json):
+    pairs, problems = load_wordlist_file(write_json("legacy", {"huis": "house", "boom": "tree"}))
+    assert pairs.words == ["huis", "boom"]
+    assert problems == []
+
+
+def test_pairs_format_keeps_duplicates_and_reports_bad_entries(write_json):
+    path = write_json("pairs", {"pairs": [
+        {"word": "bank", "meaning": "bench"},
+        {"word": "bank", "meaning": "bank"},
+        {"word": "", "meaning": "empty"},
+        "not an object",
+    ]})
+    pairs, problems = load_wordlist_file(path)
+    assert pairs.meanings == ["bench", "bank"]
+    assert [position for position, _ in problems] == [3, 4]
+
+
+def test_legacy_duplicate_key_is_reported(tmp_path):
+    path = tmp_path / "dup.json"
+    path.write_text('{"a": "x", "a": "y"}', encoding="utf-8")
+    pairs, problems = load_wordlist_file(path)
+    assert list(pairs.meanings) == ["y"]
+    assert "duplicate word 'a'" in problems[0][1]
+
+
+def test_top_level_must_be_an_object():
+    with pytest.raises(WordlistFormatError):
+        parse_wordlist_data([1, 2])
+
+
+def test_format_problems_limits_the_list():
+    lines = format_problems([(n, "bad") for n in range(1, 9)], limit=3)
+    assert lines[-1] == "... and 5 more"
+    assert len(lines) == 4
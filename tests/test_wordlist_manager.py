@@ -0,0 +1,18 @@
+import io
+
+from console import ScriptedConsole
+from wordlist_manager import WordlistManager
+
+
+def test_load_errors_go_to_the_console(tmp_path, write_json, capsys):
+    write_json("empty", [])
+    (tmp_path / "wordlists" / "broken.json").write_text("{", encoding="utf-8")
+    output = io.StringIO()
+    manager = WordlistManager(str(tmp_path / "wordlists"), console=ScriptedConsole([], output=output))
+    assert manager.load_wordlist("missing") is None
+    assert manager.load_wordlist("broken") is None
+    assert manager.load_wordlist("empty") is None
+    messages = output.getvalue()
+    assert "'missing' not found" in messages
+    assert "broken" in messages and "'empty' is empty" in messages
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,97 @@
+import json
+import random
+
+import pytest
+
+from pair_store import Pair
+from wordlist_format import WordlistFormatError, load_wordlist_file
+from wordlist_stream import PairStream, iter_wordlist_pairs, shuffle_buffer
+
+
+def test_every_chunk_boundary_gives_the_same_pairs(tmp_path):
+    path = tmp_path / "deck.json"
+    # Escapes, literals and numbers (skipped as problems) that chunks can cut anywhere
+    path.write_text('{"caf\\u00e9": "coffee \\"shop\\"", "a": true, "b": 1.5e3, '
+                    '"n": null, "x": "\\\\y", "z": "zz"}', encoding="utf-8")
+    expected = list(load_wordlist_file(path)[0])
+    for chunk_size in range(1, 40):
+        problems = []
+        assert list(iter_wordlist_pairs(path, chunk_size, problems)) == expected
+        assert [position for position, _ in problems] == [2, 3, 4]
+
+
+def test_pairs_format(write_json):
+    path = write_json("pairs", {"pairs": [{"word": "a", "meaning": "x"}, {"word": 1}], "meta": {"v": 1}})
+    problems = []
+    assert list(iter_wordlist_pairs(path, 7, problems)) == [Pair("a", "x")]
+    assert problems[0][0] == 2
+
+
+def test_syntax_error_is_reported_without_reading_on(tmp_path):
+    path = tmp_path / "broken.json"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"a": "x", "b": tru, ')
+        f.write('"filler": "' + "y" * 1000 + '", ' * 200)
+
+    reads = []
+
+    class CountingReader:
+        def __init__(self, f):
+            self.f = f
+
+        def read(self, size):
+            reads.append(size)
+            return self.f.read(size)
+
+    import wordlist_stream
+    with open(path, encoding="utf-8") as f:
+        reader = wordlist_stream._StreamReader(CountingReader(f), 64)
+        reader.expect("{")
+        with pytest.raises(WordlistFormatError, match="character 16"):
+            while True:
+                reader.value()
+                reader.expect(":")
+                reader.value()
+                reader.expect(",")
+    assert len(reads) <= 2
+
+
+def test_truncated_file_is_an_error(tmp_path):
+    path = tmp_path / "cut.json"
+    path.write_text('{"a": "x", "b": "unfinished', encoding="utf-8")
+    with pytest.raises(WordlistFormatError):
+        list(iter_wordlist_pairs(path, 8))
+
+
+def test_shuffle_buffer_yields_everything_once():
+    items = list(range(100))
+    shuffled = list(shuffle_buffer(items, 10, random.Random(2)))
+    assert sorted(shuffled) == items
+    assert shuffled != items
+
+
+def test_pair_stream_is_re_iterable(write_json):
+    stream = PairStream(write_json("deck", {"a": "x", "b": "y", "c": ""}), chunk_size=4, buffer_size=2)
+    assert [pair.word for pair in stream] == ["a", "b"]
+    assert len(stream.problems) == 1
+    assert sorted(pair.word for pair in stream.shuffled()) == ["a", "b"]
+
+
+def test_pairs_key_after_metadata_in_a_large_file(tmp_path, write_json, monkeypatch):
+    from wordlist_manager import WordlistManager
+    entries = [{"word": f"w{i}", "meaning": f"m{i}"} for i in range(5000)]
+    path = write_json("big", {"name": "Big deck", "version": 2, "pairs": entries})
+    expected = list(load_wordlist_file(path)[0])
+    assert len(expected) == 5000
+    assert list(iter_wordlist_pairs(path, 256)) == expected
+
+    monkeypatch.setattr(WordlistManager, "STREAM_THRESHOLD_BYTES", 1024)
+    wordlist = WordlistManager(str(tmp_path / "wordlists")).open_wordlist("big")
+    assert wordlist["streaming"] and list(wordlist["pairs"]) == expected
+
+
+def test_a_pairs_word_with_a_text_meaning_stays_legacy(write_json):
+    path = write_json("legacy", {"a": "x", "pairs": "paren", "b": ""})
+    problems = []
+    assert list(iter_wordlist_pairs(path, 3, problems)) == list(load_wordlist_file(path)[0])
+    assert [position for position, _ in problems] == [3]